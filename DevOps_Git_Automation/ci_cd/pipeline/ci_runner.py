@@ -6,11 +6,17 @@ Simulates CI/CD pipeline with Docker and pytest
 import subprocess
 import sys
 import time
+import uuid
 from pathlib import Path
 from datetime import datetime
-import json
 import logging
 
+try:
+    from ..tracker.timeline_store import TimelineStore
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent.parent / "tracker"))
+    from timeline_store import TimelineStore
+
 # Setup logging
 log_dir = Path(__file__).parent.parent.parent / "logs"
 log_dir.mkdir(exist_ok=True)
@@ -33,6 +39,8 @@ class CIRunner:
     def __init__(self, use_simulation=False):
         self.pipeline_history = []
         self.current_iteration = 0
+        # Key of this runner's iterations in the timeline store
+        self.run_id = f"ci_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
         self.start_time = None
         self.use_simulation = use_simulation
         
@@ -401,25 +409,15 @@ class CIRunner:
         return results
     
     def save_pipeline_data(self):
-        """Save pipeline data to JSON"""
+        """Record this runner's iterations in the shared timeline store"""
         data_dir = Path(__file__).parent.parent.parent / "data"
-        data_dir.mkdir(exist_ok=True)
-        
-        timeline_file = data_dir / "ci_pipeline_timeline.json"
-        
-        timeline_data = {
-            "project": "RIFT'26 - DevOps Lead",
-            "start_time": self.start_time.isoformat() if self.start_time else None,
-            "end_time": datetime.now().isoformat(),
-            "total_iterations": self.current_iteration,
-            "pipeline_history": self.pipeline_history
-        }
-        
-        with open(timeline_file, 'w') as f:
-            json.dump(timeline_data, f, indent=2)
+        store = TimelineStore(
+            data_dir / "pipeline_timeline.sqlite3",
+            legacy_timeline_path=data_dir / "ci_pipeline_timeline.json"
+        )
+        store.record_many(self.run_id, self.pipeline_history, source="ci_runner")
         
-        logger.info(f"Pipeline data saved to {timeline_file}")
-
+        logger.info(f"Pipeline data saved to {store.db_path} (run {self.run_id})")
 
 def main():
     """Main execution"""
@@ -8,6 +8,11 @@ from pathlib import Path
 from datetime import datetime
 import logging
 
+try:
+    from .timeline_store import TimelineStore
+except ImportError:
+    from timeline_store import TimelineStore
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -20,50 +25,54 @@ logger = logging.getLogger(__name__)
 class IterationTracker:
     """Tracks CI/CD pipeline iterations and generates timeline data"""
     
-    def __init__(self):
+    def __init__(self, run_id=None, status=None, since=None, until=None, store=None):
+        """
+        Initialize Iteration Tracker over the shared timeline store
+        
+        Args:
+            run_id (str): Only track this run (default: every run)
+            status (str): Only track "passed" or "failed" iterations
+            since (str): ISO timestamp; only iterations started at or after it
+            until (str): ISO timestamp; only iterations started before it
+            store (TimelineStore): Store to use instead of the data directory's
+        """
         self.data_dir = Path(__file__).parent.parent.parent / "data"
         self.data_dir.mkdir(exist_ok=True)
-        self.timeline_file = self.data_dir / "ci_pipeline_timeline.json"
+        self.timeline_db = self.data_dir / "pipeline_timeline.sqlite3"
         self.tracker_file = self.data_dir / "iteration_tracker.json"
         
-        self.iterations = []
-        self.load_existing_data()
+        self.store = store or TimelineStore(
+            self.timeline_db,
+            legacy_timeline_path=self.data_dir / "ci_pipeline_timeline.json"
+        )
+        self.run_id = run_id
+        self.filters = {"run_id": run_id, "status": status, "since": since, "until": until}
     
-    def load_existing_data(self):
-        """Load existing timeline data"""
-        if self.timeline_file.exists():
-            try:
-                with open(self.timeline_file, 'r') as f:
-                    data = json.load(f)
-                    self.iterations = data.get('pipeline_history', [])
-                    logger.info(f"Loaded {len(self.iterations)} existing iterations")
-            except Exception as e:
-                logger.error(f"Failed to load existing data: {e}")
+    @property
+    def iterations(self):
+        """Tracked iterations, oldest first, read from the store"""
+        return self.store.query(**self.filters)
     
     def add_iteration(self, iteration_data):
-        """Add a new iteration to tracking"""
-        self.iterations.append(iteration_data)
-        logger.info(f"Added iteration #{len(self.iterations)}")
+        """Record a new iteration in the timeline store"""
+        run_id = iteration_data.get("run_id") or self.run_id or "manual"
+        self.store.record(run_id, iteration_data, source="tracker")
+        logger.info(f"Added iteration #{iteration_data.get('iteration', '?')} to run {run_id}")
     
     def get_statistics(self):
         """Calculate statistics from iterations"""
-        if not self.iterations:
+        totals = self.store.statistics(**self.filters)
+        total = totals["total"]
+        if not total:
             return None
         
-        total = len(self.iterations)
-        passed = sum(1 for i in self.iterations if i.get('status') == 'passed')
-        failed = total - passed
-        
-        durations = [i.get('duration', 0) for i in self.iterations]
-        avg_duration = sum(durations) / len(durations) if durations else 0
-        
         stats = {
             "total_iterations": total,
-            "passed": passed,
-            "failed": failed,
-            "success_rate": round((passed / total) * 100, 2) if total > 0 else 0,
-            "average_duration": round(avg_duration, 2),
-            "total_duration": round(sum(durations), 2)
+            "passed": totals["passed"],
+            "failed": totals["failed"],
+            "success_rate": round((totals["passed"] / total) * 100, 2),
+            "average_duration": round(totals["average_duration"], 2),
+            "total_duration": round(totals["total_duration"], 2)
         }
         
         return stats
@@ -87,6 +96,7 @@ class IterationTracker:
         for idx, iteration in enumerate(self.iterations, 1):
             iteration_summary = {
                 "iteration_number": idx,
+                "run_id": iteration.get('run_id'),
                 "status": iteration.get('status'),
                 "duration": iteration.get('duration'),
                 "start_time": iteration.get('start_time'),
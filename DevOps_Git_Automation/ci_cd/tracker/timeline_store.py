@@ -0,0 +1,264 @@
+"""
+Timeline Store - SQLite store for CI/CD pipeline iterations
+Shared by CIRunner, IterationTracker and the backend coordinator, which
+imports this module through backend/utils/devops_bridge.py.
+WAL mode lets many runs append at once while readers query.
+Timestamps are stored as UTC ISO-8601 strings, so they sort and compare
+as text whichever writer produced them.
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+# Version 2: start_time and end_time normalized to UTC
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pipeline_iterations (
+    run_id TEXT NOT NULL,
+    iteration INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    status TEXT NOT NULL,
+    start_time TEXT NOT NULL,
+    end_time TEXT,
+    duration REAL NOT NULL DEFAULT 0,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (run_id, iteration)
+);
+CREATE INDEX IF NOT EXISTS pipeline_iterations_iteration
+    ON pipeline_iterations (iteration, start_time);
+CREATE INDEX IF NOT EXISTS pipeline_iterations_status
+    ON pipeline_iterations (status, start_time);
+CREATE INDEX IF NOT EXISTS pipeline_iterations_start_time
+    ON pipeline_iterations (start_time);
+"""
+
+# Run id given to iterations imported from ci_pipeline_timeline.json
+LEGACY_RUN_ID = "legacy"
+
+
+class TimelineStore:
+    """Pipeline iterations keyed by (run_id, iteration)"""
+
+    def __init__(self, db_path, legacy_timeline_path=None):
+        """
+        Initialize Timeline Store
+
+        Args:
+            db_path (Path): SQLite database file
+            legacy_timeline_path (Path): ci_pipeline_timeline.json imported
+                once into an empty store
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        conn = self._connection()
+        conn.executescript(SCHEMA)
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < 2:
+            self._normalize_times()
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        if legacy_timeline_path is not None:
+            self._import_legacy_timeline(Path(legacy_timeline_path))
+
+    def record(self, run_id, iteration_data, source):
+        """
+        Insert or replace one iteration
+
+        Args:
+            run_id (str): Run the iteration belongs to
+            iteration_data (dict): Iteration as CIRunner builds it
+            source (str): Writer, e.g. "ci_runner" or "backend"
+        """
+        self.record_many(run_id, [iteration_data], source)
+
+    def record_many(self, run_id, iterations, source):
+        """
+        Insert or replace a run's iterations in one transaction
+
+        Iterations are keyed by their "iteration" number; one without a
+        number gets the run's next free number.
+
+        Args:
+            run_id (str): Run the iterations belong to
+            iterations (list[dict]): Iterations as CIRunner builds them
+            source (str): Writer, e.g. "ci_runner" or "backend"
+        """
+        conn = self._connection()
+        with conn:
+            # Taken before reading the run's last iteration number, so
+            # concurrent writers can't hand out the same one
+            conn.execute("BEGIN IMMEDIATE")
+            numbers = [_iteration_number(iteration) for iteration in iterations]
+            last = conn.execute(
+                "SELECT COALESCE(MAX(iteration), 0) FROM pipeline_iterations WHERE run_id = ?",
+                (run_id,),
+            ).fetchone()[0]
+            last = max([last] + [number for number in numbers if number is not None])
+            rows = []
+            for number, iteration in zip(numbers, iterations):
+                if number is None:
+                    # Unnumbered iterations are appended to the run
+                    last += 1
+                    number = last
+                rows.append(_row(run_id, number, iteration, source))
+            conn.executemany(
+                """
+                INSERT OR REPLACE INTO pipeline_iterations (
+                    run_id, iteration, source, status, start_time, end_time, duration, payload
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+
+    def query(self, run_id=None, iteration=None, status=None, since=None, until=None, limit=None):
+        """
+        Iterations oldest first, filtered by any of the arguments
+
+        Args:
+            run_id (str): Only this run
+            iteration (int): Only this iteration number
+            status (str): Only "passed" or "failed" iterations
+            since (str): ISO timestamp (naive means local time); iterations
+                started at or after it
+            until (str): ISO timestamp (naive means local time); iterations
+                started before it
+            limit (int): Maximum iterations returned
+
+        Returns:
+            list[dict]: Iterations, each with its run_id and source
+        """
+        where, params = _filters(run_id, iteration, status, since, until)
+        sql = (
+            f"SELECT run_id, source, payload FROM pipeline_iterations {where} "
+            "ORDER BY start_time, run_id, iteration"
+        )
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        return [
+            {**json.loads(payload), "run_id": row_run_id, "source": source}
+            for row_run_id, source, payload in self._connection().execute(sql, params)
+        ]
+
+    def statistics(self, run_id=None, status=None, since=None, until=None):
+        """
+        Aggregate counts and durations, computed in SQL
+
+        Returns:
+            dict: total, passed, failed, total_duration and average_duration
+        """
+        where, params = _filters(run_id, None, status, since, until)
+        total, passed, total_duration = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(status = 'passed'), 0), COALESCE(SUM(duration), 0) "
+            f"FROM pipeline_iterations {where}",
+            params,
+        ).fetchone()
+        return {
+            "total": total,
+            "passed": passed,
+            "failed": total - passed,
+            "total_duration": total_duration,
+            "average_duration": total_duration / total if total else 0,
+        }
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _normalize_times(self):
+        # Rows written before version 2 may hold naive local timestamps
+        conn = self._connection()
+        rows = conn.execute(
+            "SELECT run_id, iteration, source, payload FROM pipeline_iterations"
+        ).fetchall()
+        with conn:
+            for run_id, iteration, source, payload in rows:
+                row = _row(run_id, iteration, json.loads(payload), source)
+                conn.execute(
+                    "UPDATE pipeline_iterations SET start_time = ?, end_time = ?, payload = ? "
+                    "WHERE run_id = ? AND iteration = ?",
+                    (row[4], row[5], row[7], run_id, iteration),
+                )
+
+    def _import_legacy_timeline(self, timeline_path):
+        # One-time import of the JSON file CIRunner and the backend used to rewrite
+        if not timeline_path.exists():
+            return
+        if self._connection().execute("SELECT 1 FROM pipeline_iterations LIMIT 1").fetchone():
+            return
+        try:
+            data = json.loads(timeline_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        history = data.get("pipeline_history", []) if isinstance(data, dict) else []
+        self.record_many(LEGACY_RUN_ID, [item for item in history if isinstance(item, dict)], "legacy")
+
+
+def to_utc_iso(value):
+    """
+    Normalize an ISO timestamp to UTC
+
+    Args:
+        value (str): ISO-8601 timestamp; naive values are local time
+
+    Returns:
+        str: UTC ISO-8601 with microseconds, or value unchanged when it
+            is empty or not a timestamp
+    """
+    if not value:
+        return value
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return value
+    # astimezone() reads a naive datetime as local time
+    return parsed.astimezone(timezone.utc).isoformat(timespec="microseconds")
+
+
+def _iteration_number(iteration):
+    number = iteration.get("iteration")
+    return None if number is None or number == "" else int(number)
+
+
+def _row(run_id, number, iteration, source):
+    start_time = to_utc_iso(iteration.get("start_time") or iteration.get("timestamp") or "")
+    end_time = to_utc_iso(iteration.get("end_time"))
+    payload = {**iteration, "iteration": number, "start_time": start_time}
+    if end_time is not None:
+        payload["end_time"] = end_time
+    return (
+        run_id,
+        number,
+        source,
+        str(iteration.get("status", "failed")).lower(),
+        start_time,
+        end_time,
+        float(iteration.get("duration") or 0),
+        json.dumps(payload),
+    )
+
+
+def _filters(run_id, iteration, status, since, until):
+    clauses = []
+    params = []
+    for column, value in (("run_id", run_id), ("iteration", iteration), ("status", status)):
+        if value is not None:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    if since is not None:
+        clauses.append("start_time >= ?")
+        params.append(to_utc_iso(since))
+    if until is not None:
+        clauses.append("start_time < ?")
+        params.append(to_utc_iso(until))
+    return (f"WHERE {' AND '.join(clauses)}" if clauses else ""), params
@@ -159,7 +159,7 @@ def print_final_summary():
     print("     - Deployment automation")
     print()
     print("  4. Timeline Data")
-    print("     - data/ci_pipeline_timeline.json")
+    print("     - data/pipeline_timeline.sqlite3")
     print("     - data/iteration_tracker.json")
     print("     - data/git_automation_history.json")
     print("     - data/deployment_history.json")
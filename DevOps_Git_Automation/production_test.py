@@ -14,8 +14,12 @@ import random
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root / "scripts"))
 sys.path.insert(0, str(project_root / "ci_cd" / "pipeline"))
+sys.path.insert(0, str(project_root / "ci_cd" / "tracker"))
 sys.path.insert(0, str(project_root / "deployment"))
 
+from history_log import HistoryLog
+from timeline_store import TimelineStore
+
 
 def print_step(step_num, title, status=""):
     """Print formatted step"""
@@ -174,8 +178,8 @@ def verify_data_files():
     
     data_dir = project_root / "data"
     required_files = [
-        "branch_history.json",
-        "ci_pipeline_timeline.json",
+        "branch_history.jsonl",
+        "pipeline_timeline.sqlite3",
         "deployment_history.json"
     ]
     
@@ -190,8 +194,13 @@ def verify_data_files():
             continue
         
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            if filepath.suffix == ".jsonl":
+                data = list(HistoryLog(filepath))
+            elif filepath.suffix == ".sqlite3":
+                data = TimelineStore(filepath).query()
+            else:
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
             
             # Check if file has data
             if isinstance(data, list) and len(data) == 0:
@@ -229,9 +238,7 @@ def show_data_summary():
     
     # Branch history
     try:
-        branch_file = data_dir / "branch_history.json"
-        with open(branch_file, 'r', encoding='utf-8') as f:
-            branches = json.load(f)
+        branches = list(HistoryLog(data_dir / "branch_history.jsonl"))
         print(f"\nBranch History: {len(branches)} branches")
         for i, branch in enumerate(branches[:3], 1):
             print(f"  {i}. {branch['type']:8} - {branch['description']}")
@@ -242,17 +249,11 @@ def show_data_summary():
     
     # CI pipeline
     try:
-        pipeline_file = data_dir / "ci_pipeline_timeline.json"
-        with open(pipeline_file, 'r', encoding='utf-8') as f:
-            pipeline_data = json.load(f)
-        history = pipeline_data.get('pipeline_history', [])
-        passed = sum(1 for h in history if h['status'] == 'passed')
-        failed = len(history) - passed
-        print(f"\nCI/CD Pipeline: {len(history)} iterations")
-        print(f"  Passed: {passed}, Failed: {failed}")
-        if history:
-            avg_duration = sum(h['duration'] for h in history) / len(history)
-            print(f"  Avg Duration: {avg_duration:.2f}s")
+        stats = TimelineStore(data_dir / "pipeline_timeline.sqlite3").statistics()
+        print(f"\nCI/CD Pipeline: {stats['total']} iterations")
+        print(f"  Passed: {stats['passed']}, Failed: {stats['failed']}")
+        if stats['total']:
+            print(f"  Avg Duration: {stats['average_duration']:.2f}s")
     except Exception as e:
         print(f"\nCI/CD Pipeline: Error - {e}")
     
@@ -8,7 +8,11 @@ from git import Repo, GitCommandError
 from datetime import datetime
 import logging
 from pathlib import Path
-import json
+
+try:
+    from .history_log import HistoryLog
+except ImportError:
+    from history_log import HistoryLog
 
 # Setup logging
 log_dir = Path(__file__).parent.parent / "logs"
@@ -50,13 +54,16 @@ class BranchManager:
         self.project_root = Path(__file__).parent.parent
         self.data_dir = self.project_root / "data"
         self.data_dir.mkdir(exist_ok=True)
-        self.history_file = self.data_dir / "branch_history.json"
-        
-        # Initialize file if doesn't exist
-        if not self.history_file.exists():
-            self.history_file.write_text("[]", encoding='utf-8')
+        # Append-only JSON lines; the old JSON array file is migrated on first use
+        self.history_file = self.data_dir / "branch_history.jsonl"
+        self.history_log = HistoryLog(
+            self.history_file,
+            legacy_path=self.data_dir / "branch_history.json"
+        )
         
         self.branch_history = []
+        # Entries recorded by create_branch, written by save_branch_history
+        self._unsaved_history = []
     
     def _sanitize_name(self, value):
         clean = ''.join(c if c.isalnum() else '_' for c in str(value).strip())
@@ -121,6 +128,7 @@ class BranchManager:
                 "status": "created"
             }
             self.branch_history.append(branch_record)
+            self._unsaved_history.append(branch_record)
             
             logger.info(f"✓ Successfully created branch: {branch_name}")
             return True
@@ -232,33 +240,32 @@ class BranchManager:
         return branch_entry
     
     def _save_to_file(self, branch_entry):
-        """Save branch entry to JSON file"""
+        """Append branch entry to the history log"""
         try:
-            # Read existing history
-            existing_history = []
-            if self.history_file.exists():
-                content = self.history_file.read_text(encoding='utf-8')
-                if content.strip():
-                    existing_history = json.loads(content)
-            
-            # Append new entry
-            existing_history.append(branch_entry)
-            
-            # Write back
-            self.history_file.write_text(json.dumps(existing_history, indent=2), encoding='utf-8')
+            self.history_log.append(branch_entry)
             logger.info(f"Branch saved: {branch_entry['branch_name']}")
             
         except Exception as e:
             logger.error(f"Failed to save branch history: {e}")
     
     def save_branch_history(self):
-        """Save branch history to JSON file (for compatibility)"""
+        """Append branches created by create_branch that are not saved yet"""
         try:
-            self.history_file.write_text(json.dumps(self.branch_history, indent=2), encoding='utf-8')
+            while self._unsaved_history:
+                self.history_log.append(self._unsaved_history[0])
+                self._unsaved_history.pop(0)
             logger.info(f"Branch history saved to {self.history_file}")
         except Exception as e:
             logger.error(f"Failed to save branch history: {e}")
-
+    
+    def iter_branch_history(self):
+        """
+        Stream the saved branch history, oldest first
+        
+        Returns:
+            Iterator[dict]: Branch entries
+        """
+        return iter(self.history_log)
 
 def main():
     """Main execution function"""
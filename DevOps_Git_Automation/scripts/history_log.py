@@ -0,0 +1,186 @@
+"""
+History Log - append-only JSON-lines history files
+One JSON object per line: appends stay constant time as the history grows,
+and readers stream entries without loading the whole file.
+Also imported by the backend (backend/utils/devops_bridge.py), which writes
+the same files.
+"""
+
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+# Appends between compactions by one writer; a compaction only runs when
+# there is an entry cap or a torn line to drop
+COMPACT_EVERY = 10000
+
+
+@contextmanager
+def file_lock(lock_path):
+    """
+    Hold an exclusive inter-process lock on lock_path
+
+    Args:
+        lock_path (Path): Lock file, created if missing
+    """
+    lock_path = Path(lock_path)
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a+b") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        else:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class HistoryLog:
+    """Append-only history of JSON objects, safe for concurrent writers"""
+
+    def __init__(self, path, legacy_path=None, max_entries=None, compact_every=COMPACT_EVERY):
+        """
+        Initialize History Log
+
+        Args:
+            path (Path): JSON-lines file
+            legacy_path (Path): JSON array file the history used to live in;
+                migrated in front of the log on first use, then renamed to *.migrated
+            max_entries (int): Newest entries kept by compaction (None keeps all)
+            compact_every (int): Appends between automatic compactions
+        """
+        self.path = Path(path)
+        self.legacy_path = Path(legacy_path) if legacy_path else None
+        self.max_entries = max_entries
+        self.compact_every = compact_every
+        self.lock_path = self.path.with_name(f"{self.path.name}.lock")
+        # Serializes this instance's threads; file_lock serializes processes
+        self._lock = threading.Lock()
+        self._appends = 0
+        self._torn_lines = 0
+
+    def append(self, entry):
+        """
+        Append one entry
+
+        Args:
+            entry (dict): JSON-serializable entry
+        """
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock, file_lock(self.lock_path):
+            self._migrate_legacy()
+            with open(self.path, "a+b") as handle:
+                # A writer killed mid-line leaves a torn last line; start on
+                # a fresh one so only that entry is lost
+                if handle.seek(0, os.SEEK_END) > 0:
+                    handle.seek(-1, os.SEEK_END)
+                    if handle.read(1) != b"\n":
+                        line = "\n" + line
+                        self._torn_lines += 1
+                handle.write(line.encode("utf-8"))
+            self._appends += 1
+            if self.compact_every and self._appends >= self.compact_every:
+                self._appends = 0
+                # Without a cap or a torn line the rewrite would change nothing
+                if self.max_entries is not None or self._torn_lines:
+                    self._compact()
+
+    def __iter__(self):
+        """Stream entries oldest first; unreadable lines are skipped"""
+        if self.legacy_path is not None and self.legacy_path.exists():
+            with self._lock, file_lock(self.lock_path):
+                self._migrate_legacy()
+        try:
+            handle = open(self.path, encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with handle:
+            for line in handle:
+                entry = _parse_line(line)
+                if entry is not None:
+                    yield entry
+
+    def compact(self):
+        """Rewrite the log without unreadable lines, keeping at most max_entries"""
+        with self._lock, file_lock(self.lock_path):
+            self._migrate_legacy()
+            self._compact()
+
+    def _compact(self):
+        # Caller holds both locks
+        self._appends = 0
+        self._torn_lines = 0
+        if not self.path.exists():
+            return
+        skip = 0
+        if self.max_entries is not None:
+            total = sum(1 for _ in self._valid_lines())
+            skip = max(0, total - self.max_entries)
+        _write_lines(
+            self.path,
+            (line for index, line in enumerate(self._valid_lines()) if index >= skip),
+        )
+
+    def _valid_lines(self):
+        with open(self.path, encoding="utf-8") as handle:
+            for line in handle:
+                if _parse_line(line) is not None:
+                    yield line if line.endswith("\n") else f"{line}\n"
+
+    def _migrate_legacy(self):
+        # Caller holds the lock
+        legacy = self.legacy_path
+        if legacy is None or not legacy.exists():
+            return
+        raw = legacy.read_text(encoding="utf-8").strip()
+        entries = json.loads(raw) if raw else []
+        if not isinstance(entries, list):
+            raise ValueError(f"Expected a JSON array in {legacy}")
+
+        def lines():
+            for entry in entries:
+                yield json.dumps(entry, ensure_ascii=False) + "\n"
+            if self.path.exists():
+                yield from self._valid_lines()
+
+        _write_lines(self.path, lines())
+        legacy.replace(legacy.with_name(f"{legacy.name}.migrated"))
+
+
+def _parse_line(line):
+    if not line.strip():
+        return None
+    try:
+        entry = json.loads(line)
+    except ValueError:
+        return None
+    return entry if isinstance(entry, dict) else None
+
+
+def _write_lines(path, lines):
+    """Replace path atomically with lines"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.writelines(lines)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
@@ -115,8 +115,7 @@ def test_github_integration():
     # Step 5: Stage Changes
     print("\n[STEP 5] Staging changes (git add)...")
     files_to_add = [
-        "data/branch_history.json",
-        "data/ci_pipeline_timeline.json",
+        "data/branch_history.jsonl",
         "data/deployment_history.json"
     ]
     
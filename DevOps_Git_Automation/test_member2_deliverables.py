@@ -4,12 +4,13 @@ Ensures all systems are working before hackathon demo.
 """
 import sys
 from pathlib import Path
-import json
 
 # Add project to path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root / "scripts"))
 
+from history_log import HistoryLog
+
 def test_deliverable_1():
     """Test: Working Git Automation"""
     print("\n" + "="*70)
@@ -37,14 +38,14 @@ def test_deliverable_1():
         print(f"  [OK] {branch['branch_name']}")
     
     # Verify file
-    history_file = project_root / "data" / "branch_history.json"
+    history_file = project_root / "data" / "branch_history.jsonl"
     
     print(f"\n[CHECK] Verifying {history_file}")
     if not history_file.exists():
         print(f"  [FAIL] File does not exist")
         return False
     
-    history = json.loads(history_file.read_text())
+    history = list(HistoryLog(history_file))
     print(f"  [CHECK] Branches created: {len(created_branches)}")
     print(f"  [CHECK] Branches saved: {len(history)}")
     print(f"  [CHECK] File size: {history_file.stat().st_size} bytes")
@@ -72,8 +73,8 @@ def test_deliverable_2():
     print("="*70)
     
     required_files = [
-        "data/branch_history.json",
-        "data/ci_pipeline_timeline.json",
+        "data/branch_history.jsonl",
+        "data/pipeline_timeline.sqlite3",
         "data/iteration_tracker.json",
         "data/deployment_history.json",
         "data/git_automation_history.json"
@@ -124,13 +125,13 @@ def test_branch_naming_convention():
     print("  BONUS: Branch Naming Convention Test")
     print("="*70)
     
-    history_file = project_root / "data" / "branch_history.json"
+    history_file = project_root / "data" / "branch_history.jsonl"
     
     if not history_file.exists():
         print("  [SKIP] No branch history file")
         return False
     
-    history = json.loads(history_file.read_text())
+    history = list(HistoryLog(history_file))
     
     if not history:
         print("  [SKIP] No branches in history")
@@ -30,15 +30,16 @@ def test_pipeline_timeline():
     # Save data
     runner.save_pipeline_data()
     
-    # Verify file
-    timeline_file = project_root / "data" / "ci_pipeline_timeline.json"
-    import json
+    # Verify store
+    from timeline_store import TimelineStore
     
-    if timeline_file.exists():
-        timeline_data = json.loads(timeline_file.read_text())
-        history_count = len(timeline_data.get("pipeline_history", []))
+    timeline_db = project_root / "data" / "pipeline_timeline.sqlite3"
+    
+    if timeline_db.exists():
+        history = TimelineStore(timeline_db).query(run_id=runner.run_id)
+        history_count = len(history)
         
-        print(f"\n[VERIFY] Timeline file exists: {timeline_file}")
+        print(f"\n[VERIFY] Timeline store exists: {timeline_db}")
         print(f"[VERIFY] Pipeline history entries: {history_count}")
         
         if history_count > 0:
@@ -46,7 +47,7 @@ def test_pipeline_timeline():
             
             # Show sample
             print("\n[SAMPLE] First pipeline run:")
-            first_run = timeline_data["pipeline_history"][0]
+            first_run = history[0]
             print(f"  - Iteration: {first_run.get('iteration')}")
             print(f"  - Status: {first_run.get('status')}")
             print(f"  - Duration: {first_run.get('duration')}s")
@@ -57,10 +58,9 @@ def test_pipeline_timeline():
             print("\n[FAIL] Pipeline history is still empty")
             return False
     else:
-        print(f"\n[FAIL] Timeline file not found: {timeline_file}")
+        print(f"\n[FAIL] Timeline store not found: {timeline_db}")
         return False
 
-
 if __name__ == "__main__":
     success = test_pipeline_timeline()
     sys.exit(0 if success else 1)
@@ -11,6 +11,8 @@ import json
 sys.path.insert(0, str(Path(__file__).parent.parent / "ci_cd" / "pipeline"))
 sys.path.insert(0, str(Path(__file__).parent.parent / "ci_cd" / "tracker"))
 
+from timeline_store import TimelineStore
+
 
 class TestCIPipeline:
     """Tests for CI Pipeline"""
@@ -38,18 +40,18 @@ class TestIterationTracker:
         from iteration_tracker import IterationTracker
         assert IterationTracker is not None
     
-    def test_tracker_initialization(self):
+    def test_tracker_initialization(self, tmp_path):
         """Test tracker initialization"""
         from iteration_tracker import IterationTracker
-        tracker = IterationTracker()
+        tracker = IterationTracker(store=TimelineStore(tmp_path / "timeline.sqlite3"))
         
         assert tracker.data_dir.exists()
         assert isinstance(tracker.iterations, list)
     
-    def test_add_iteration(self):
+    def test_add_iteration(self, tmp_path):
         """Test adding iteration"""
         from iteration_tracker import IterationTracker
-        tracker = IterationTracker()
+        tracker = IterationTracker(store=TimelineStore(tmp_path / "timeline.sqlite3"))
         
         test_iteration = {
             "iteration": 1,
@@ -58,7 +60,17 @@ class TestIterationTracker:
         }
         
         tracker.add_iteration(test_iteration)
-        assert len(tracker.iterations) >= 1
+        assert len(tracker.iterations) == 1
+    
+    def test_add_iterations_without_number(self, tmp_path):
+        """Test unnumbered iterations are appended, not overwritten"""
+        from iteration_tracker import IterationTracker
+        tracker = IterationTracker(store=TimelineStore(tmp_path / "timeline.sqlite3"))
+        
+        tracker.add_iteration({"status": "failed", "duration": 1.0})
+        tracker.add_iteration({"status": "passed", "duration": 2.0})
+        
+        assert [i["iteration"] for i in tracker.iterations] == [1, 2]
 
 
 class TestDockerSandbox:
@@ -96,11 +108,11 @@ def test_ci_pipeline_flow():
     assert runner.pipeline_history[0]["status"] == "passed"
 
 
-def test_timeline_data_structure():
+def test_timeline_data_structure(tmp_path):
     """Test timeline data structure"""
     from iteration_tracker import IterationTracker
     
-    tracker = IterationTracker()
+    tracker = IterationTracker(store=TimelineStore(tmp_path / "timeline.sqlite3"))
     
     # Add test iterations
     test_iterations = [
@@ -115,7 +127,7 @@ def test_timeline_data_structure():
     stats = tracker.get_statistics()
     
     assert stats is not None
-    assert stats["total_iterations"] >= 3
+    assert stats["total_iterations"] == 3
     assert "success_rate" in stats
     assert "average_duration" in stats
 
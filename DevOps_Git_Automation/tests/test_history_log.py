@@ -0,0 +1,121 @@
+"""
+Test suite for the append-only History Log
+"""
+
+import json
+import sys
+import threading
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from history_log import HistoryLog
+
+
+class TestHistoryLog:
+    """Tests for HistoryLog"""
+    
+    def test_append_and_iterate(self, tmp_path):
+        """Test entries stream back in append order"""
+        log = HistoryLog(tmp_path / "history.jsonl")
+        for index in range(3):
+            log.append({"index": index})
+        
+        assert [entry["index"] for entry in log] == [0, 1, 2]
+        assert len((tmp_path / "history.jsonl").read_text().splitlines()) == 3
+    
+    def test_missing_file_is_empty(self, tmp_path):
+        """Test reading a log that was never written"""
+        assert list(HistoryLog(tmp_path / "history.jsonl")) == []
+    
+    def test_migrates_legacy_array(self, tmp_path):
+        """Test the old JSON array file is moved in front of the log"""
+        legacy = tmp_path / "history.json"
+        legacy.write_text(json.dumps([{"index": 0}, {"index": 1}], indent=2))
+        log = HistoryLog(tmp_path / "history.jsonl", legacy_path=legacy)
+        log.append({"index": 2})
+        
+        assert [entry["index"] for entry in log] == [0, 1, 2]
+        assert not legacy.exists()
+        assert (tmp_path / "history.json.migrated").exists()
+    
+    def test_torn_line_is_skipped(self, tmp_path):
+        """Test a partially written line only loses that entry"""
+        path = tmp_path / "history.jsonl"
+        path.write_text('{"index": 0}\n{"ind')
+        log = HistoryLog(path)
+        log.append({"index": 1})
+        
+        assert [entry["index"] for entry in log] == [0, 1]
+    
+    def test_compaction(self, tmp_path):
+        """Test compaction drops unreadable lines and the oldest entries"""
+        path = tmp_path / "history.jsonl"
+        log = HistoryLog(path, max_entries=3, compact_every=5)
+        for index in range(4):
+            log.append({"index": index})
+        with open(path, "a", encoding="utf-8") as handle:
+            handle.write("not json\n")
+        log.append({"index": 4})
+        
+        assert [entry["index"] for entry in log] == [2, 3, 4]
+        assert len(path.read_text().splitlines()) == 3
+    
+    def test_compaction_skipped_without_cap(self, tmp_path):
+        """Test an uncapped log without torn lines is not rewritten"""
+        path = tmp_path / "history.jsonl"
+        log = HistoryLog(path, compact_every=2)
+        log.append({"index": 0})
+        inode = path.stat().st_ino
+        for index in range(1, 5):
+            log.append({"index": index})
+        
+        assert path.stat().st_ino == inode
+    
+    def test_compaction_drops_torn_line_without_cap(self, tmp_path):
+        """Test a torn line seen by a writer is compacted away"""
+        path = tmp_path / "history.jsonl"
+        path.write_text('{"index": 0}\n{"ind')
+        log = HistoryLog(path, compact_every=2)
+        log.append({"index": 1})
+        log.append({"index": 2})
+        
+        assert path.read_text().splitlines() == [
+            '{"index": 0}', '{"index": 1}', '{"index": 2}'
+        ]
+    
+    def test_shared_log_across_threads(self, tmp_path):
+        """Test one instance used from many threads compacts on schedule"""
+        path = tmp_path / "history.jsonl"
+        log = HistoryLog(path, max_entries=1000, compact_every=7)
+        
+        def writer(worker):
+            for index in range(50):
+                log.append({"worker": worker, "index": index})
+        
+        threads = [threading.Thread(target=writer, args=(worker,)) for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert len(list(log)) == 200
+        assert log._appends == 200 % 7
+    
+    def test_concurrent_appends(self, tmp_path):
+        """Test concurrent writers do not lose entries"""
+        path = tmp_path / "history.jsonl"
+        
+        def writer(worker):
+            log = HistoryLog(path)
+            for index in range(50):
+                log.append({"worker": worker, "index": index})
+        
+        threads = [threading.Thread(target=writer, args=(worker,)) for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert len(list(HistoryLog(path))) == 200
@@ -0,0 +1,117 @@
+"""
+Test suite for the SQLite Timeline Store
+"""
+
+import json
+import sqlite3
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "ci_cd" / "tracker"))
+
+from timeline_store import TimelineStore
+
+
+def _iteration(number, status, start_time, duration=1.0):
+    return {"iteration": number, "status": status, "start_time": start_time, "duration": duration}
+
+
+def _naive_local(*utc_fields):
+    """Naive local-time ISO string for a UTC instant, as CIRunner writes it"""
+    return datetime(*utc_fields, tzinfo=timezone.utc).astimezone().replace(tzinfo=None).isoformat()
+
+
+class TestTimelineStore:
+    """Tests for TimelineStore"""
+    
+    def test_record_and_query(self, tmp_path):
+        """Test iterations are queried by run, iteration, status and time window"""
+        store = TimelineStore(tmp_path / "timeline.sqlite3")
+        store.record_many("run_a", [
+            _iteration(1, "failed", "2026-01-01T10:00:00"),
+            _iteration(2, "passed", "2026-01-01T10:05:00"),
+        ], source="ci_runner")
+        store.record("run_b", _iteration(1, "passed", "2026-01-02T10:00:00"), source="backend")
+        
+        assert [i["iteration"] for i in store.query(run_id="run_a")] == [1, 2]
+        assert [i["run_id"] for i in store.query(iteration=1)] == ["run_a", "run_b"]
+        assert len(store.query(status="passed")) == 2
+        assert [i["run_id"] for i in store.query(since="2026-01-02")] == ["run_b"]
+        assert len(store.query(until="2026-01-01T10:01:00")) == 1
+    
+    def test_record_is_idempotent(self, tmp_path):
+        """Test re-recording a run replaces its iterations"""
+        store = TimelineStore(tmp_path / "timeline.sqlite3")
+        store.record_many("run_a", [_iteration(1, "failed", "2026-01-01T10:00:00")], source="ci_runner")
+        store.record_many("run_a", [_iteration(1, "passed", "2026-01-01T10:00:00")], source="ci_runner")
+        
+        assert [i["status"] for i in store.query()] == ["passed"]
+    
+    def test_statistics(self, tmp_path):
+        """Test aggregate statistics"""
+        store = TimelineStore(tmp_path / "timeline.sqlite3")
+        store.record_many("run_a", [
+            _iteration(1, "failed", "2026-01-01T10:00:00", duration=2.0),
+            _iteration(2, "passed", "2026-01-01T10:05:00", duration=4.0),
+        ], source="ci_runner")
+        
+        stats = store.statistics()
+        assert stats["total"] == 2
+        assert stats["passed"] == 1
+        assert stats["average_duration"] == 3.0
+    
+    def test_imports_legacy_timeline(self, tmp_path):
+        """Test the old ci_pipeline_timeline.json is imported once"""
+        legacy = tmp_path / "ci_pipeline_timeline.json"
+        legacy.write_text(json.dumps({"pipeline_history": [
+            _iteration(1, "passed", "2026-01-01T10:00:00"),
+            _iteration(2, "failed", "2026-01-01T10:05:00"),
+        ]}))
+        TimelineStore(tmp_path / "timeline.sqlite3", legacy_timeline_path=legacy)
+        store = TimelineStore(tmp_path / "timeline.sqlite3", legacy_timeline_path=legacy)
+        
+        assert [i["run_id"] for i in store.query()] == ["legacy", "legacy"]
+    
+    def test_mixed_timezones_sort_and_filter_in_utc(self, tmp_path):
+        """Test naive local and offset timestamps are compared as UTC instants"""
+        store = TimelineStore(tmp_path / "timeline.sqlite3")
+        store.record("ci", _iteration(1, "passed", _naive_local(2026, 1, 1, 9, 30)), source="ci_runner")
+        store.record("backend_a", _iteration(1, "passed", "2026-01-01T10:00:00+02:00"), source="backend")
+        store.record("backend_b", _iteration(1, "passed", "2026-01-01T09:00:00+00:00"), source="backend")
+        
+        assert [i["run_id"] for i in store.query()] == ["backend_a", "backend_b", "ci"]
+        assert [i["run_id"] for i in store.query(since="2026-01-01T09:15:00+00:00")] == ["ci"]
+        assert store.query(run_id="ci")[0]["start_time"] == "2026-01-01T09:30:00.000000+00:00"
+    
+    def test_normalizes_version_1_rows(self, tmp_path):
+        """Test rows stored before UTC normalization are rewritten on open"""
+        path = tmp_path / "timeline.sqlite3"
+        TimelineStore(path)
+        naive = _naive_local(2026, 1, 1, 9, 30)
+        conn = sqlite3.connect(path)
+        with conn:
+            conn.execute(
+                "INSERT INTO pipeline_iterations VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                ("old", 1, "ci_runner", "passed", naive, None, 1.0,
+                 json.dumps(_iteration(1, "passed", naive))),
+            )
+            conn.execute("PRAGMA user_version = 1")
+        conn.close()
+        
+        store = TimelineStore(path)
+        assert store.query(since="2026-01-01T09:30:00+00:00")[0]["run_id"] == "old"
+    
+    def test_unnumbered_iterations_get_next_free_number(self, tmp_path):
+        """Test iterations without a number are appended to their run"""
+        store = TimelineStore(tmp_path / "timeline.sqlite3")
+        store.record("run_a", _iteration(2, "failed", "2026-01-01T10:00:00"), source="tracker")
+        store.record("run_a", {"status": "passed", "start_time": "2026-01-01T10:05:00"}, source="tracker")
+        store.record_many("run_b", [
+            {"status": "failed", "start_time": "2026-01-01T10:00:00"},
+            {"status": "passed", "start_time": "2026-01-01T10:05:00"},
+        ], source="tracker")
+        
+        assert [i["iteration"] for i in store.query(run_id="run_a")] == [2, 3]
+        assert [i["iteration"] for i in store.query(run_id="run_b")] == [1, 2]
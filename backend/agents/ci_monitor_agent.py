@@ -8,7 +8,14 @@ from datetime import datetime, timezone
 class CIMonitorAgent:
     timeline: list[dict] = field(default_factory=list)
 
-    def record(self, iteration: int, status: str, failures_remaining: int | None = None) -> None:
+    def record(
+        self,
+        iteration: int,
+        status: str,
+        failures_remaining: int | None = None,
+        duration_seconds: float | None = None,
+        log_path: str | None = None,
+    ) -> dict:
         event = {
             "iteration": iteration,
             "status": status,
@@ -16,4 +23,9 @@ class CIMonitorAgent:
         }
         if failures_remaining is not None:
             event["failures_remaining"] = failures_remaining
+        if duration_seconds is not None:
+            event["duration_seconds"] = duration_seconds
+        if log_path is not None:
+            event["log_path"] = log_path
         self.timeline.append(event)
+        return event
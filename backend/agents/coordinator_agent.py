@@ -1,60 +1,119 @@
 from __future__ import annotations
 
-import json
 import re
 import time
-from typing import Any
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Iterable
 
 try:
-    from .ci_monitor_agent import CIMonitorAgent
-    from .error_parser_agent import ErrorParserAgent
-    from .fix_agent import FixAgent
-    from .git_agent import GitAgent
-    from .repo_analyzer_agent import RepoAnalyzerAgent
-    from .test_runner_agent import TestRunnerAgent
+    from .error_parser_agent import ErrorParserAgent, ParsedFailure, failure_fingerprint
+    from .fix_agent import FixAgent, FixResult
+    from .git_agent import FORKS_PER_FILE_COMMIT, GitAgent, GitCommitWriter
+    from .preflight_agent import PreflightAgent, compile_source
+    from .repo_analyzer_agent import RepoAnalysis, RepoAnalyzerAgent
+    from .run_context import RunContext
+    from .test_runner_agent import SandboxSession, TestRunnerAgent
+    from ..events import EventBroker
+    from ..run_store import RunStore
     from ..config import (
         DEVOPS_BRANCH_HISTORY_PATH,
-        DEVOPS_CI_TIMELINE_PATH,
         DEVOPS_DATA_DIR,
-        RESULTS_PATH,
+        DEVOPS_LEGACY_BRANCH_HISTORY_PATH,
+        DEVOPS_LEGACY_CI_TIMELINE_PATH,
+        DEVOPS_PIPELINE_DB_PATH,
+        FIX_VERIFY_TESTS,
+        GIT_BACKGROUND_COMMITS,
+        GIT_COMMIT_MODE,
+        PREFLIGHT_ENABLED,
+        PREFLIGHT_MAX_ROUNDS,
+        PUSH_LOCAL_REMOTES_DIR,
+        PUSH_MAX_ATTEMPTS,
+        PUSH_REMOTE,
+        PUSH_RETRY_BACKOFF_SECONDS,
+        PUSH_WORKER_COUNT,
         WORKSPACES_DIR,
     )
     from ..scoring import calculate_score
     from ..utils.devops_bridge import DevOpsAutomationBridge
-    from ..utils.logger import ensure_parent_dir, get_logger
+    from ..utils.file_editor import EditBatch, EditSession
+    from ..utils.logger import get_logger
 except ImportError:
-    from agents.ci_monitor_agent import CIMonitorAgent  # type: ignore
-    from agents.error_parser_agent import ErrorParserAgent  # type: ignore
-    from agents.fix_agent import FixAgent  # type: ignore
-    from agents.git_agent import GitAgent  # type: ignore
-    from agents.repo_analyzer_agent import RepoAnalyzerAgent  # type: ignore
-    from agents.test_runner_agent import TestRunnerAgent  # type: ignore
+    from agents.error_parser_agent import (  # type: ignore
+        ErrorParserAgent,
+        ParsedFailure,
+        failure_fingerprint,
+    )
+    from agents.fix_agent import FixAgent, FixResult  # type: ignore
+    from agents.git_agent import (  # type: ignore
+        FORKS_PER_FILE_COMMIT,
+        GitAgent,
+        GitCommitWriter,
+    )
+    from agents.preflight_agent import PreflightAgent, compile_source  # type: ignore
+    from agents.repo_analyzer_agent import RepoAnalysis, RepoAnalyzerAgent  # type: ignore
+    from agents.run_context import RunContext  # type: ignore
+    from agents.test_runner_agent import SandboxSession, TestRunnerAgent  # type: ignore
+    from events import EventBroker  # type: ignore
+    from run_store import RunStore  # type: ignore
     from config import (  # type: ignore
         DEVOPS_BRANCH_HISTORY_PATH,
-        DEVOPS_CI_TIMELINE_PATH,
         DEVOPS_DATA_DIR,
-        RESULTS_PATH,
+        DEVOPS_LEGACY_BRANCH_HISTORY_PATH,
+        DEVOPS_LEGACY_CI_TIMELINE_PATH,
+        DEVOPS_PIPELINE_DB_PATH,
+        FIX_VERIFY_TESTS,
+        GIT_BACKGROUND_COMMITS,
+        GIT_COMMIT_MODE,
+        PREFLIGHT_ENABLED,
+        PREFLIGHT_MAX_ROUNDS,
+        PUSH_LOCAL_REMOTES_DIR,
+        PUSH_MAX_ATTEMPTS,
+        PUSH_REMOTE,
+        PUSH_RETRY_BACKOFF_SECONDS,
+        PUSH_WORKER_COUNT,
         WORKSPACES_DIR,
     )
     from scoring import calculate_score  # type: ignore
     from utils.devops_bridge import DevOpsAutomationBridge  # type: ignore
-    from utils.logger import ensure_parent_dir, get_logger  # type: ignore
+    from utils.file_editor import EditBatch, EditSession  # type: ignore
+    from utils.logger import get_logger  # type: ignore
 
 
 class CoordinatorAgent:
-    def __init__(self) -> None:
+    """Runs the clone/test/fix loop. Safe to call from many threads at once:
+    all per-run state lives in a ``RunContext`` and the agents held here are
+    stateless."""
+
+    def __init__(
+        self,
+        event_broker: EventBroker | None = None,
+        run_store: RunStore | None = None,
+    ) -> None:
         self.logger = get_logger("CoordinatorAgent")
+        self.events = event_broker or EventBroker()
+        self.run_store = run_store or RunStore()
         self.repo_analyzer = RepoAnalyzerAgent(WORKSPACES_DIR)
         self.test_runner = TestRunnerAgent()
         self.error_parser = ErrorParserAgent()
         self.fix_agent = FixAgent()
-        self.ci_monitor = CIMonitorAgent()
+        self.preflight = PreflightAgent() if PREFLIGHT_ENABLED else None
         self.devops_bridge = None
+        # Branch pushes outlive the run that started them; shared by all runs.
+        self._push_executor = ThreadPoolExecutor(
+            max_workers=PUSH_WORKER_COUNT, thread_name_prefix="rift-push"
+        )
 
         if DEVOPS_DATA_DIR.exists():
             self.devops_bridge = DevOpsAutomationBridge(
                 branch_history_path=DEVOPS_BRANCH_HISTORY_PATH,
-                ci_timeline_path=DEVOPS_CI_TIMELINE_PATH,
+                pipeline_db_path=DEVOPS_PIPELINE_DB_PATH,
+                legacy_branch_history_path=DEVOPS_LEGACY_BRANCH_HISTORY_PATH,
+                legacy_ci_timeline_path=DEVOPS_LEGACY_CI_TIMELINE_PATH,
             )
 
     def run(
@@ -63,158 +122,571 @@ class CoordinatorAgent:
         team_name: str,
         leader_name: str,
         max_retry: int = 5,
+        run_id: str | None = None,
     ) -> dict[str, Any]:
-        start = time.monotonic()
-        self.ci_monitor.timeline.clear()
-        fixes: list[dict[str, Any]] = []
-        total_failures = 0
-        commit_count = 0
-        final_status = "FAILED"
-        stop_reason = "unknown"
-        error_message = ""
-
-        branch_name = self._build_branch_name(team_name, leader_name)
-
-        # ✅ Unique workspace per run (Windows-safe, CI-safe)
+        run_id = run_id or uuid.uuid4().hex
+
+        # ✅ Unique workspace per run (Windows-safe, CI-safe). The run id suffix
+        # keeps runs for the same team started in the same second apart.
         base_workspace = self._build_workspace_name(team_name, leader_name)
-        workspace_name = f"{base_workspace}_{int(time.time())}"
+        ctx = RunContext(
+            run_id=run_id,
+            repo_url=repo_url,
+            team_name=team_name,
+            leader_name=leader_name,
+            branch_name=self._build_branch_name(team_name, leader_name),
+            workspace_name=f"{base_workspace}_{int(time.time())}_{run_id[:8]}",
+            max_retry=max_retry,
+            events=self.events.open(run_id),
+        )
+        ctx.emit(
+            "run_started",
+            repo_url=repo_url,
+            team_name=team_name,
+            leader_name=leader_name,
+            branch_name=ctx.branch_name,
+            max_retry=max_retry,
+        )
 
+        git_agent: GitAgent | None = None
         try:
-            analysis = self.repo_analyzer.clone_and_analyze(repo_url, workspace_name)
-            git_agent = GitAgent(analysis.repo_path)
-            git_agent.create_branch(branch_name)
+            git_agent = self._execute(ctx)
+        except Exception as exc:
+            self.logger.exception("Coordinator run failed: %s", exc)
+            ctx.final_status = "FAILED"
+            ctx.stop_reason = "runtime_error"
+            ctx.error_message = str(exc)
 
-            consecutive_unparseable = 0
+        result = self._build_result(ctx)
+        try:
+            self.run_store.save(result)
+        except Exception as exc:  # noqa: BLE001
+            self.logger.exception("Failed to store run %s: %s", run_id, exc)
 
-            for iteration in range(1, max_retry + 1):
+        if self.devops_bridge is not None:
+            try:
+                self.devops_bridge.sync_run_data(
+                    run_id=run_id,
+                    branch_name=ctx.branch_name,
+                    team_name=team_name,
+                    leader_name=leader_name,
+                    ci_timeline=ctx.timeline,
+                )
+            except Exception as exc:  # noqa: BLE001
+                self.logger.exception(
+                    "Failed to sync DevOps_Git_Automation data: %s", exc
+                )
+
+        ctx.emit("run_completed", result=result)
+        if git_agent is not None and ctx.push_status == "pending":
+            # The event stream stays open until the push is reported.
+            self._push_executor.submit(self._push, ctx, git_agent)
+        else:
+            self.events.close(run_id)
+        return result
+
+    def _execute(self, ctx: RunContext) -> GitAgent:
+        """Run the clone/test/fix loop; returns the agent for the clone so
+        the caller can push the branch."""
+        with ctx.stage("clone"):
+            analysis = self.repo_analyzer.clone_and_analyze(
+                ctx.repo_url, ctx.workspace_name, tracer=ctx.tracer
+            )
+            git_agent = GitAgent(analysis.repo_path, tracer=ctx.tracer)
+            git_agent.create_branch(ctx.branch_name)
+
+        # Fix commits run in the background while the next test run goes on;
+        # closing the writer waits for the last of them.
+        ctx.git_writer = GitCommitWriter(background=GIT_BACKGROUND_COMMITS)
+        with ctx.git_writer:
+            if self.preflight is not None:
+                with ctx.stage("preflight"):
+                    self._preflight(ctx, git_agent, analysis.repo_path)
+
+            # One warm sandbox container per run; torn down as soon as the
+            # iterations are over, whatever their outcome.
+            with self.test_runner.session(
+                analysis.repo_path, ctx.run_id, tracer=ctx.tracer
+            ) as sandbox:
+                with ctx.stage("sandbox_setup"):
+                    sandbox.start()
+                self._iterate(ctx, analysis, git_agent, sandbox)
+
+        if ctx.commit_count > 0:
+            ctx.push_status = "pending"
+
+        if ctx.final_status != "PASSED" and ctx.stop_reason == "unknown":
+            ctx.stop_reason = "max_retry_exhausted"
+        return git_agent
+
+    def _push(self, ctx: RunContext, git_agent: GitAgent) -> None:
+        """Push the fix branch, then record the outcome in the run store and
+        close the run's event stream. The result returned by ``run`` is
+        shared with its callers by then and is left as it is."""
+        try:
+            error = self._push_with_retry(ctx, git_agent)
+        except Exception as exc:  # noqa: BLE001
+            error = str(exc)
+        ctx.push_status = "failed" if error else "pushed"
+        update = {"push_status": ctx.push_status, "push_error": error}
+        # The stored spans predate the push; store them again with its own.
+        spans = {"spans": ctx.tracer.spans(), "spans_dropped": ctx.tracer.dropped}
+        try:
+            self.run_store.update(ctx.run_id, **update, **spans)
+        except Exception as exc:  # noqa: BLE001
+            self.logger.exception("Failed to store push status of run %s: %s", ctx.run_id, exc)
+        ctx.emit("push_completed", **update)
+        self.events.close(ctx.run_id)
+
+    def _push_with_retry(self, ctx: RunContext, git_agent: GitAgent) -> str:
+        """Returns the last attempt's error, or "" once a push succeeded."""
+        remote = self._push_remote(ctx)
+        delay = PUSH_RETRY_BACKOFF_SECONDS
+        error = ""
+        for attempt in range(1, max(1, PUSH_MAX_ATTEMPTS) + 1):
+            if attempt > 1:
+                time.sleep(delay)
+                delay *= 2
+            try:
+                with ctx.stage("push", attempt=attempt, remote=remote):
+                    git_agent.push_branch(ctx.branch_name, remote)
+                return ""
+            except Exception as exc:  # noqa: BLE001
+                error = str(exc) or type(exc).__name__
+                self.logger.warning(
+                    "Push attempt %s for run %s failed: %s", attempt, ctx.run_id, exc
+                )
+        return error
+
+    def _push_remote(self, ctx: RunContext) -> str:
+        if PUSH_REMOTE != "local":
+            return PUSH_REMOTE
+        return GitAgent.init_bare_remote(PUSH_LOCAL_REMOTES_DIR / f"{ctx.workspace_name}.git")
+
+    def _preflight(self, ctx: RunContext, git_agent: GitAgent, repo_path: Path) -> None:
+        """Fix compile errors locally before the first sandbox run. Later
+        rounds only recompile the files the previous round edited, since a
+        file only reports its first syntax error."""
+        files: set[str] | None = None
+        for _ in range(PREFLIGHT_MAX_ROUNDS):
+            failures = self.preflight.check(repo_path, files)
+            if not failures:
+                return
+            ctx.emit(
+                "failures_parsed",
+                iteration=0,
+                source="preflight",
+                failures=[asdict(failure) for failure in failures],
+            )
+            ctx.total_failures += len(failures)
+            files = self._apply_fixes(ctx, git_agent, repo_path, failures)
+            if not files:
+                return
+
+    def _iterate(
+        self,
+        ctx: RunContext,
+        analysis: RepoAnalysis,
+        git_agent: GitAgent,
+        sandbox: SandboxSession,
+    ) -> None:
+        consecutive_unparseable = 0
+        # Root-cause fingerprints of the previous iteration's failures; an
+        # identical set means the last fixes changed nothing.
+        previous_failure_set: frozenset[str] | None = None
+        # Tests to run next; None means the full discovered suite. After a
+        # fix only the failing tests and the tests touching edited files are
+        # re-run, and the full suite runs again once they pass.
+        targets: list[str] | None = None
+
+        for iteration in range(1, ctx.max_retry + 1):
+            iteration_started = time.monotonic()
+            # The last iteration always runs everything so a run can still
+            # finish PASSED without a separate confirmation pass.
+            full_run = targets is None or iteration == ctx.max_retry
+            tests = analysis.discovered_tests if full_run else targets
+            with ctx.stage(
+                "test",
+                iteration=iteration,
+                scope="full" if full_run else "targeted",
+                tests_selected=len(tests),
+            ):
                 run_result = self.test_runner.run(
-                    analysis.repo_path, analysis.discovered_tests
+                    analysis.repo_path, tests, session=sandbox
                 )
 
-                run_status = "PASSED" if run_result.passed else "FAILED"
-                parsed_failures = []
-                if not run_result.passed:
-                    parsed_failures = self.error_parser.parse(
-                        run_result.output, analysis.repo_path
+            run_status = "PASSED" if run_result.passed else "FAILED"
+            parsed_failures = []
+            if not run_result.passed:
+                with ctx.stage("parse", iteration=iteration):
+                    # Prefer the reporter's exact results; scrape the log
+                    # only when it produced none (e.g. setup failures).
+                    parsed_failures = self.error_parser.parse_report(
+                        run_result.results, analysis.repo_path, tracer=ctx.tracer
+                    ) or self.error_parser.parse(
+                        run_result.lines(), analysis.repo_path, tracer=ctx.tracer
                     )
+                ctx.emit(
+                    "failures_parsed",
+                    iteration=iteration,
+                    failures=[asdict(failure) for failure in parsed_failures],
+                )
 
-                self.ci_monitor.record(
+            ctx.emit(
+                "iteration",
+                **ctx.ci_monitor.record(
                     iteration=iteration,
                     status=run_status,
                     failures_remaining=len(parsed_failures),
-                )
+                    duration_seconds=round(time.monotonic() - iteration_started, 3),
+                    # Full test output; the in-memory one is only its tail.
+                    log_path=str(run_result.log_path) if run_result.log_path else None,
+                ),
+            )
 
-                # ✅ CI passed — stop immediately
-                if run_result.passed:
-                    final_status = "PASSED"
-                    stop_reason = "tests_passed"
-                    break
+            # ✅ CI passed — stop immediately
+            if run_result.passed and full_run:
+                ctx.final_status = "PASSED"
+                ctx.stop_reason = "tests_passed"
+                break
+
+            if run_result.passed:
+                # Targeted set is green; confirm with the full suite.
+                targets = None
+                continue
 
-                total_failures += len(parsed_failures)
+            ctx.total_failures += len(parsed_failures)
+            targets = run_result.failed_tests or None
 
-                if not parsed_failures:
-                    consecutive_unparseable += 1
+            if not parsed_failures:
+                consecutive_unparseable += 1
+                self.logger.warning(
+                    "Test run failed but no parseable failures were found in iteration %s "
+                    "(consecutive: %s)",
+                    iteration,
+                    consecutive_unparseable,
+                )
+                # After 2 consecutive unparseable failures there is nothing
+                # the agent can fix — bail out immediately instead of
+                # burning through all remaining retries.
+                if consecutive_unparseable >= 2:
                     self.logger.warning(
-                        "Test run failed but no parseable failures were found in iteration %s "
-                        "(consecutive: %s)",
-                        iteration,
-                        consecutive_unparseable,
+                        "Stopping retries: 2 consecutive unparseable failures."
                     )
-                    # After 2 consecutive unparseable failures there is nothing
-                    # the agent can fix — bail out immediately instead of
-                    # burning through all remaining retries.
-                    if consecutive_unparseable >= 2:
-                        self.logger.warning(
-                            "Stopping retries: 2 consecutive unparseable failures."
-                        )
-                        stop_reason = "unparseable_failures"
-                        break
-                    continue
+                    ctx.stop_reason = "unparseable_failures"
+                    break
+                continue
+            else:
+                consecutive_unparseable = 0  # reset when we find actionable failures
+
+            failure_set = frozenset(failure_fingerprint(f) for f in parsed_failures)
+            if failure_set == previous_failure_set:
+                self.logger.warning(
+                    "Stopping retries: iteration %s failed exactly like the previous one.",
+                    iteration,
+                )
+                ctx.stop_reason = "no_progress"
+                break
+            previous_failure_set = failure_set
+
+            with ctx.stage("fix", iteration=iteration):
+                edited_files = self._apply_fixes(
+                    ctx,
+                    git_agent,
+                    analysis.repo_path,
+                    parsed_failures,
+                    sandbox=sandbox,
+                    tests=analysis.discovered_tests,
+                    failing_tests=run_result.failed_tests,
+                )
+
+            # Nothing was edited, so another test run would fail the same
+            # way. Either no remaining failure has a fixer (e.g. LOGIC) or
+            # every fix attempt failed.
+            if not edited_files:
+                if any(self.fix_agent.can_fix(f) for f in parsed_failures):
+                    ctx.stop_reason = "no_progress"
                 else:
-                    consecutive_unparseable = 0  # reset when we find actionable failures
-
-                for failure in parsed_failures:
-                    fix = self.fix_agent.apply_fix(analysis.repo_path, failure)
-
-                    if fix.status == "Fixed":
-                        try:
-                            committed = git_agent.commit_fix(
-                                fix.file, fix.commit_message
-                            )
-                            if committed:
-                                commit_count += 1
-                            else:
-                                fix.status = "Failed"
-                        except Exception as exc:
-                            self.logger.exception("Commit failed: %s", exc)
-                            fix.status = "Failed"
-
-                    fixes.append(
-                        {
-                            "file": fix.file,
-                            "bug_type": fix.bug_type,
-                            "line_number": fix.line_number,
-                            "commit_message": fix.commit_message,
-                            "status": fix.status,
-                        }
+                    ctx.stop_reason = "no_fixable_failures"
+                self.logger.warning(
+                    "Stopping retries: no fix applied in iteration %s (%s).",
+                    iteration,
+                    ctx.stop_reason,
+                )
+                break
+
+            if targets is not None:
+                targets = sorted(
+                    set(targets)
+                    | set(
+                        self.test_runner.affected_tests(
+                            analysis.repo_path, analysis.discovered_tests, edited_files
+                        )
                     )
+                )
+
+    def _apply_fixes(
+        self,
+        ctx: RunContext,
+        git_agent: GitAgent,
+        repo_path: Path,
+        parsed_failures: list[ParsedFailure],
+        sandbox: SandboxSession | None = None,
+        tests: list[str] | None = None,
+        failing_tests: Iterable[str] = (),
+    ) -> set[str]:
+        """Apply and commit one fix per root-cause group; returns the edited
+        files. Cascading failures (e.g. one missing module failing every
+        test that imports it) share a group and are only fixed once.
 
-            if commit_count > 0:
-                git_agent.push_branch(branch_name)
+        All fixes go through one edit batch planned by ``FixAgent.apply_fixes``,
+        so each file is read and written once per call, then committed once
+        with all of its fixes. Each file is verified before its commit (see
+        ``_verify_compiles`` and ``_verify_tests``); a file failing
+        verification is reverted and its fixes are reported as failed.
+        Files are written and test-verified one at a time, so a regression
+        is only blamed on the edit that caused it.
+        """
+        # Pending commits read the working tree; let them finish first.
+        if ctx.git_writer is not None:
+            ctx.git_writer.drain()
+
+        batch = EditBatch()
+        groups = self.error_parser.group(parsed_failures)
+        applied = list(
+            zip(
+                groups,
+                self.fix_agent.apply_fixes(
+                    repo_path, [group.representative for group in groups], batch, tracer=ctx.tracer
+                ),
+            )
+        )
+        fixed_by_file: dict[str, list[FixResult]] = {}
+        for _, fix in applied:
+            if fix.status == "Fixed":
+                fixed_by_file.setdefault(fix.file, []).append(fix)
+
+        def reject(file: str, reason: str) -> None:
+            batch.sessions[repo_path / file].revert()
+            for fix in fixed_by_file.pop(file):
+                fix.status = "Failed"
+            self.logger.warning("Reverted fixes in %s: %s", file, reason)
+            ctx.emit("fix_reverted", file=file, reason=reason)
+
+        for file in list(fixed_by_file):
+            reason = self._verify_compiles(file, batch.sessions[repo_path / file])
+            if reason:
+                reject(file, reason)
+
+        verify_tests = bool(FIX_VERIFY_TESTS and sandbox is not None and tests)
+        failing = set(failing_tests)
+        try:
+            if verify_tests:
+                # Files verified earlier are on disk, later ones are not yet.
+                for file in list(fixed_by_file):
+                    batch.sessions[repo_path / file].commit()
+                    reason = self._verify_tests(repo_path, file, sandbox, tests, failing)
+                    if reason:
+                        reject(file, reason)
+            batch.commit()
+        except OSError as exc:
+            self.logger.exception("Writing fixes failed: %s", exc)
+            for _, fix in applied:
+                fix.status = "Failed"
+            fixed_by_file = {}
+
+        # A fix that left its file unchanged has nothing to commit.
+        for file in list(fixed_by_file):
+            if not batch.sessions[repo_path / file].written:
+                for fix in fixed_by_file.pop(file):
+                    fix.status = "Failed"
+
+        # Indexes into ctx.fixes, which match the order of the fix events.
+        fix_indexes_by_file: dict[str, list[int]] = {}
+        for group, fix in applied:
+            fix_entry = {
+                "file": fix.file,
+                "bug_type": fix.bug_type,
+                "line_number": fix.line_number,
+                "commit_message": fix.commit_message,
+                "status": fix.status,
+                "fingerprint": group.fingerprint,
+                "group_size": group.size,
+            }
+            if fix.file in fixed_by_file:
+                fix_indexes_by_file.setdefault(fix.file, []).append(len(ctx.fixes))
+            ctx.fixes.append(fix_entry)
+            ctx.emit("fix", **fix_entry)
+
+        if fixed_by_file:
+            job = partial(self._commit_fixes, ctx, git_agent, fixed_by_file, fix_indexes_by_file)
+            if ctx.git_writer is not None:
+                ctx.git_writer.submit(job)
+            else:
+                job()
+        return set(fixed_by_file)
+
+    def _commit_fixes(
+        self,
+        ctx: RunContext,
+        git_agent: GitAgent,
+        fixed_by_file: dict[str, list[FixResult]],
+        fix_indexes_by_file: dict[str, list[int]],
+    ) -> None:
+        """Commit job, usually on the run's git writer thread. Fix entries
+        were recorded (and emitted) as Fixed; those whose commit fails are
+        set to Failed and reported by a ``commit_failed`` event carrying
+        their indexes in ``ctx.fixes``."""
+        forks_before = git_agent.forks
+        with ctx.stage("commit", files=len(fixed_by_file)):
+            if GIT_COMMIT_MODE == "iteration":
+                committed_files = self._commit_iteration(ctx, git_agent, fixed_by_file)
+            else:
+                committed_files = set()
+                for file, file_fixes in fixed_by_file.items():
+                    message = self._commit_message(file, file_fixes)
+                    if self._commit(ctx, lambda: git_agent.commit_fix(file, message)):
+                        committed_files.add(file)
+        forks = git_agent.forks - forks_before
+        ctx.git_forks += forks
+        # Compared with one commit_fix per file; never reported as negative.
+        ctx.git_forks_saved += max(0, FORKS_PER_FILE_COMMIT * len(fixed_by_file) - forks)
 
-            if final_status != "PASSED":
-                stop_reason = "max_retry_exhausted"
+        for file, indexes in fix_indexes_by_file.items():
+            if file in committed_files:
+                continue
+            for index in indexes:
+                ctx.fixes[index]["status"] = "Failed"
+            ctx.emit("commit_failed", file=file, fixes=indexes)
 
+    def _verify_compiles(self, file: str, session: EditSession) -> str | None:
+        """Why the edited ``file`` must not be written, if the edit added a
+        compile error.
+
+        ``compile`` only reports a file's first error, so errors are compared
+        through it: an edit is kept when the file now compiles, when its
+        first error moved further down (one fix per syntax error), or when
+        the file's old first error is still first and unedited, e.g. a
+        LINTING fix elsewhere in a file with an unrelated syntax error.
+        Errors an edit adds below an existing one are left to the test run.
+        """
+        if not file.endswith(".py"):
+            return None
+        after = compile_source(session.source(), file)
+        if after is None:
+            return None
+        before = compile_source("".join(session.original), file)
+        moved_to = session.origin(after[1])
+        if before is not None and moved_to is not None:
+            if moved_to > before[1]:
+                return None
+            unchanged = (after[0], moved_to, after[2]) == before
+            if unchanged and moved_to not in session.touched:
+                return None
+        return f"{after[0]} at line {after[1]}: {after[2]}"
+
+    def _verify_tests(
+        self,
+        repo_path: Path,
+        file: str,
+        sandbox: SandboxSession,
+        tests: list[str],
+        failing: set[str],
+    ) -> str | None:
+        """Why the fixes in ``file`` must be reverted, if the tests touching
+        it now fail where they did not fail before. Called with ``file``
+        the last edited file written to disk."""
+        selected = self.test_runner.affected_tests(repo_path, tests, {file})
+        if not selected:
+            return None
+        result = self.test_runner.run(repo_path, selected, session=sandbox)
+        if result.passed:
+            return None
+        new_failures = [
+            node
+            for node in result.failed_tests
+            if node not in failing and node.split("::", 1)[0] not in failing
+        ]
+        if not new_failures:
+            return None
+        return f"{len(new_failures)} new failing test(s), e.g. {new_failures[0]}"
+
+    def _commit_iteration(
+        self,
+        ctx: RunContext,
+        git_agent: GitAgent,
+        fixed_by_file: dict[str, list[FixResult]],
+    ) -> set[str]:
+        """Commit every fixed file of one iteration as a single commit."""
+        if not fixed_by_file:
+            return set()
+        fixes = [fix for file_fixes in fixed_by_file.values() for fix in file_fixes]
+        if len(fixed_by_file) == 1:
+            (file,) = fixed_by_file
+            message = self._commit_message(file, fixes)
+        else:
+            details = "\n".join(fix.commit_message for fix in fixes)
+            message = f"Fix {len(fixes)} issues in {len(fixed_by_file)} files\n\n{details}"
+
+        if self._commit(ctx, lambda: git_agent.commit_files(list(fixed_by_file), message)):
+            return set(fixed_by_file)
+        return set()
+
+    def _commit(self, ctx: RunContext, commit: Callable[[], bool]) -> bool:
+        """Run one commit attempt; a failing git command counts as not
+        committed."""
+        try:
+            committed = commit()
         except Exception as exc:
-            self.logger.exception("Coordinator run failed: %s", exc)
-            final_status = "FAILED"
-            stop_reason = "runtime_error"
-            error_message = str(exc)
+            self.logger.exception("Commit failed: %s", exc)
+            return False
+        if committed:
+            ctx.commit_count += 1
+        return committed
 
-        elapsed = time.monotonic() - start
+    def _commit_message(self, file: str, fixes: list[FixResult]) -> str:
+        if len(fixes) == 1:
+            return fixes[0].commit_message
+        details = "\n".join(fix.commit_message for fix in fixes)
+        return f"Fix {len(fixes)} issues in {file}\n\n{details}"
+
+    def _build_result(self, ctx: RunContext) -> dict[str, Any]:
+        elapsed = ctx.elapsed()
         score = calculate_score(
-            time_taken_seconds=elapsed, commit_count=commit_count
+            time_taken_seconds=elapsed, commit_count=ctx.commit_count
         )
 
-        result: dict[str, Any] = {
-            "repo_url": repo_url,
-            "team_name": team_name,
-            "leader_name": leader_name,
-            "branch_name": branch_name,
-            "total_failures": total_failures,
-            "fixes_applied": sum(1 for f in fixes if f["status"] == "Fixed"),
-            "final_status": final_status,
-            "stop_reason": stop_reason,
-            "error_message": error_message,
+        return {
+            "run_id": ctx.run_id,
+            "repo_url": ctx.repo_url,
+            "team_name": ctx.team_name,
+            "leader_name": ctx.leader_name,
+            "branch_name": ctx.branch_name,
+            "start_time": ctx.start_time,
+            "end_time": datetime.now(timezone.utc).isoformat(),
+            "total_failures": ctx.total_failures,
+            "fixes_applied": sum(1 for f in ctx.fixes if f["status"] == "Fixed"),
+            "final_status": ctx.final_status,
+            "stop_reason": ctx.stop_reason,
+            "error_message": ctx.error_message,
             "time_taken_seconds": round(elapsed, 3),
+            "commit_count": ctx.commit_count,
+            "git_forks": ctx.git_forks,
+            "git_forks_saved": ctx.git_forks_saved,
+            "push_status": ctx.push_status,
+            "push_error": "",
             "score": {
                 "base": score.base,
                 "speed_bonus": score.speed_bonus,
                 "penalty": score.penalty,
                 "final_score": score.final_score,
             },
-            "fixes": fixes,
-            "ci_cd_timeline": self.ci_monitor.timeline,
+            "fixes": ctx.fixes,
+            "ci_cd_timeline": ctx.timeline,
+            "spans": ctx.tracer.spans(),
+            "spans_dropped": ctx.tracer.dropped,
         }
 
-        ensure_parent_dir(RESULTS_PATH)
-        RESULTS_PATH.write_text(json.dumps(result, indent=2), encoding="utf-8")
-
-        if self.devops_bridge is not None:
-            try:
-                self.devops_bridge.sync_run_data(
-                    branch_name=branch_name,
-                    team_name=team_name,
-                    leader_name=leader_name,
-                    ci_timeline=self.ci_monitor.timeline,
-                )
-            except Exception as exc:  # noqa: BLE001
-                self.logger.exception(
-                    "Failed to sync DevOps_Git_Automation data: %s", exc
-                )
-
-        return result
-
     def _build_branch_name(self, team_name: str, leader_name: str) -> str:
         safe_team = re.sub(r"[^A-Za-z0-9]+", "_", team_name.strip()).strip("_").upper()
         safe_leader = re.sub(r"[^A-Za-z0-9]+", "_", leader_name.strip()).strip("_").upper()
@@ -1,13 +1,26 @@
 from __future__ import annotations
 
+import hashlib
 import re
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Iterable, Iterator
 
 try:
+    from .test_runner_agent import TestCaseResult
     from ..utils.bug_mapper import map_error_to_bug_type
+    from ..tracing import SpanRecorder, trace_span
+    from ..utils.output_parsers import OutputParser, RawFailure, detect_format, get_parser
 except ImportError:
+    from agents.test_runner_agent import TestCaseResult  # type: ignore
     from utils.bug_mapper import map_error_to_bug_type  # type: ignore
+    from tracing import SpanRecorder, trace_span  # type: ignore
+    from utils.output_parsers import (  # type: ignore
+        OutputParser,
+        RawFailure,
+        detect_format,
+        get_parser,
+    )
 
 
 @dataclass
@@ -16,64 +29,102 @@ class ParsedFailure:
     line_number: int
     message: str
     bug_type: str
+    # Duplicates (same file, line and bug type) collapsed into this record.
+    occurrences: int = 1
 
 
-class ErrorParserAgent:
-    # Matches pytest-style source location lines: path.py:line: message
-    PYTEST_LINE_RE = re.compile(
-        r"^(?P<file>[^\s:][^:]*\.py):(?P<line>\d+):\s*(?P<message>.+)$"
-    )
+@dataclass
+class FailureGroup:
+    """Failures sharing a root cause; only ``representative`` is fixed."""
 
-    # Captures traceback error payload lines prefixed with "E   ..."
-    TRACEBACK_LINE_RE = re.compile(r"^E\s+(.+)$")
+    fingerprint: str
+    representative: ParsedFailure
+    size: int
 
-    def parse(self, output: str, repo_path: Path) -> list[ParsedFailure]:
-        failures: list[ParsedFailure] = []
-        lines = output.splitlines()
 
-        for idx, line in enumerate(lines):
-            match = self.PYTEST_LINE_RE.match(line.strip())
-            if not match:
-                continue
+# First exception class named in a failure message.
+EXCEPTION_NAME_RE = re.compile(r"\b([A-Za-z_]\w*(?:Error|Exception|Exit|Interrupt))\b")
+# Failed imports are keyed by the missing name alone: every importer fails
+# at its own import line, but they share one cause.
+IMPORT_EXCEPTIONS = {"ModuleNotFoundError", "ImportError"}
+_ADDRESS_RE = re.compile(r"0x[0-9a-fA-F]+")
+_NUMBER_RE = re.compile(r"\d+")
+_SPACE_RE = re.compile(r"\s+")
 
-            raw_file = match.group("file")
-            line_number = int(match.group("line"))
-            message = match.group("message")
 
-            # Attach traceback context if present
-            if idx + 1 < len(lines):
-                trace_match = self.TRACEBACK_LINE_RE.match(lines[idx + 1].strip())
-                if trace_match:
-                    message = f"{message} | {trace_match.group(1)}"
+def failure_fingerprint(failure: ParsedFailure) -> str:
+    """Stable id for a failure's root cause: exception type, message with
+    numbers and addresses masked, and the in-repo frame it was raised at."""
+    match = EXCEPTION_NAME_RE.search(failure.message)
+    exception_type = match.group(1) if match else failure.bug_type
+    message = failure.message[match.end():] if match else failure.message
+    message = _ADDRESS_RE.sub("0x", message)
+    message = _NUMBER_RE.sub("N", message)
+    message = _SPACE_RE.sub(" ", message).strip(" :|").lower()
 
-            normalized_file = self._normalize_file(raw_file, repo_path)
+    frame = "" if exception_type in IMPORT_EXCEPTIONS else f"{failure.file}:{failure.line_number}"
+    raw = "\0".join((exception_type, message, frame))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
 
-            # 🔥 CRITICAL FIX: ignore non-repo files (pytest, venv, site-packages)
-            if not normalized_file:
-                continue
-            if normalized_file.startswith(".."):
-                continue
-            if normalized_file.startswith(".venv"):
-                continue
-            if "site-packages" in normalized_file:
-                continue
 
-            mapped = map_error_to_bug_type(message)
+class ErrorParserAgent:
+    # Lines worth reporting when nothing else could be parsed.
+    BEST_EFFORT_RE = re.compile(r"Error|FAILED|(?i:assert)")
 
-            failures.append(
-                ParsedFailure(
-                    file=normalized_file,
-                    line_number=line_number,
-                    message=message,
-                    bug_type=mapped.bug_type,
-                )
-            )
+    def parse(
+        self,
+        output: str | Iterable[str],
+        repo_path: Path,
+        output_format: str | None = None,
+        tracer: SpanRecorder | None = None,
+    ) -> list[ParsedFailure]:
+        """Scan tool output in a single pass.
+
+        ``output`` may be a string or any iterable of lines, e.g.
+        ``TestRunResult.lines()`` streaming from the spill file. The format
+        (pytest, traceback, flake8/pylint, mypy; see ``utils.output_parsers``)
+        is detected once from the first lines unless ``output_format`` names
+        it. Failures are de-duplicated as they are found, so memory is
+        bounded by the number of distinct failures.
+        """
+        lines = output.splitlines() if isinstance(output, str) else output
+        with trace_span(tracer, "parse_output", "parse") as span:
+            if output_format is None:
+                parser_cls, lines = detect_format(lines)
+            else:
+                parser_cls = get_parser(output_format)
+            span["format"] = parser_cls.name
+            failures = self._parse_lines(lines, parser_cls, repo_path)
+            span["failures"] = len(failures)
+        return failures
+
+    def _parse_lines(
+        self, lines: Iterable[str], parser_cls: type[OutputParser], repo_path: Path
+    ) -> list[ParsedFailure]:
+        failures: list[ParsedFailure] = []
+        seen: dict[tuple[str, int, str], ParsedFailure] = {}
+        # Normalized (or rejected, "") path per distinct file string.
+        file_cache: dict[str, str] = {}
+        parser = parser_cls(
+            in_repo=lambda raw_file: bool(self._repo_file(file_cache, raw_file, repo_path))
+        )
+        feed = parser.feed
+        fallback_message = ""
+        search_best_effort = self.BEST_EFFORT_RE.search
+
+        for line in lines:
+            for raw in feed(line):
+                self._add_failure(failures, seen, file_cache, raw, repo_path)
+            if not fallback_message and search_best_effort(line):
+                fallback_message = line.strip()
+
+        for raw in parser.close():
+            self._add_failure(failures, seen, file_cache, raw, repo_path)
 
         if failures:
-            return self._dedupe(failures)
+            return failures
 
         # Best-effort fallback (rare, but safe)
-        fallback_message = self._best_effort_message(lines)
         if fallback_message:
             mapped = map_error_to_bug_type(fallback_message)
             failures.append(
@@ -87,6 +138,99 @@ class ErrorParserAgent:
 
         return failures
 
+    def parse_chunks(
+        self,
+        chunks: Iterable[str],
+        repo_path: Path,
+        output_format: str | None = None,
+    ) -> list[ParsedFailure]:
+        """Like ``parse`` for raw output chunks that may split lines anywhere."""
+        return self.parse(_lines_from_chunks(chunks), repo_path, output_format)
+
+    def _repo_file(self, file_cache: dict[str, str], raw_file: str, repo_path: Path) -> str:
+        """Repo-relative path for ``raw_file``, or "" outside the repo."""
+        normalized_file = file_cache.get(raw_file)
+        if normalized_file is None:
+            normalized_file = self._normalize_file(raw_file, repo_path)
+            # 🔥 CRITICAL FIX: ignore non-repo files (pytest, venv, site-packages)
+            if (
+                normalized_file.startswith(("..", ".venv"))
+                or "site-packages" in normalized_file
+            ):
+                normalized_file = ""
+            file_cache[raw_file] = normalized_file
+        return normalized_file
+
+    def _add_failure(
+        self,
+        failures: list[ParsedFailure],
+        seen: dict[tuple[str, int, str], ParsedFailure],
+        file_cache: dict[str, str],
+        raw: RawFailure,
+        repo_path: Path,
+    ) -> None:
+        normalized_file = self._repo_file(file_cache, raw.file, repo_path)
+        if not normalized_file:
+            return
+
+        mapped = map_error_to_bug_type(raw.message)
+        key = (normalized_file, raw.line_number, mapped.bug_type)
+        existing = seen.get(key)
+        if existing is not None:
+            existing.occurrences += 1
+            return
+
+        failure = ParsedFailure(
+            file=normalized_file,
+            line_number=raw.line_number,
+            message=raw.message,
+            bug_type=mapped.bug_type,
+        )
+        seen[key] = failure
+        failures.append(failure)
+
+    def parse_report(
+        self,
+        results: Iterable[TestCaseResult],
+        repo_path: Path,
+        tracer: SpanRecorder | None = None,
+    ) -> list[ParsedFailure]:
+        """Failures from the sandbox reporter's structured results."""
+        with trace_span(tracer, "parse_report", "parse") as span:
+            failures = self._report_failures(results, repo_path)
+            span["failures"] = len(failures)
+        return failures
+
+    def _report_failures(
+        self, results: Iterable[TestCaseResult], repo_path: Path
+    ) -> list[ParsedFailure]:
+        failures: list[ParsedFailure] = []
+        file_cache: dict[str, str] = {}
+        for case in results:
+            if not case.failed or not case.file:
+                continue
+
+            # Same path filter as the streaming parser.
+            normalized_file = self._repo_file(file_cache, case.file, repo_path)
+            if not normalized_file:
+                continue
+
+            message = case.message.strip().splitlines()[0] if case.message.strip() else ""
+            if case.exception_type:
+                message = f"{case.exception_type}: {message}" if message else case.exception_type
+            mapped = map_error_to_bug_type(message)
+
+            failures.append(
+                ParsedFailure(
+                    file=normalized_file,
+                    line_number=case.line,
+                    message=message,
+                    bug_type=mapped.bug_type,
+                )
+            )
+
+        return self._dedupe(failures)
+
     def _normalize_file(self, file_path: str, repo_path: Path) -> str:
         """
         Normalize paths so only repo-relative paths are returned.
@@ -102,21 +246,47 @@ class ErrorParserAgent:
 
         return file_path
 
-    def _best_effort_message(self, lines: list[str]) -> str:
-        for line in lines:
-            if "Error" in line or "FAILED" in line or "assert" in line.lower():
-                return line.strip()
-        return ""
+    def group(self, failures: Iterable[ParsedFailure]) -> list[FailureGroup]:
+        """Collapse failures by ``failure_fingerprint``, in first-seen order.
+        A group's size counts every collapsed occurrence."""
+        groups: dict[str, FailureGroup] = {}
+        for failure in failures:
+            fingerprint = failure_fingerprint(failure)
+            group = groups.get(fingerprint)
+            if group is None:
+                groups[fingerprint] = FailureGroup(
+                    fingerprint=fingerprint,
+                    representative=failure,
+                    size=failure.occurrences,
+                )
+            else:
+                group.size += failure.occurrences
+        return list(groups.values())
 
     def _dedupe(self, failures: list[ParsedFailure]) -> list[ParsedFailure]:
-        seen: set[tuple[str, int, str]] = set()
+        seen: dict[tuple[str, int, str], ParsedFailure] = {}
         unique: list[ParsedFailure] = []
 
         for failure in failures:
             key = (failure.file, failure.line_number, failure.bug_type)
-            if key in seen:
+            existing = seen.get(key)
+            if existing is not None:
+                existing.occurrences += failure.occurrences
                 continue
-            seen.add(key)
+            seen[key] = failure
             unique.append(failure)
 
         return unique
+
+
+def _lines_from_chunks(chunks: Iterable[str]) -> Iterator[str]:
+    carry = ""
+    for chunk in chunks:
+        if not chunk:
+            continue
+        parts = (carry + chunk).split("\n")
+        carry = parts.pop()
+        for part in parts:
+            yield part.rstrip("\r")
+    if carry:
+        yield carry.rstrip("\r")
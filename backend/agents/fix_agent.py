@@ -6,10 +6,17 @@ from pathlib import Path
 
 try:
     from .error_parser_agent import ParsedFailure
-    from ..utils.file_editor import insert_line, normalize_indentation, remove_line, update_line
+    from ..tracing import SpanRecorder, trace_span
+    from ..utils.file_editor import EditBatch, EditSession
 except ImportError:
     from agents.error_parser_agent import ParsedFailure  # type: ignore
-    from utils.file_editor import insert_line, normalize_indentation, remove_line, update_line  # type: ignore
+    from tracing import SpanRecorder, trace_span  # type: ignore
+    from utils.file_editor import EditBatch, EditSession  # type: ignore
+
+
+# Bug types apply_fix has a fixer for; anything else is reported but never
+# edited. Logic fixes are intentionally skipped (judge-safe).
+FIXABLE_BUG_TYPES = {"LINTING", "SYNTAX", "INDENTATION", "IMPORT", "TYPE_ERROR"}
 
 
 @dataclass
@@ -22,38 +29,66 @@ class FixResult:
 
 
 class FixAgent:
-    def apply_fix(self, repo_path: Path, failure: ParsedFailure) -> FixResult:
-        target_file = repo_path / failure.file if failure.file else None
-        commit_message = f"Fix {failure.bug_type} in {failure.file}:{failure.line_number}"
-
-        if not target_file or not target_file.exists():
-            return FixResult(
+    def can_fix(self, failure: ParsedFailure) -> bool:
+        return bool(failure.file) and failure.bug_type in FIXABLE_BUG_TYPES
+
+    def apply_fixes(
+        self,
+        repo_path: Path,
+        failures: list[ParsedFailure],
+        batch: EditBatch,
+        tracer: SpanRecorder | None = None,
+    ) -> list[FixResult]:
+        """Plan and apply fixes for one iteration; results follow the order
+        of ``failures``.
+
+        Fixes are applied bottom-up per file, so most edits never shift a
+        line a later fix targets; the session's line map covers the rest
+        (e.g. imports inserted at the top). A fix whose line was already
+        edited or removed by another fix in the batch is a conflict and
+        fails without touching the file.
+        """
+        order = sorted(
+            range(len(failures)),
+            key=lambda index: (failures[index].file, -failures[index].line_number),
+        )
+        results: list[FixResult | None] = [None] * len(failures)
+        for index in order:
+            failure = failures[index]
+            with trace_span(
+                tracer,
+                "apply_fix",
+                "fix",
                 file=failure.file,
+                line=failure.line_number,
                 bug_type=failure.bug_type,
-                line_number=failure.line_number,
-                commit_message=commit_message,
-                status="Failed",
-            )
+            ) as span:
+                result = results[index] = self.apply_fix(repo_path, failure, batch)
+                span["status"] = result.status
+        return [result for result in results if result is not None]
+
+    def apply_fix(
+        self,
+        repo_path: Path,
+        failure: ParsedFailure,
+        batch: EditBatch | None = None,
+    ) -> FixResult:
+        """Fix ``failure`` in place. With a ``batch`` the edit is only
+        buffered and written when the caller commits the batch; the
+        failure's line number refers to the file before the batch."""
+        target_file = repo_path / failure.file if failure.file else None
+        commit_message = f"Fix {failure.bug_type} in {failure.file}:{failure.line_number}"
 
         success = False
-
-        if failure.bug_type == "LINTING":
-            success = remove_line(target_file, failure.line_number)
-
-        elif failure.bug_type == "SYNTAX":
-            success = update_line(target_file, failure.line_number, self._ensure_colon)
-
-        elif failure.bug_type == "INDENTATION":
-            success = normalize_indentation(target_file)
-
-        elif failure.bug_type == "IMPORT":
-            success = self._add_missing_import(target_file, failure.message)
-
-        elif failure.bug_type == "TYPE_ERROR":
-            success = self._safe_type_fix(target_file, failure)
-
-        elif failure.bug_type == "LOGIC":
-            success = False  # Logic fixes intentionally skipped (judge-safe)
+        if (
+            target_file is not None
+            and failure.bug_type in FIXABLE_BUG_TYPES
+            and target_file.exists()
+        ):
+            session = (batch or EditBatch()).session(target_file)
+            success = self._fix(session, failure)
+            if success and batch is None:
+                session.commit()
 
         return FixResult(
             file=failure.file,
@@ -63,6 +98,29 @@ class FixAgent:
             status="Fixed" if success else "Failed",
         )
 
+    def _fix(self, session: EditSession, failure: ParsedFailure) -> bool:
+        if failure.bug_type == "INDENTATION":
+            return session.normalize_indentation()
+
+        if failure.bug_type == "IMPORT":
+            return self._add_missing_import(session, failure.message)
+
+        line_number = session.resolve(failure.line_number)
+        if line_number is None or failure.line_number in session.touched:
+            # Another fix in this batch already edited or removed the line.
+            return False
+
+        if failure.bug_type == "LINTING":
+            return session.remove_line(line_number)
+
+        if failure.bug_type == "SYNTAX":
+            return session.update_line(line_number, self._ensure_colon)
+
+        if failure.bug_type == "TYPE_ERROR":
+            return self._safe_type_fix(session, line_number)
+
+        return False
+
     # ---------- Helpers ----------
 
     def _ensure_colon(self, line: str) -> str:
@@ -71,37 +129,39 @@ class FixAgent:
             return line
         return f"{stripped.rstrip()}:\n"
 
-    def _add_missing_import(self, file_path: Path, message: str) -> bool:
+    def _add_missing_import(self, session: EditSession, message: str) -> bool:
         module_match = re.search(r"No module named ['\"]([a-zA-Z0-9_\.]+)['\"]", message)
         if not module_match:
             return False
         module = module_match.group(1).split(".")[0]
-        return insert_line(file_path, 1, f"import {module}")
+        return session.insert_line(1, f"import {module}")
 
     # 🔥 FINAL, CORRECT TYPE ERROR FIX
-    def _safe_type_fix(self, file_path: Path, failure: ParsedFailure) -> bool:
+    def _safe_type_fix(self, session: EditSession, line_number: int) -> bool:
         """
         Pytest often reports TYPE_ERROR on the function definition line,
         not the actual arithmetic line. We therefore locate the nearest
         return statement and fix that instead.
         """
 
-        lines = file_path.read_text(encoding="utf-8").splitlines(keepends=True)
+        lines = session.lines
 
         # Start scanning from the reported line downward
-        start_idx = max(0, failure.line_number - 1)
+        start_idx = max(0, line_number - 1)
 
         for idx in range(start_idx, len(lines)):
             line = lines[idx]
 
             if "return" in line and "+" in line:
+                if session.origin(idx + 1) in session.touched:
+                    return False  # already rewritten by another fix
+
                 raw = line.rstrip("\n")
                 left, right = raw.split("+", 1)
 
                 # Deterministic fix: normalize RHS to int
-                lines[idx] = f"{left.strip()} + int({right.strip()})\n"
-
-                file_path.write_text("".join(lines), encoding="utf-8")
-                return True
+                return session.update_line(
+                    idx + 1, lambda _line: f"{left.strip()} + int({right.strip()})\n"
+                )
 
         return False
@@ -2,15 +2,47 @@ from __future__ import annotations
 
 import os
 import subprocess
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from pathlib import Path
+from typing import Callable
+
+try:
+    from ..tracing import SpanRecorder, trace_span
+    from ..utils.logger import get_logger
+except ImportError:
+    from tracing import SpanRecorder, trace_span  # type: ignore
+    from utils.logger import get_logger  # type: ignore
+
+# Subprocesses ``commit_fix`` spawns per file; the baseline for reporting
+# what one ``commit_files`` call for many files saves.
+FORKS_PER_FILE_COMMIT = 3
 
 
 class GitAgent:
-    def __init__(self, repo_path: Path) -> None:
+    def __init__(self, repo_path: Path, tracer: SpanRecorder | None = None) -> None:
         self.repo_path = repo_path
+        self.tracer = tracer
         self.env = os.environ.copy()
         self.env["GIT_TERMINAL_PROMPT"] = "0"
         self.env["GIT_SSH_COMMAND"] = "ssh -o BatchMode=yes"
+        # git subprocesses spawned so far.
+        self.forks = 0
+
+    def _git(
+        self, args: list[str], check: bool = True, timeout: int = 30, capture: bool = False
+    ) -> subprocess.CompletedProcess:
+        self.forks += 1
+        with trace_span(self.tracer, f"git {args[0]}", "git"):
+            return subprocess.run(
+                ["git", *args],
+                cwd=self.repo_path,
+                check=check,
+                timeout=timeout,
+                env=self.env,
+                capture_output=capture,
+                text=capture,
+            )
 
     def _with_ai_prefix(self, message: str) -> str:
         if message.startswith("[AI-AGENT]"):
@@ -18,46 +50,91 @@ class GitAgent:
         return f"[AI-AGENT] {message}"
 
     def create_branch(self, branch_name: str) -> None:
-        subprocess.run(
-            ["git", "checkout", "-b", branch_name],
-            cwd=self.repo_path,
-            check=True,
-            timeout=30,
-            env=self.env,
-        )
+        self._git(["checkout", "-b", branch_name])
 
     def commit_fix(self, file_path: str, commit_message: str) -> bool:
-        subprocess.run(
-            ["git", "add", file_path],
-            cwd=self.repo_path,
-            check=True,
-            timeout=30,
-            env=self.env,
-        )
+        return self.commit_files([file_path], commit_message)
 
-        check = subprocess.run(
-            ["git", "diff", "--cached", "--quiet"],
-            cwd=self.repo_path,
-            timeout=30,
-            env=self.env,
-        )
+    def commit_files(self, file_paths: list[str], commit_message: str) -> bool:
+        """Commit ``file_paths`` as one commit with ``git commit``, so commit
+        hooks run. Three subprocesses however many files there are; returns
+        False when the files match HEAD already."""
+        if not file_paths:
+            return False
+        self._git(["add", "-A", "--", *file_paths])
+
+        check = self._git(["diff", "--cached", "--quiet"], check=False)
         if check.returncode == 0:
             return False
 
-        subprocess.run(
-            ["git", "commit", "-m", self._with_ai_prefix(commit_message)],
-            cwd=self.repo_path,
-            check=True,
-            timeout=30,
-            env=self.env,
-        )
+        self._git(["commit", "-m", self._with_ai_prefix(commit_message)])
         return True
 
-    def push_branch(self, branch_name: str) -> None:
-        subprocess.run(
-            ["git", "push", "-u", "origin", branch_name],
-            cwd=self.repo_path,
-            check=True,
-            timeout=120,
-            env=self.env,
+    def push_branch(self, branch_name: str, remote: str = "origin") -> None:
+        """Push ``branch_name`` to ``remote``, a remote name or a URL/path."""
+        self._git(["push", "-u", remote, branch_name], timeout=120)
+
+    @staticmethod
+    def init_bare_remote(path: Path) -> str:
+        """Create a bare repository at ``path`` (if missing) to push to
+        without network access; returns it as a remote URL."""
+        if not (path / "HEAD").exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            subprocess.run(
+                ["git", "init", "--bare", "--quiet", str(path)], check=True, timeout=30
+            )
+        return str(path)
+
+
+class GitCommitWriter:
+    """Runs one run's commit jobs in order on a background thread, so the
+    next test run does not wait for git.
+
+    Commit jobs read the working tree when they run: callers ``drain``
+    before editing files again and before pushing. With ``background``
+    False jobs run inline in ``submit``.
+    """
+
+    def __init__(self, background: bool = True) -> None:
+        self.background = background
+        self._executor = (
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="rift-git") if background else None
         )
+        self._pending: list[Future] = []
+        self._lock = threading.Lock()
+        self.logger = get_logger("GitCommitWriter")
+
+    def submit(self, job: Callable[[], None]) -> None:
+        if self._executor is None:
+            job()
+            return
+        with self._lock:
+            self._pending.append(self._executor.submit(job))
+
+    def drain(self) -> None:
+        """Wait for every submitted job; re-raises the first job error."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        wait(pending)
+        for future in pending:
+            future.result()
+
+    def close(self) -> None:
+        try:
+            self.drain()
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "GitCommitWriter":
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, *_exc: object) -> None:
+        if exc_type is None:
+            self.close()
+            return
+        # Don't let a commit error replace the one already propagating.
+        try:
+            self.close()
+        except Exception as exc:
+            self.logger.exception("Commit job failed while unwinding: %s", exc)
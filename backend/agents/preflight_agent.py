@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import ast
+import multiprocessing
+import os
+import sys
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable
+
+try:
+    from .error_parser_agent import ParsedFailure
+    from ..config import PREFLIGHT_PARALLEL_MIN_FILES, SANDBOX_PYTHON_VERSION
+    from ..utils.bug_mapper import map_error_to_bug_type
+except ImportError:
+    from agents.error_parser_agent import ParsedFailure  # type: ignore
+    from config import PREFLIGHT_PARALLEL_MIN_FILES, SANDBOX_PYTHON_VERSION  # type: ignore
+    from utils.bug_mapper import map_error_to_bug_type  # type: ignore
+
+
+# Workers must not be forked from the multithreaded server process: a child
+# forked while another thread holds a lock can deadlock on it.
+_POOL_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+# Directories that hold third-party or generated code, never the repo's own.
+SKIPPED_DIRS = {
+    ".git",
+    ".hg",
+    ".tox",
+    ".nox",
+    ".venv",
+    "venv",
+    "env",
+    "site-packages",
+    "node_modules",
+    "__pycache__",
+    "build",
+    "dist",
+}
+
+# Only these are reported: other compile errors surface in the test run
+# with more context than the compiler gives.
+PREFLIGHT_BUG_TYPES = {"SYNTAX", "INDENTATION"}
+
+
+def compile_source(
+    source: str | bytes, filename: str, target: tuple[int, int] | None = None
+) -> tuple[str, int, str] | None:
+    """(exception type, line, message) if ``source`` doesn't compile on the
+    sandbox's Python (``target``, SANDBOX_PYTHON_VERSION by default).
+
+    The host parses with ``feature_version=target``, so syntax newer than
+    the sandbox's (e.g. PEP 695 generics on 3.11) is reported; the check is
+    best-effort, as ``feature_version`` doesn't reject all newer syntax and
+    compile-stage errors follow the host's rules. A host older
+    than the target can't parse the target's newer syntax (e.g. ``except*``
+    on 3.10); there only indentation errors, which don't depend on the
+    version, are reported and the rest is left to the sandbox's test run.
+    """
+    target = target or SANDBOX_PYTHON_VERSION
+    host_too_old = sys.version_info[:2] < target
+    try:
+        with warnings.catch_warnings():
+            # SyntaxWarnings (e.g. "is" with a literal) aren't failures.
+            warnings.simplefilter("ignore")
+            tree = ast.parse(
+                source, filename, feature_version=None if host_too_old else target
+            )
+            compile(tree, filename, "exec", dont_inherit=True)
+    except SyntaxError as exc:  # includes IndentationError and TabError
+        if host_too_old and not isinstance(exc, IndentationError):
+            return None
+        return type(exc).__name__, exc.lineno or 0, exc.msg or str(exc)
+    except ValueError:
+        # Null bytes are left to the test run.
+        return None
+    return None
+
+
+def _compile_file(path: str) -> tuple[str, int, str] | None:
+    """Worker: (exception type, line, message) if ``path`` doesn't compile."""
+    try:
+        with open(path, "rb") as handle:
+            source = handle.read()
+    except OSError:
+        # Unreadable files are left to the test run.
+        return None
+    return compile_source(source, path)
+
+
+class PreflightAgent:
+    """Compiles the repo's Python files locally, so syntax and indentation
+    errors are fixed before the sandbox is started."""
+
+    def __init__(self, parallel_min_files: int = PREFLIGHT_PARALLEL_MIN_FILES) -> None:
+        self.parallel_min_files = parallel_min_files
+
+    def check(self, repo_path: Path, files: Iterable[str] | None = None) -> list[ParsedFailure]:
+        """Compile ``files`` (repo-relative; all Python files by default)."""
+        relative = sorted(files) if files is not None else self.python_files(repo_path)
+        paths = [os.fspath(repo_path / name) for name in relative]
+
+        workers = min(os.cpu_count() or 1, len(paths))
+        if workers > 1 and len(paths) >= self.parallel_min_files:
+            chunksize = max(1, len(paths) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers, mp_context=_POOL_CONTEXT) as pool:
+                outcomes = list(pool.map(_compile_file, paths, chunksize=chunksize))
+        else:
+            outcomes = [_compile_file(path) for path in paths]
+
+        failures: list[ParsedFailure] = []
+        for name, outcome in zip(relative, outcomes):
+            if outcome is None:
+                continue
+            exception_type, line_number, message = outcome
+            message = f"{exception_type}: {message}"
+            mapped = map_error_to_bug_type(message)
+            if mapped.bug_type not in PREFLIGHT_BUG_TYPES:
+                continue
+            failures.append(
+                ParsedFailure(
+                    file=name,
+                    line_number=line_number,
+                    message=message,
+                    bug_type=mapped.bug_type,
+                )
+            )
+        return failures
+
+    def python_files(self, repo_path: Path) -> list[str]:
+        files: list[str] = []
+        for root, dirs, names in os.walk(repo_path):
+            dirs[:] = [d for d in dirs if d not in SKIPPED_DIRS and not d.endswith(".egg-info")]
+            for name in names:
+                if name.endswith(".py"):
+                    files.append(Path(root, name).relative_to(repo_path).as_posix())
+        return sorted(files)
@@ -1,13 +1,37 @@
-# backend>agents>repo_analyzer_agent.py
 from __future__ import annotations
 
+import hashlib
 import os
+import re
 import shutil
 import subprocess
+import threading
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Iterator
+from urllib.parse import urlsplit, urlunsplit
 import time
 
+try:
+    import fcntl
+except ImportError:  # Windows: in-process locking only
+    fcntl = None  # type: ignore[assignment]
+
+try:
+    from ..config import REPO_MIRROR_CACHE_ENABLED, REPO_MIRRORS_DIR
+    from ..tracing import SpanRecorder, trace_span
+    from ..utils.logger import get_logger
+except ImportError:
+    from config import REPO_MIRROR_CACHE_ENABLED, REPO_MIRRORS_DIR  # type: ignore
+    from tracing import SpanRecorder, trace_span  # type: ignore
+    from utils.logger import get_logger  # type: ignore
+
+
+GIT_CLONE_TIMEOUT_SECONDS = 120
+
+_MIRROR_LOCKS: dict[str, threading.Lock] = {}
+_MIRROR_LOCKS_GUARD = threading.Lock()
 
 
 @dataclass
@@ -16,22 +40,39 @@ class RepoAnalysis:
     discovered_tests: list[str]
 
 
+def normalize_repo_url(repo_url: str) -> str:
+    """Canonical form used as the mirror cache key: credentials, trailing
+    slashes and a ``.git`` suffix are dropped and the host is lowercased."""
+    url = repo_url.strip().rstrip("/")
+    if url.endswith(".git"):
+        url = url[: -len(".git")]
+
+    parts = urlsplit(url)
+    if parts.scheme and parts.netloc:
+        host = parts.hostname or ""
+        if parts.port:
+            host = f"{host}:{parts.port}"
+        return urlunsplit((parts.scheme.lower(), host.lower(), parts.path, "", ""))
+    return url
+
+
 class RepoAnalyzerAgent:
-    def __init__(self, workspaces_dir: Path) -> None:
+    def __init__(
+        self,
+        workspaces_dir: Path,
+        mirrors_dir: Path | None = REPO_MIRRORS_DIR,
+    ) -> None:
         self.workspaces_dir = workspaces_dir
+        self.mirrors_dir = mirrors_dir if REPO_MIRROR_CACHE_ENABLED else None
+        self.logger = get_logger("RepoAnalyzerAgent")
 
-    def clone_and_analyze(self, repo_url: str, target_dir_name: str) -> RepoAnalysis:
+    def clone_and_analyze(
+        self, repo_url: str, target_dir_name: str, tracer: SpanRecorder | None = None
+    ) -> RepoAnalysis:
         self.workspaces_dir.mkdir(parents=True, exist_ok=True)
         repo_path = self.workspaces_dir / target_dir_name
 
-        if repo_path.exists():
-            try:
-                shutil.rmtree(repo_path)
-            except PermissionError:
-                #windows file lock fallback
-                time.sleep(1)
-                shutil.rmtree(repo_path, ignore_errors=True)
-            
+        self._remove_dir(repo_path)
 
         env = os.environ.copy()
         env["GIT_TERMINAL_PROMPT"] = "0"
@@ -39,11 +80,41 @@ class RepoAnalyzerAgent:
         env["GIT_CONFIG_GLOBAL"] = "/dev/null"
         env["GIT_CONFIG_NOSYSTEM"] = "1"
 
+        cloned = False
+        if self.mirrors_dir is not None:
+            try:
+                with trace_span(tracer, "clone_via_mirror", "clone"):
+                    self._clone_via_mirror(repo_url, repo_path, env, tracer)
+                cloned = True
+            except (RuntimeError, OSError) as exc:
+                self.logger.warning(
+                    "Mirror cache unavailable for %s, cloning directly: %s", repo_url, exc
+                )
+                self._remove_dir(repo_path)
+
+        if not cloned:
+            with trace_span(tracer, "clone_direct", "clone"):
+                self._clone_direct(repo_url, repo_path, env)
+
+        with trace_span(tracer, "discover_tests", "analyze") as span:
+            discovered_tests = self._discover_tests(repo_path)
+            span["tests"] = len(discovered_tests)
+        return RepoAnalysis(repo_path=repo_path, discovered_tests=discovered_tests)
+
+    def mirror_path(self, repo_url: str) -> Path:
+        if self.mirrors_dir is None:
+            raise RuntimeError("Repository mirror cache is disabled.")
+        normalized = normalize_repo_url(repo_url)
+        digest = hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", normalized.rsplit("/", 1)[-1]).strip("_")
+        return self.mirrors_dir / f"{slug or 'repo'}_{digest}.git"
+
+    def _clone_direct(self, repo_url: str, repo_path: Path, env: dict[str, str]) -> None:
         try:
             subprocess.run(
                 ["git", "clone", repo_url, str(repo_path)],
                 check=True,
-                timeout=120,
+                timeout=GIT_CLONE_TIMEOUT_SECONDS,
                 env=env,
                 capture_output=True,
                 text=True,
@@ -60,8 +131,84 @@ class RepoAnalyzerAgent:
                 "If this is a private/SSH repo, use an HTTPS repo URL with access permissions."
             ) from exc
 
-        discovered_tests = self._discover_tests(repo_path)
-        return RepoAnalysis(repo_path=repo_path, discovered_tests=discovered_tests)
+    def _clone_via_mirror(
+        self,
+        repo_url: str,
+        repo_path: Path,
+        env: dict[str, str],
+        tracer: SpanRecorder | None = None,
+    ) -> None:
+        mirror = self.mirror_path(repo_url)
+        mirror.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._mirror_lock(mirror):
+            if (mirror / "HEAD").exists():
+                # Only objects that are new since the last run are transferred.
+                with trace_span(tracer, "mirror_fetch", "clone"):
+                    self._git(
+                        [
+                            "git", "-C", str(mirror), "fetch", "--prune", "--force", repo_url,
+                            "+refs/heads/*:refs/heads/*", "+refs/tags/*:refs/tags/*",
+                        ],
+                        env,
+                        GIT_CLONE_TIMEOUT_SECONDS,
+                    )
+            else:
+                staging = mirror.with_name(f"{mirror.name}.tmp")
+                self._remove_dir(staging)
+                with trace_span(tracer, "mirror_create", "clone"):
+                    self._git(
+                        ["git", "clone", "--bare", repo_url, str(staging)],
+                        env,
+                        GIT_CLONE_TIMEOUT_SECONDS,
+                    )
+                os.replace(staging, mirror)
+
+            # A local clone hardlinks the mirror's object files, so the
+            # workspace is independent of later mirror repacks.
+            with trace_span(tracer, "workspace_clone", "clone"):
+                self._git(["git", "clone", "--local", str(mirror), str(repo_path)], env, 60)
+
+        self._git(
+            ["git", "-C", str(repo_path), "remote", "set-url", "origin", repo_url], env, 30
+        )
+
+    def _git(self, cmd: list[str], env: dict[str, str], timeout: int) -> None:
+        try:
+            subprocess.run(cmd, check=True, timeout=timeout, env=env, capture_output=True, text=True)
+        except subprocess.TimeoutExpired as exc:
+            raise RuntimeError(f"{' '.join(cmd[:4])} timed out after {timeout} seconds") from exc
+        except subprocess.CalledProcessError as exc:
+            error_message = (exc.stderr or exc.stdout or "git command failed").strip()
+            raise RuntimeError(error_message) from exc
+
+    @contextmanager
+    def _mirror_lock(self, mirror: Path) -> Iterator[None]:
+        # Threads in this process share a lock per mirror; other processes
+        # (e.g. extra uvicorn workers) are kept out with an flock.
+        with _MIRROR_LOCKS_GUARD:
+            lock = _MIRROR_LOCKS.setdefault(str(mirror), threading.Lock())
+
+        with lock:
+            if fcntl is None:
+                yield
+                return
+            with open(mirror.with_name(f"{mirror.name}.lock"), "w") as handle:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _remove_dir(self, path: Path) -> None:
+        if not path.exists():
+            return
+        try:
+            shutil.rmtree(path)
+        except PermissionError:
+            #windows file lock fallback
+            time.sleep(1)
+            shutil.rmtree(path, ignore_errors=True)
 
     def _discover_tests(self, repo_path: Path) -> list[str]:
         tests: list[str] = []
@@ -70,4 +217,3 @@ class RepoAnalyzerAgent:
             if name.startswith("test") or name.endswith("_test.py"):
                 tests.append(str(path.relative_to(repo_path)))
         return sorted(set(tests))
-
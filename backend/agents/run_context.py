@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Iterator
+
+try:
+    from .ci_monitor_agent import CIMonitorAgent
+    from .git_agent import GitCommitWriter
+    from ..events import RunEventStream
+    from ..tracing import SpanRecorder
+except ImportError:
+    from agents.ci_monitor_agent import CIMonitorAgent  # type: ignore
+    from agents.git_agent import GitCommitWriter  # type: ignore
+    from events import RunEventStream  # type: ignore
+    from tracing import SpanRecorder  # type: ignore
+
+
+@dataclass
+class RunContext:
+    """Mutable state owned by exactly one coordinator run."""
+
+    repo_url: str
+    team_name: str
+    leader_name: str
+    branch_name: str
+    workspace_name: str
+    max_retry: int
+    run_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    started_at: float = field(default_factory=time.monotonic)
+    start_time: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    ci_monitor: CIMonitorAgent = field(default_factory=CIMonitorAgent)
+    fixes: list[dict[str, Any]] = field(default_factory=list)
+    total_failures: int = 0
+    commit_count: int = 0
+    git_forks: int = 0
+    git_forks_saved: int = 0
+    final_status: str = "FAILED"
+    stop_reason: str = "unknown"
+    error_message: str = ""
+    events: RunEventStream | None = None
+    tracer: SpanRecorder = field(default_factory=SpanRecorder)
+    git_writer: GitCommitWriter | None = None
+    # "skipped" when there is nothing to push, else "pending" until the
+    # background push ends as "pushed" or "failed".
+    push_status: str = "skipped"
+
+    @property
+    def timeline(self) -> list[dict]:
+        return self.ci_monitor.timeline
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    def emit(self, event_type: str, **data: Any) -> None:
+        if self.events is not None:
+            self.events.publish(event_type, run_id=self.run_id, **data)
+
+    @contextmanager
+    def stage(self, name: str, **data: Any) -> Iterator[None]:
+        self.emit("stage_started", stage=name, **data)
+        started = time.monotonic()
+        status = "error"
+        try:
+            with self.tracer.span(name, "stage", **data):
+                yield
+            status = "ok"
+        finally:
+            self.emit(
+                "stage_finished",
+                stage=name,
+                status=status,
+                duration_seconds=round(time.monotonic() - started, 3),
+                **data,
+            )
@@ -1,18 +1,101 @@
-# backend>agents>test_runner_agent.py
 from __future__ import annotations
 
 import os
+import re
 import shlex
 import shutil
+import json
 import subprocess
 import sys
-from dataclasses import dataclass
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Iterable, Iterator
 
 try:
-    from ..config import PYTEST_TIMEOUT_SECONDS, SANDBOX_DOCKER_IMAGE, SANDBOX_WORKDIR
+    from ..config import (
+        PYTEST_TIMEOUT_SECONDS,
+        SANDBOX_DOCKER_IMAGE,
+        SANDBOX_IMAGE_CACHE_ENABLED,
+        SANDBOX_LOG_RETENTION,
+        SANDBOX_LOGS_DIR,
+        SANDBOX_PLUGIN_DIR,
+        SANDBOX_PLUGIN_MOUNT,
+        SANDBOX_REPORT_MOUNT,
+        SANDBOX_REPORTS_DIR,
+        SANDBOX_SETUP_TIMEOUT_SECONDS,
+        SANDBOX_WORKDIR,
+    )
+    from ..tracing import SpanRecorder, trace_span
+    from ..utils.output_buffer import OutputBuffer, append_output, iter_output_lines
+    from ..utils.sandbox_images import SandboxImageCache
 except ImportError:
-    from config import PYTEST_TIMEOUT_SECONDS, SANDBOX_DOCKER_IMAGE, SANDBOX_WORKDIR  # type: ignore
+    from config import (  # type: ignore
+        PYTEST_TIMEOUT_SECONDS,
+        SANDBOX_DOCKER_IMAGE,
+        SANDBOX_IMAGE_CACHE_ENABLED,
+        SANDBOX_LOG_RETENTION,
+        SANDBOX_LOGS_DIR,
+        SANDBOX_PLUGIN_DIR,
+        SANDBOX_PLUGIN_MOUNT,
+        SANDBOX_REPORT_MOUNT,
+        SANDBOX_REPORTS_DIR,
+        SANDBOX_SETUP_TIMEOUT_SECONDS,
+        SANDBOX_WORKDIR,
+    )
+    from tracing import SpanRecorder, trace_span  # type: ignore
+    from utils.output_buffer import OutputBuffer, append_output, iter_output_lines  # type: ignore
+    from utils.sandbox_images import SandboxImageCache  # type: ignore
+
+
+REQUIREMENTS_FILES = [
+    "requirements.txt",
+    "requirements-dev.txt",
+    "dev-requirements.txt",
+]
+
+# Use a named volume so pip cache is reused across retries — avoids
+# re-downloading packages on every Docker container start.
+PIP_CACHE_VOLUME = "rift2026_pip_cache"
+SANDBOX_LABEL = "rift2026.sandbox=1"
+
+DOCKER_MISSING_MESSAGE = (
+    "Sandbox enforcement active: Docker is required but not available on PATH."
+)
+
+# pytest's short test summary: "FAILED tests/test_x.py::test_y - AssertionError"
+# or "ERROR tests/test_x.py" for collection errors.
+FAILED_NODE_RE = re.compile(r"^(?:FAILED|ERROR) (?P<node>.+?)(?: - .*)?$")
+
+REPORT_PLUGIN = "rift_report_plugin"
+REPORT_FILE = "report.jsonl"
+
+# Present in a log directory while its session is open; touched before each
+# command. A marker older than the longest command a session runs was left
+# by a process that died, and no longer protects its directory.
+LIVE_MARKER = ".live"
+LIVE_MARKER_STALE_SECONDS = 2 * (SANDBOX_SETUP_TIMEOUT_SECONDS + PYTEST_TIMEOUT_SECONDS)
+
+
+@dataclass
+class TestCaseResult:
+    """One line of the sandbox reporter's output (see sandbox/rift_report_plugin.py)."""
+
+    nodeid: str
+    outcome: str
+    when: str
+    duration: float
+    file: str
+    line: int
+    exception_type: str
+    message: str
+
+    @property
+    def failed(self) -> bool:
+        return self.outcome in ("failed", "error")
 
 
 @dataclass
@@ -20,41 +103,388 @@ class TestRunResult:
     passed: bool
     output: str
     return_code: int
+    failed_tests: list[str] = field(default_factory=list)
+    results: list[TestCaseResult] = field(default_factory=list)
+    # Full output on disk; ``output`` only holds its tail.
+    log_path: Path | None = None
+    # The command hit its time limit (a kill for any other reason, e.g. the
+    # OOM killer, also exits with 137).
+    timed_out: bool = False
 
+    def lines(self) -> Iterator[str]:
+        return iter_output_lines(self.output, self.log_path)
 
-class TestRunnerAgent:
-    def run(self, repo_path: Path, tests: list[str]) -> TestRunResult:
-        if shutil.which("docker") is None:
-            return TestRunResult(
-                passed=False,
-                output="Sandbox enforcement active: Docker is required but not available on PATH.",
-                return_code=127,
+    def append_output(self, text: str) -> None:
+        self.output = f"{self.output}\n{text}".strip()
+        append_output(self.log_path, text)
+
+
+def _failed_node_ids(lines: Iterable[str]) -> list[str]:
+    node_ids: dict[str, None] = {}
+    for line in lines:
+        match = FAILED_NODE_RE.match(line)
+        if match and match.group("node").strip():
+            node_ids[match.group("node").strip()] = None
+    return list(node_ids)
+
+
+def _install_steps(repo_path: Path) -> list[str]:
+    install_steps = [
+        "python -m pip install -q --upgrade pip pytest",
+    ]
+
+    for requirements_file in REQUIREMENTS_FILES:
+        if (repo_path / requirements_file).exists():
+            install_steps.append(
+                f"python -m pip install -q -r {shlex.quote(requirements_file)}"
             )
+    return install_steps
+
+
+def _pytest_command(tests: list[str]) -> list[str]:
+    pytest_cmd = ["python", "-m", "pytest", "-q"]
+    if tests:
+        pytest_cmd.extend(tests)
+    return pytest_cmd
+
+
+def _pytest_script(tests: list[str]) -> str:
+    # The reporter plugin is importable from its read-only mount; the repo's
+    # own PYTHONPATH, if any, is kept after it.
+    pytest_cmd = _pytest_command(tests)
+    pytest_cmd[4:4] = [
+        "-p",
+        REPORT_PLUGIN,
+        "--rift-report",
+        f"{SANDBOX_REPORT_MOUNT}/{REPORT_FILE}",
+    ]
+    return (
+        f"PYTHONPATH={SANDBOX_PLUGIN_MOUNT}${{PYTHONPATH:+:$PYTHONPATH}} "
+        f"{shlex.join(pytest_cmd)}"
+    )
 
-        install_steps = [
-            "python -m pip install -q --upgrade pip pytest",
-        ]
 
-        for requirements_file in [
-            "requirements.txt",
-            "requirements-dev.txt",
-            "dev-requirements.txt",
-        ]:
-            if (repo_path / requirements_file).exists():
-                install_steps.append(
-                    f"python -m pip install -q -r {shlex.quote(requirements_file)}"
+def _report_mounts(report_dir: Path) -> list[str]:
+    return [
+        "-v",
+        f"{os.fspath(SANDBOX_PLUGIN_DIR)}:{SANDBOX_PLUGIN_MOUNT}:ro",
+        "-v",
+        f"{os.fspath(report_dir)}:{SANDBOX_REPORT_MOUNT}",
+    ]
+
+
+def _read_report(report_path: Path) -> list[TestCaseResult]:
+    results: list[TestCaseResult] = []
+    try:
+        lines = report_path.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return results
+    for line in lines:
+        try:
+            record = json.loads(line)
+            results.append(
+                TestCaseResult(
+                    nodeid=str(record["nodeid"]),
+                    outcome=str(record["outcome"]),
+                    when=str(record.get("when", "")),
+                    duration=float(record.get("duration") or 0.0),
+                    file=str(record.get("file") or ""),
+                    line=int(record.get("line") or 0),
+                    exception_type=str(record.get("exception_type") or ""),
+                    message=str(record.get("message") or ""),
                 )
+            )
+        except (ValueError, KeyError, TypeError):
+            # A run killed mid-write leaves a truncated last line.
+            continue
+    return results
+
+
+def _attach_report(result: TestRunResult, report_path: Path) -> TestRunResult:
+    result.results = _read_report(report_path)
+    if result.passed:
+        return result
+    reported = [case.nodeid for case in result.results if case.failed]
+    result.failed_tests = list(dict.fromkeys(reported)) or _failed_node_ids(result.lines())
+    return result
+
+
+def _run_sandbox_command(
+    cmd: list[str],
+    cwd: Path,
+    timeout: int,
+    label: str,
+    log_path: Path | None = None,
+    kill_deadline: int | None = None,
+) -> TestRunResult:
+    """``kill_deadline`` is the limit of an in-command ``timeout -s KILL``:
+    a SIGKILL exit after that long counts as timed out."""
+    # stderr is merged into stdout and streamed through a bounded buffer,
+    # so a noisy test suite can't grow the backend's memory.
+    buffer = OutputBuffer(log_path)
+    started = time.monotonic()
+    try:
+        proc = subprocess.Popen(
+            cmd,
+            cwd=cwd,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        )
+    except OSError as exc:
+        buffer.close()
+        return TestRunResult(passed=False, output=f"{label} failed to start: {exc}", return_code=127)
+
+    reader = buffer.start_reader(proc.stdout)
+    timed_out = False
+    try:
+        proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        timed_out = True
+        proc.kill()
+        proc.wait()
+    reader.join()
+    proc.stdout.close()
+    if timed_out:
+        buffer.write(f"\n{label} timed out after {timeout} seconds.\n")
+    buffer.close()
+
+    return_code = 124 if timed_out else proc.returncode
+    if return_code == 137 and kill_deadline is not None:
+        timed_out = time.monotonic() - started >= kill_deadline
+    return TestRunResult(
+        passed=return_code == 0,
+        output=buffer.text().strip(),
+        return_code=return_code,
+        log_path=log_path,
+        timed_out=timed_out,
+    )
+
+
+def _mark_live(log_dir: Path) -> None:
+    log_dir.mkdir(parents=True, exist_ok=True)
+    (log_dir / LIVE_MARKER).touch()
+
+
+def _is_live(log_dir: Path) -> bool:
+    try:
+        age = time.time() - (log_dir / LIVE_MARKER).stat().st_mtime
+    except OSError:
+        return False
+    return age < LIVE_MARKER_STALE_SECONDS
+
 
-        pytest_cmd = ["python", "-m", "pytest", "-q"]
-        if tests:
-            pytest_cmd.extend(tests)
+def _prune_log_dirs(logs_dir: Path, keep: int) -> None:
+    """Remove all but the ``keep`` most recently modified log directories
+    of closed sessions; directories of open sessions are left alone."""
+    try:
+        log_dirs = [path for path in logs_dir.iterdir() if path.is_dir() and not _is_live(path)]
+    except OSError:
+        return
+    log_dirs.sort(key=lambda path: path.stat().st_mtime, reverse=True)
+    for path in log_dirs[max(0, keep):]:
+        shutil.rmtree(path, ignore_errors=True)
 
-        sandbox_script = " && ".join(install_steps + [shlex.join(pytest_cmd)])
 
-        # Use a named volume so pip cache is reused across retries — avoids
-        # re-downloading packages on every Docker container start.
-        pip_cache_volume = "rift2026_pip_cache"
+class SandboxSession:
+    """One long-lived sandbox container per run.
 
+    Dependencies are installed once when the session starts; every test pass
+    is then a ``docker exec`` into the same container. ``close`` always
+    removes the container. With an image cache, a run whose dependencies
+    match an earlier run starts from that run's image and skips installation.
+    """
+
+    def __init__(
+        self,
+        repo_path: Path,
+        name: str,
+        image: str = SANDBOX_DOCKER_IMAGE,
+        image_cache: SandboxImageCache | None = None,
+        tracer: SpanRecorder | None = None,
+    ) -> None:
+        self.repo_path = repo_path
+        self.name = name
+        self.image = image
+        self.image_cache = image_cache
+        self.tracer = tracer
+        self.started = False
+        self.cached_image: str | None = None
+        self.setup_result: TestRunResult | None = None
+        self.report_dir = SANDBOX_REPORTS_DIR / name
+        self.log_dir = SANDBOX_LOGS_DIR / name
+        self._log_count = 0
+
+    def start(self) -> TestRunResult:
+        if shutil.which("docker") is None:
+            self.setup_result = TestRunResult(
+                passed=False, output=DOCKER_MISSING_MESSAGE, return_code=127
+            )
+            return self.setup_result
+
+        install_steps = _install_steps(self.repo_path)
+        image = self.image
+        cache_tag = None
+        if self.image_cache is not None:
+            cache_tag = self.image_cache.tag_for(
+                self.repo_path, self.image, install_steps, REQUIREMENTS_FILES
+            )
+            if self.image_cache.lookup(cache_tag):
+                image = cache_tag
+                self.cached_image = cache_tag
+
+        self.report_dir.mkdir(parents=True, exist_ok=True)
+        with trace_span(
+            self.tracer, "container_start", "sandbox", cached_image=self.cached_image is not None
+        ):
+            create = _run_sandbox_command(
+                [
+                    "docker",
+                    "run",
+                    "-d",
+                    "--rm",
+                    "--name",
+                    self.name,
+                    "--label",
+                    SANDBOX_LABEL,
+                    "-v",
+                    f"{os.fspath(self.repo_path)}:{SANDBOX_WORKDIR}",
+                    "-v",
+                    f"{PIP_CACHE_VOLUME}:/root/.cache/pip",
+                    *_report_mounts(self.report_dir),
+                    "-w",
+                    SANDBOX_WORKDIR,
+                    image,
+                    "sleep",
+                    "infinity",
+                ],
+                self.repo_path,
+                SANDBOX_SETUP_TIMEOUT_SECONDS,
+                "Sandbox container start",
+            )
+        if not create.passed:
+            self.setup_result = create
+            return create
+        self.started = True
+
+        if self.cached_image is not None:
+            self.setup_result = TestRunResult(
+                passed=True,
+                output=f"Reusing cached sandbox image {self.cached_image}.",
+                return_code=0,
+            )
+            return self.setup_result
+
+        with trace_span(self.tracer, "install_dependencies", "sandbox"):
+            self.setup_result = self.exec(
+                " && ".join(install_steps),
+                SANDBOX_SETUP_TIMEOUT_SECONDS,
+                "Sandbox dependency installation",
+            )
+        if self.setup_result.passed and cache_tag is not None and self.image_cache is not None:
+            # Snapshot before any test has run so the image holds only the
+            # installed dependencies (the repo itself is a bind mount).
+            with trace_span(self.tracer, "image_snapshot", "sandbox"):
+                self.image_cache.save(self.name, cache_tag)
+        return self.setup_result
+
+    def exec(self, script: str, timeout: int, label: str) -> TestRunResult:
+        # The in-container ``timeout`` kills the process itself, so a hung
+        # test can't keep running into the next iteration; the host-side
+        # timeout is only a backstop for the docker client.
+        return _run_sandbox_command(
+            [
+                "docker",
+                "exec",
+                "-w",
+                SANDBOX_WORKDIR,
+                self.name,
+                "sh",
+                "-lc",
+                f"timeout -s KILL {int(timeout)} sh -c {shlex.quote(script)}",
+            ],
+            self.repo_path,
+            timeout + 15,
+            label,
+            log_path=self._next_log_path(label),
+            kill_deadline=int(timeout),
+        )
+
+    def _next_log_path(self, label: str) -> Path:
+        _mark_live(self.log_dir)
+        self._log_count += 1
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", label).strip("_").lower()
+        return self.log_dir / f"{self._log_count:03d}_{slug}.log"
+
+    def run_pytest(self, tests: list[str]) -> TestRunResult:
+        report_path = self.report_dir / REPORT_FILE
+        report_path.unlink(missing_ok=True)
+        with trace_span(self.tracer, "pytest", "sandbox", tests=len(tests)) as span:
+            result = self.exec(_pytest_script(tests), PYTEST_TIMEOUT_SECONDS, "Sandboxed pytest")
+            span["return_code"] = result.return_code
+        return _attach_report(result, report_path)
+
+    def close(self) -> None:
+        shutil.rmtree(self.report_dir, ignore_errors=True)
+        # Logs outlive the session so results can point at them; only the
+        # oldest closed runs' logs are removed.
+        (self.log_dir / LIVE_MARKER).unlink(missing_ok=True)
+        _prune_log_dirs(SANDBOX_LOGS_DIR, SANDBOX_LOG_RETENTION)
+        if not self.started:
+            return
+        self.started = False
+        with trace_span(self.tracer, "container_remove", "sandbox"):
+            subprocess.run(
+                ["docker", "rm", "-f", self.name],
+                cwd=self.repo_path,
+                capture_output=True,
+                timeout=60,
+            )
+
+
+class TestRunnerAgent:
+    def __init__(self, image_cache: SandboxImageCache | None = None) -> None:
+        if image_cache is None and SANDBOX_IMAGE_CACHE_ENABLED:
+            image_cache = SandboxImageCache()
+        self.image_cache = image_cache
+
+    @contextmanager
+    def session(
+        self, repo_path: Path, run_id: str, tracer: SpanRecorder | None = None
+    ) -> Iterator[SandboxSession]:
+        sandbox = SandboxSession(
+            repo_path,
+            name=f"rift_sandbox_{run_id[:12]}_{uuid.uuid4().hex[:6]}",
+            image_cache=self.image_cache,
+            tracer=tracer,
+        )
+        try:
+            yield sandbox
+        finally:
+            sandbox.close()
+
+    def run(
+        self,
+        repo_path: Path,
+        tests: list[str],
+        session: SandboxSession | None = None,
+    ) -> TestRunResult:
+        if session is not None:
+            return self._run_in_session(session, tests)
+
+        if shutil.which("docker") is None:
+            return TestRunResult(
+                passed=False,
+                output=DOCKER_MISSING_MESSAGE,
+                return_code=127,
+            )
+
+        sandbox_script = " && ".join(_install_steps(repo_path) + [_pytest_script(tests)])
+
+        SANDBOX_REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+        report_dir = Path(tempfile.mkdtemp(prefix="oneshot_", dir=SANDBOX_REPORTS_DIR))
         cmd = [
             "docker",
             "run",
@@ -62,7 +492,8 @@ class TestRunnerAgent:
             "-v",
             f"{os.fspath(repo_path)}:{SANDBOX_WORKDIR}",
             "-v",
-            f"{pip_cache_volume}:/root/.cache/pip",
+            f"{PIP_CACHE_VOLUME}:/root/.cache/pip",
+            *_report_mounts(report_dir),
             "-w",
             SANDBOX_WORKDIR,
             SANDBOX_DOCKER_IMAGE,
@@ -71,25 +502,72 @@ class TestRunnerAgent:
             sandbox_script,
         ]
 
+        # Spilled like a session's output, so failures before the in-memory
+        # tail are still parsed from ``result.lines()``.
+        log_dir = SANDBOX_LOGS_DIR / report_dir.name
+        _mark_live(log_dir)
         try:
-            proc = subprocess.run(
+            result = _run_sandbox_command(
                 cmd,
-                cwd=repo_path,
-                text=True,
-                capture_output=True,
-                timeout=PYTEST_TIMEOUT_SECONDS,
+                repo_path,
+                PYTEST_TIMEOUT_SECONDS,
+                "Sandboxed pytest",
+                log_path=log_dir / "001_sandboxed_pytest.log",
             )
-            output = f"{proc.stdout}\n{proc.stderr}".strip()
-            return TestRunResult(
-                passed=proc.returncode == 0,
-                output=output,
-                return_code=proc.returncode,
-            )
-        except subprocess.TimeoutExpired as exc:
-            timed_output = f"{exc.stdout or ''}\n{exc.stderr or ''}".strip()
-            message = (
+            return _attach_report(result, report_dir / REPORT_FILE)
+        finally:
+            shutil.rmtree(report_dir, ignore_errors=True)
+            (log_dir / LIVE_MARKER).unlink(missing_ok=True)
+            _prune_log_dirs(SANDBOX_LOGS_DIR, SANDBOX_LOG_RETENTION)
+
+    def affected_tests(
+        self, repo_path: Path, tests: list[str], edited_files: set[str]
+    ) -> list[str]:
+        """Test files that are edited themselves or import an edited module."""
+        selected = {name for name in edited_files if name in tests}
+        modules: set[str] = set()
+        for name in edited_files - selected:
+            path = Path(name)
+            if path.suffix != ".py":
+                continue
+            parts = path.with_suffix("").parts
+            if parts and parts[-1] == "__init__":
+                parts = parts[:-1]
+            if parts:
+                modules.add(parts[-1])
+                modules.add(".".join(parts))
+        if not modules:
+            return sorted(selected)
+
+        names = "|".join(re.escape(module) for module in sorted(modules))
+        import_re = re.compile(rf"^\s*(?:from|import)\s.*\b(?:{names})\b", re.MULTILINE)
+        for test in tests:
+            if test in selected:
+                continue
+            try:
+                source = (repo_path / test).read_text(encoding="utf-8", errors="ignore")
+            except OSError:
+                continue
+            if import_re.search(source):
+                selected.add(test)
+        return sorted(selected)
+
+    def _run_in_session(self, session: SandboxSession, tests: list[str]) -> TestRunResult:
+        if session.setup_result is None:
+            session.start()
+        setup = session.setup_result
+        if setup is not None and not setup.passed:
+            # Same outcome as the chained install && pytest command: the
+            # install failure is the run's output.
+            return setup
+
+        result = session.run_pytest(tests)
+        if result.return_code == 137 and result.timed_out:
+            result.append_output(
                 f"Sandboxed pytest timed out after {PYTEST_TIMEOUT_SECONDS} seconds."
             )
-            output = f"{timed_output}\n{message}".strip()
-            return TestRunResult(passed=False, output=output, return_code=124)
-
+        elif result.return_code == 137:
+            result.append_output(
+                "Sandboxed pytest was killed (exit code 137), most likely out of memory."
+            )
+        return result
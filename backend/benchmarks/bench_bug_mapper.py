@@ -0,0 +1,87 @@
+"""Micro-benchmark for bug_mapper's RuleMatcher against a linear scan.
+
+    python backend/benchmarks/bench_bug_mapper.py              # 10, 100, 1000 rules
+    python backend/benchmarks/bench_bug_mapper.py --rules 10,5000
+
+Rules are random lowercase words; messages look like pytest failure lines,
+a quarter of them containing one of the rules.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from utils.bug_mapper import ErrorRule, RuleMatcher  # noqa: E402
+
+BUG_TYPES = ["LINTING", "SYNTAX", "LOGIC", "TYPE_ERROR", "IMPORT", "INDENTATION"]
+MESSAGES = 20_000
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(6, 14)))
+
+
+def make_rules(rng: random.Random, count: int) -> list[ErrorRule]:
+    return [
+        ErrorRule(pattern=_word(rng), bug_type=rng.choice(BUG_TYPES), priority=rng.randint(0, 200))
+        for _ in range(count)
+    ]
+
+
+def make_messages(rng: random.Random, rules: list[ErrorRule]) -> list[str]:
+    messages = []
+    for index in range(MESSAGES):
+        filler = " ".join(_word(rng) for _ in range(6))
+        if index % 4 == 0:
+            filler = f"{filler} {rng.choice(rules).pattern.upper()}"
+        messages.append(f"tests/test_mod_{index % 40}.py:{index % 300}: {filler}")
+    return messages
+
+
+def linear_match(rules: list[ErrorRule], message: str) -> ErrorRule | None:
+    lowered = message.lower()
+    for rule in rules:
+        if rule.pattern in lowered:
+            return rule
+    return None
+
+
+def rate(matcher, messages: list[str]) -> float:
+    started = time.perf_counter()
+    for message in messages:
+        matcher(message)
+    return len(messages) / (time.perf_counter() - started)
+
+
+def main() -> None:
+    cli = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    cli.add_argument("--rules", default="10,100,1000", help="Comma-separated rule counts.")
+    args = cli.parse_args()
+
+    print(f"{'rules':>6} {'build ms':>9} {'matcher/s':>11} {'linear/s':>11}")
+    for count in (int(size) for size in args.rules.split(",") if size.strip()):
+        rng = random.Random(2026 + count)
+        rules = make_rules(rng, count)
+        messages = make_messages(rng, rules)
+
+        started = time.perf_counter()
+        matcher = RuleMatcher(rules)
+        build_ms = (time.perf_counter() - started) * 1000
+        # The linear scan needs the rules in priority order.
+        ordered = matcher.rules
+
+        matcher_rate = rate(matcher.match, messages)
+        linear_rate = rate(lambda message: linear_match(ordered, message), messages)
+        print(f"{count:>6} {build_ms:>9.1f} {matcher_rate:>11,.0f} {linear_rate:>11,.0f}")
+
+
+if __name__ == "__main__":
+    main()
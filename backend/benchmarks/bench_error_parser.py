@@ -0,0 +1,94 @@
+"""Throughput benchmark for ErrorParserAgent.parse on synthetic pytest logs.
+
+    python backend/benchmarks/bench_error_parser.py             # 10MB, 100MB, 1GB
+    python backend/benchmarks/bench_error_parser.py --sizes 10,100
+
+Logs are generated into a temporary directory and streamed back line by
+line, the same way the coordinator reads a spilled sandbox log.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agents.error_parser_agent import ErrorParserAgent  # noqa: E402
+
+REPO_PATH = Path("/workspace")
+MB = 1024 * 1024
+
+
+def _failure_block(rng: random.Random, index: int) -> str:
+    module = f"pkg/module_{index % 50}.py"
+    test = f"tests/test_module_{index % 50}.py"
+    line = rng.randint(1, 400)
+    return (
+        f"________________________ test_case_{index} ________________________\n"
+        f"\n"
+        f"    def test_case_{index}():\n"
+        f">       assert compute({index}) == {index + 1}\n"
+        f"E       assert {index} == {index + 1}\n"
+        f"\n"
+        f"{test}:{line}: AssertionError\n"
+        f"/usr/local/lib/python3.11/site-packages/_pytest/python.py:195: in pytest_pyfunc_call\n"
+        f"    result = testfunction(**testargs)\n"
+        f"{module}:{line + 7}: in compute\n"
+        f"E   TypeError: unsupported operand type(s) for +: 'int' and 'str'\n"
+        f"----------------------------- Captured stdout call -----------------------------\n"
+    )
+
+
+def _noise_line(rng: random.Random) -> str:
+    return "".join(rng.choice(".....sF") for _ in range(72)) + f" [{rng.randint(0, 100):3d}%]\n"
+
+
+def write_log(path: Path, size_bytes: int, seed: int = 2026) -> None:
+    rng = random.Random(seed)
+    written = 0
+    index = 0
+    with open(path, "w", encoding="utf-8") as handle:
+        while written < size_bytes:
+            # Mostly progress/captured output, with a failure every ~40 lines.
+            block = "".join(_noise_line(rng) for _ in range(40)) + _failure_block(rng, index)
+            handle.write(block)
+            written += len(block)
+            index += 1
+
+
+def bench(path: Path) -> tuple[float, int]:
+    parser = ErrorParserAgent()
+    started = time.perf_counter()
+    with open(path, encoding="utf-8") as handle:
+        failures = parser.parse((line.rstrip("\n") for line in handle), REPO_PATH)
+    return time.perf_counter() - started, len(failures)
+
+
+def main() -> None:
+    cli = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    cli.add_argument("--sizes", default="10,100,1024", help="Comma-separated log sizes in MB.")
+    args = cli.parse_args()
+
+    print(f"{'size':>8} {'seconds':>9} {'MB/s':>8} {'failures':>9} {'max RSS MB':>11}")
+    with tempfile.TemporaryDirectory(prefix="bench_error_parser_") as tmp:
+        for size_mb in (int(size) for size in args.sizes.split(",") if size.strip()):
+            log_path = Path(tmp) / f"pytest_{size_mb}mb.log"
+            write_log(log_path, size_mb * MB)
+            seconds, failures = bench(log_path)
+            max_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+            print(
+                f"{size_mb:>6}MB {seconds:>9.2f} {size_mb / seconds:>8.1f} "
+                f"{failures:>9} {max_rss_mb:>11.1f}"
+            )
+            log_path.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,103 @@
 # backend>config.py
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
 
 BASE_DIR = Path(__file__).resolve().parent
 ROOT_DIR = BASE_DIR.parent
 RESULTS_PATH = BASE_DIR / "results" / "results.json"
+RUNS_DB_PATH = BASE_DIR / "results" / "runs.sqlite3"
 WORKSPACES_DIR = BASE_DIR / "workspaces"
+REPO_MIRRORS_DIR = WORKSPACES_DIR / ".mirrors"
+REPO_MIRROR_CACHE_ENABLED = os.getenv("RIFT_REPO_MIRROR_CACHE", "1") != "0"
 DEVOPS_AUTOMATION_DIR = ROOT_DIR / "DevOps_Git_Automation"
 DEVOPS_DATA_DIR = DEVOPS_AUTOMATION_DIR / "data"
-DEVOPS_BRANCH_HISTORY_PATH = DEVOPS_DATA_DIR / "branch_history.json"
-DEVOPS_CI_TIMELINE_PATH = DEVOPS_DATA_DIR / "ci_pipeline_timeline.json"
+# Append-only JSON lines; the JSON array file it replaces is migrated on first use.
+DEVOPS_BRANCH_HISTORY_PATH = DEVOPS_DATA_DIR / "branch_history.jsonl"
+DEVOPS_LEGACY_BRANCH_HISTORY_PATH = DEVOPS_DATA_DIR / "branch_history.json"
+# Pipeline iterations of every run, shared with CIRunner; the JSON file it
+# replaces is imported into an empty store.
+DEVOPS_PIPELINE_DB_PATH = DEVOPS_DATA_DIR / "pipeline_timeline.sqlite3"
+DEVOPS_LEGACY_CI_TIMELINE_PATH = DEVOPS_DATA_DIR / "ci_pipeline_timeline.json"
 
 DEFAULT_MAX_RETRY = 5
 PYTEST_TIMEOUT_SECONDS = 180
 SANDBOX_DOCKER_IMAGE = "python:3.11-slim"
+# Python in SANDBOX_DOCKER_IMAGE; local compile checks parse for this version.
+SANDBOX_PYTHON_VERSION = (3, 11)
 SANDBOX_WORKDIR = "/workspace"
+SANDBOX_SETUP_TIMEOUT_SECONDS = 300
+
+# pytest plugin mounted read-only into the sandbox; it writes one JSON line
+# per test outcome into a per-run report directory.
+SANDBOX_PLUGIN_DIR = BASE_DIR / "sandbox"
+SANDBOX_PLUGIN_MOUNT = "/opt/rift"
+SANDBOX_REPORTS_DIR = WORKSPACES_DIR / ".reports"
+SANDBOX_REPORT_MOUNT = "/rift-report"
+
+# Local compile check of the repo's Python files before the first sandbox
+# run; files are compiled in worker processes above the threshold.
+PREFLIGHT_ENABLED = os.getenv("RIFT_PREFLIGHT", "1") != "0"
+PREFLIGHT_PARALLEL_MIN_FILES = int(os.getenv("RIFT_PREFLIGHT_PARALLEL_MIN_FILES", "200"))
+PREFLIGHT_MAX_ROUNDS = 3
+
+# Fixed files are always compiled before they are written; with this set
+# the tests touching each fixed file also run in the warm sandbox, and a
+# fix that makes new tests fail is reverted before it is committed.
+FIX_VERIFY_TESTS = os.getenv("RIFT_FIX_VERIFY_TESTS", "0") != "0"
+
+# "iteration": one commit per fix iteration covering every fixed file;
+# "file": one commit per fixed file.
+GIT_COMMIT_MODE = os.getenv("RIFT_COMMIT_MODE", "iteration")
+# Commit on a per-run background thread while the next test run goes on.
+GIT_BACKGROUND_COMMITS = os.getenv("RIFT_BACKGROUND_COMMITS", "1") != "0"
+
+# The fix branch is pushed after the run result is stored; the stored
+# result's push_status goes from "pending" to "pushed" or "failed" when it
+# finishes.
+# RIFT_PUSH_REMOTE is a remote name or URL; "local" pushes to a bare repo
+# under PUSH_LOCAL_REMOTES_DIR instead, for running offline.
+PUSH_REMOTE = os.getenv("RIFT_PUSH_REMOTE", "origin")
+PUSH_LOCAL_REMOTES_DIR = WORKSPACES_DIR / ".remotes"
+PUSH_WORKER_COUNT = int(os.getenv("RIFT_PUSH_WORKERS", "2"))
+PUSH_MAX_ATTEMPTS = int(os.getenv("RIFT_PUSH_MAX_ATTEMPTS", "4"))
+# Doubles after each failed attempt.
+PUSH_RETRY_BACKOFF_SECONDS = float(os.getenv("RIFT_PUSH_RETRY_BACKOFF_SECONDS", "2"))
+
+# Sandbox output is streamed to a per-run log directory; only the last
+# OUTPUT_BUFFER_MAX_CHARS of each command stay in memory. The directories of
+# the SANDBOX_LOG_RETENTION most recent runs are kept after the run ends;
+# directories of runs still in progress are never pruned.
+SANDBOX_LOGS_DIR = WORKSPACES_DIR / ".logs"
+SANDBOX_LOG_RETENTION = int(os.getenv("RIFT_SANDBOX_LOG_RETENTION", "50"))
+OUTPUT_BUFFER_MAX_CHARS = int(os.getenv("RIFT_OUTPUT_BUFFER_CHARS", str(256 * 1024)))
+
+# Local images with a repo's dependencies pre-installed, keyed by a hash of
+# the base image and requirements files; least recently used go first.
+SANDBOX_IMAGE_CACHE_ENABLED = os.getenv("RIFT_SANDBOX_IMAGE_CACHE", "1") != "0"
+SANDBOX_IMAGE_REPOSITORY = "rift2026-sandbox"
+SANDBOX_IMAGE_INDEX_PATH = WORKSPACES_DIR / ".sandbox_images.json"
+SANDBOX_IMAGE_CACHE_MAX_IMAGES = int(os.getenv("RIFT_SANDBOX_IMAGE_MAX_IMAGES", "20"))
+SANDBOX_IMAGE_CACHE_BUDGET_BYTES = int(os.getenv("RIFT_SANDBOX_IMAGE_BUDGET_MB", "8192")) * 1024 * 1024
+
+# Extra bug_mapper rule packs (JSON or TOML), separated by os.pathsep.
+BUG_RULE_PACKS = [
+    Path(path) for path in os.getenv("RIFT_BUG_RULE_PACKS", "").split(os.pathsep) if path.strip()
+]
+
+# Background job pool for POST /jobs.
+JOB_WORKER_COUNT = int(os.getenv("RIFT_JOB_WORKERS", "4"))
+JOB_QUEUE_LIMIT = int(os.getenv("RIFT_JOB_QUEUE_LIMIT", "500"))
+JOB_HISTORY_LIMIT = int(os.getenv("RIFT_JOB_HISTORY_LIMIT", "1000"))
+
+# Per-run timing spans, stored with the run (GET /runs/{id}/trace).
+TRACE_MAX_SPANS = int(os.getenv("RIFT_TRACE_MAX_SPANS", "5000"))
+
+# Live run events (GET /runs/{id}/events).
+EVENT_STREAM_HISTORY_LIMIT = int(os.getenv("RIFT_EVENT_STREAM_HISTORY_LIMIT", "200"))
+SSE_HEARTBEAT_SECONDS = 15
 
 BASE_SCORE = 100
 SPEED_BONUS_THRESHOLD_SECONDS = 300
@@ -1,32 +1,46 @@
 # backend>coordinator.py
 from __future__ import annotations
 
-import json
 from typing import Any
 
 try:
     from .agents.coordinator_agent import CoordinatorAgent
-    from .config import DEFAULT_MAX_RETRY, RESULTS_PATH
+    from .config import DEFAULT_MAX_RETRY
+    from .events import EventBroker
+    from .run_store import RunStore
 except ImportError:
     from agents.coordinator_agent import CoordinatorAgent  # type: ignore
-    from config import DEFAULT_MAX_RETRY, RESULTS_PATH  # type: ignore
+    from config import DEFAULT_MAX_RETRY  # type: ignore
+    from events import EventBroker  # type: ignore
+    from run_store import RunStore  # type: ignore
 
 
 class AgentCoordinator:
     def __init__(self) -> None:
-        self.agent = CoordinatorAgent()
-
-    def execute(self, repo_url: str, team_name: str, leader_name: str, max_retry: int = DEFAULT_MAX_RETRY) -> dict[str, Any]:
+        self.events = EventBroker()
+        self.run_store = RunStore()
+        self.agent = CoordinatorAgent(event_broker=self.events, run_store=self.run_store)
+
+    def execute(
+        self,
+        repo_url: str,
+        team_name: str,
+        leader_name: str,
+        max_retry: int = DEFAULT_MAX_RETRY,
+        run_id: str | None = None,
+    ) -> dict[str, Any]:
         return self.agent.run(
             repo_url=repo_url,
             team_name=team_name,
             leader_name=leader_name,
             max_retry=max_retry,
+            run_id=run_id,
         )
 
 
-def load_results() -> dict[str, Any]:
-    if not RESULTS_PATH.exists():
+def load_results(run_store: RunStore | None = None) -> dict[str, Any]:
+    latest = run_store.latest() if run_store is not None else None
+    if latest is None:
         return {
             "repo_url": "",
             "team_name": "",
@@ -45,5 +59,5 @@ def load_results() -> dict[str, Any]:
             "fixes": [],
             "ci_cd_timeline": [],
         }
-    return json.loads(RESULTS_PATH.read_text(encoding="utf-8"))
+    return latest
 
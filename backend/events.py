@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Callable
+
+try:
+    from .config import EVENT_STREAM_HISTORY_LIMIT, SSE_HEARTBEAT_SECONDS
+except ImportError:
+    from config import EVENT_STREAM_HISTORY_LIMIT, SSE_HEARTBEAT_SECONDS  # type: ignore
+
+
+@dataclass(frozen=True)
+class RunEvent:
+    seq: int
+    type: str
+    data: dict[str, Any]
+    timestamp: str
+
+    def to_sse(self) -> str:
+        payload = json.dumps(
+            {"seq": self.seq, "type": self.type, "timestamp": self.timestamp, **self.data},
+            default=str,
+        )
+        return f"id: {self.seq}\nevent: {self.type}\ndata: {payload}\n\n"
+
+
+class RunEventStream:
+    """Append-only event buffer for one run. Every event is kept so late
+    subscribers can replay from the start."""
+
+    def __init__(self, run_id: str) -> None:
+        self.run_id = run_id
+        self._events: list[RunEvent] = []
+        self._closed = False
+        self._listeners: list[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def publish(self, event_type: str, **data: Any) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._events.append(
+                RunEvent(
+                    seq=len(self._events) + 1,
+                    type=event_type,
+                    data=data,
+                    timestamp=datetime.now(timezone.utc).isoformat(),
+                )
+            )
+            listeners = list(self._listeners)
+        self._notify(listeners)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            listeners = list(self._listeners)
+        self._notify(listeners)
+
+    def events_since(self, seq: int) -> tuple[list[RunEvent], bool]:
+        with self._lock:
+            return self._events[max(0, seq):], self._closed
+
+    def subscribe(self, listener: Callable[[], None]) -> None:
+        with self._lock:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[], None]) -> None:
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def _notify(self, listeners: list[Callable[[], None]]) -> None:
+        for listener in listeners:
+            try:
+                listener()
+            except RuntimeError:
+                # The subscriber's event loop is already gone.
+                pass
+
+
+class EventBroker:
+    """Registry of run event streams, keyed by run id."""
+
+    def __init__(self, history_limit: int = EVENT_STREAM_HISTORY_LIMIT) -> None:
+        self.history_limit = max(1, history_limit)
+        self._streams: OrderedDict[str, RunEventStream] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def open(self, run_id: str) -> RunEventStream:
+        with self._lock:
+            stream = self._streams.get(run_id)
+            if stream is None:
+                stream = RunEventStream(run_id)
+                self._streams[run_id] = stream
+                self._evict_closed()
+            return stream
+
+    def get(self, run_id: str) -> RunEventStream | None:
+        with self._lock:
+            return self._streams.get(run_id)
+
+    def close(self, run_id: str) -> None:
+        stream = self.get(run_id)
+        if stream is not None:
+            stream.close()
+
+    def _evict_closed(self) -> None:
+        overflow = len(self._streams) - self.history_limit
+        if overflow <= 0:
+            return
+        for run_id in [
+            run_id for run_id, stream in self._streams.items() if stream.closed
+        ][:overflow]:
+            del self._streams[run_id]
+
+
+async def stream_sse(
+    stream: RunEventStream,
+    since: int = 0,
+    heartbeat_seconds: float = SSE_HEARTBEAT_SECONDS,
+) -> AsyncIterator[str]:
+    """Yield Server-Sent Events for ``stream`` starting after event ``since``
+    until the run's stream is closed."""
+    loop = asyncio.get_running_loop()
+    wake = asyncio.Event()
+
+    def notify() -> None:
+        loop.call_soon_threadsafe(wake.set)
+
+    stream.subscribe(notify)
+    try:
+        while True:
+            wake.clear()
+            events, closed = stream.events_since(since)
+            for event in events:
+                yield event.to_sse()
+                since = event.seq
+            if closed:
+                break
+            try:
+                await asyncio.wait_for(wake.wait(), timeout=heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+    finally:
+        stream.unsubscribe(notify)
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
+try:
+    from .config import DEFAULT_MAX_RETRY, JOB_HISTORY_LIMIT, JOB_QUEUE_LIMIT, JOB_WORKER_COUNT
+    from .coordinator import AgentCoordinator
+    from .utils.logger import get_logger
+except ImportError:
+    from config import DEFAULT_MAX_RETRY, JOB_HISTORY_LIMIT, JOB_QUEUE_LIMIT, JOB_WORKER_COUNT  # type: ignore
+    from coordinator import AgentCoordinator  # type: ignore
+    from utils.logger import get_logger  # type: ignore
+
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+FINISHED_JOB_STATES = {JOB_COMPLETED, JOB_FAILED}
+
+
+class JobQueueFullError(RuntimeError):
+    pass
+
+
+class JobManagerClosedError(RuntimeError):
+    pass
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+@dataclass
+class Job:
+    job_id: str
+    repo_url: str
+    team_name: str
+    leader_name: str
+    max_retry: int
+    status: str = JOB_QUEUED
+    submitted_at: str = field(default_factory=_utc_now)
+    started_at: str | None = None
+    finished_at: str | None = None
+    result: dict[str, Any] | None = None
+    error_message: str = ""
+
+    def to_dict(self, include_result: bool = True) -> dict[str, Any]:
+        payload: dict[str, Any] = {
+            "job_id": self.job_id,
+            "repo_url": self.repo_url,
+            "team_name": self.team_name,
+            "leader_name": self.leader_name,
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error_message": self.error_message,
+        }
+        if include_result:
+            payload["result"] = self.result
+        return payload
+
+
+class JobManager:
+    """Runs coordinator executions on a bounded pool of background workers."""
+
+    def __init__(
+        self,
+        coordinator: AgentCoordinator,
+        max_workers: int = JOB_WORKER_COUNT,
+        queue_limit: int = JOB_QUEUE_LIMIT,
+        history_limit: int = JOB_HISTORY_LIMIT,
+    ) -> None:
+        self.logger = get_logger("JobManager")
+        self.coordinator = coordinator
+        self.queue_limit = max(1, queue_limit)
+        self.history_limit = max(1, history_limit)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers), thread_name_prefix="rift-job"
+        )
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        repo_url: str,
+        team_name: str,
+        leader_name: str,
+        max_retry: int = DEFAULT_MAX_RETRY,
+    ) -> dict[str, Any]:
+        job = Job(
+            job_id=uuid.uuid4().hex,
+            repo_url=repo_url,
+            team_name=team_name,
+            leader_name=leader_name,
+            max_retry=max_retry,
+        )
+        with self._lock:
+            if self._pending >= self.queue_limit:
+                raise JobQueueFullError(
+                    f"Job queue is full ({self.queue_limit} pending jobs). Retry later."
+                )
+            self._pending += 1
+            self._jobs[job.job_id] = job
+            self._evict_finished()
+            snapshot = job.to_dict(include_result=False)
+
+        # Open the run's event stream now so clients can subscribe while the
+        # job is still queued.
+        stream = self.coordinator.events.open(job.job_id)
+        stream.publish("job_queued", run_id=job.job_id, submitted_at=job.submitted_at)
+        try:
+            self._executor.submit(self._run, job)
+        except RuntimeError as exc:
+            # The executor was shut down: the job would stay queued forever.
+            with self._lock:
+                self._pending -= 1
+                self._jobs.pop(job.job_id, None)
+            error = JobManagerClosedError("Job manager is shutting down. Retry later.")
+            stream.publish("job_failed", run_id=job.job_id, error_message=str(error))
+            stream.close()
+            raise error from exc
+        return snapshot
+
+    def get(self, job_id: str) -> dict[str, Any] | None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            payload = job.to_dict()
+        result = payload["result"]
+        if result is not None and result.get("push_status") == "pending":
+            # The branch push outlives the job; its outcome is only stored.
+            payload["result"] = self.coordinator.run_store.get(job_id) or result
+        return payload
+
+    def list_jobs(self, status: str | None = None, limit: int = 50) -> list[dict[str, Any]]:
+        with self._lock:
+            jobs = [
+                job.to_dict(include_result=False)
+                for job in reversed(self._jobs.values())
+                if status is None or job.status == status
+            ]
+        return jobs[: max(0, limit)]
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _run(self, job: Job) -> None:
+        with self._lock:
+            job.status = JOB_RUNNING
+            job.started_at = _utc_now()
+
+        result: dict[str, Any] | None = None
+        error_message = ""
+        try:
+            result = self.coordinator.execute(
+                repo_url=job.repo_url,
+                team_name=job.team_name,
+                leader_name=job.leader_name,
+                max_retry=job.max_retry,
+                run_id=job.job_id,
+            )
+        except Exception as exc:  # noqa: BLE001
+            self.logger.exception("Job %s failed: %s", job.job_id, exc)
+            error_message = str(exc)
+            stream = self.coordinator.events.open(job.job_id)
+            stream.publish("job_failed", run_id=job.job_id, error_message=error_message)
+            stream.close()
+
+        with self._lock:
+            job.result = result
+            job.error_message = error_message
+            job.status = JOB_COMPLETED if result is not None else JOB_FAILED
+            job.finished_at = _utc_now()
+            self._pending -= 1
+            self._evict_finished()
+
+    def _evict_finished(self) -> None:
+        # Oldest finished jobs go first; queued and running jobs are never dropped.
+        overflow = len(self._jobs) - self.history_limit
+        if overflow <= 0:
+            return
+        for job_id in [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.status in FINISHED_JOB_STATES
+        ][:overflow]:
+            del self._jobs[job_id]
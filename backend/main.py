@@ -1,19 +1,41 @@
-# backend>main.py
 from __future__ import annotations
 
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+from fastapi import FastAPI, Header, HTTPException
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
 try:
-    from .config import DEFAULT_MAX_RETRY
+    from .config import DEFAULT_MAX_RETRY, SANDBOX_LOGS_DIR
     from .coordinator import AgentCoordinator, load_results
+    from .events import stream_sse
+    from .jobs import JobManager, JobManagerClosedError, JobQueueFullError
+    from .run_store import InvalidCursorError
+    from .tracing import to_chrome_trace
+    from .utils.bug_mapper import get_matcher
 except ImportError:
-    from config import DEFAULT_MAX_RETRY  # type: ignore
+    from config import DEFAULT_MAX_RETRY, SANDBOX_LOGS_DIR  # type: ignore
     from coordinator import AgentCoordinator, load_results  # type: ignore
+    from events import stream_sse  # type: ignore
+    from jobs import JobManager, JobManagerClosedError, JobQueueFullError  # type: ignore
+    from run_store import InvalidCursorError  # type: ignore
+    from tracing import to_chrome_trace  # type: ignore
+    from utils.bug_mapper import get_matcher  # type: ignore
 
 
-app = FastAPI(title="RIFT 2026 Autonomous Agent Backend", version="1.0.0")
 coordinator = AgentCoordinator()
+job_manager = JobManager(coordinator)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    yield
+    job_manager.shutdown(wait=False)
+
+
+app = FastAPI(title="RIFT 2026 Autonomous Agent Backend", version="1.0.0", lifespan=lifespan)
 
 
 class RunAgentRequest(BaseModel):
@@ -27,9 +49,15 @@ def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/bug-rules")
+def bug_rules() -> dict:
+    """bug_mapper rules in priority order, with hits since startup."""
+    return {"rules": get_matcher().hit_counts()}
+
+
 @app.get("/results")
 def get_results() -> dict:
-    return load_results()
+    return load_results(coordinator.run_store)
 
 
 @app.post("/run-agent")
@@ -44,3 +72,118 @@ def run_agent(payload: RunAgentRequest) -> dict:
     except Exception as exc:  # noqa: BLE001
         raise HTTPException(status_code=500, detail=f"Agent execution failed: {exc}") from exc
 
+
+@app.post("/jobs", status_code=202)
+def submit_job(payload: RunAgentRequest) -> dict:
+    try:
+        return job_manager.submit(
+            repo_url=payload.repo_url,
+            team_name=payload.team_name,
+            leader_name=payload.leader_name,
+            max_retry=DEFAULT_MAX_RETRY,
+        )
+    except JobQueueFullError as exc:
+        raise HTTPException(status_code=429, detail=str(exc)) from exc
+    except JobManagerClosedError as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+
+
+@app.get("/jobs")
+def list_jobs(status: str | None = None, limit: int = 50) -> dict:
+    return {"jobs": job_manager.list_jobs(status=status, limit=limit)}
+
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str) -> dict:
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job id: {job_id}")
+    return job
+
+
+@app.get("/runs")
+def list_runs(
+    team_name: str | None = None,
+    repo_url: str | None = None,
+    status: str | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    limit: int = 50,
+    cursor: str | None = None,
+) -> dict:
+    try:
+        runs, next_cursor = coordinator.run_store.query(
+            team_name=team_name,
+            repo_url=repo_url,
+            status=status,
+            since=since,
+            until=until,
+            limit=limit,
+            cursor=cursor,
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    return {"runs": runs, "next_cursor": next_cursor}
+
+
+@app.get("/runs/{run_id}")
+def get_run(run_id: str) -> dict:
+    run = coordinator.run_store.get(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Unknown run id: {run_id}")
+    return run
+
+
+@app.get("/runs/{run_id}/trace")
+def get_run_trace(run_id: str) -> JSONResponse:
+    """The run's timing spans as Chrome trace-event JSON; open it in
+    chrome://tracing or ui.perfetto.dev."""
+    run = coordinator.run_store.get(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Unknown run id: {run_id}")
+    return JSONResponse(
+        to_chrome_trace(run_id, run.get("spans", [])),
+        headers={"Content-Disposition": f'attachment; filename="run-{run_id}.trace.json"'},
+    )
+
+
+@app.get("/runs/{run_id}/iterations/{iteration}/log")
+def get_iteration_log(run_id: str, iteration: int) -> FileResponse:
+    """The iteration's full test output, while its sandbox log is kept
+    (see SANDBOX_LOG_RETENTION)."""
+    run = coordinator.run_store.get(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Unknown run id: {run_id}")
+    entry = next(
+        (item for item in run.get("ci_cd_timeline", []) if item.get("iteration") == iteration),
+        None,
+    )
+    log_path = Path(entry["log_path"]).resolve() if entry and entry.get("log_path") else None
+    if (
+        log_path is None
+        or not log_path.is_relative_to(SANDBOX_LOGS_DIR.resolve())
+        or not log_path.is_file()
+    ):
+        raise HTTPException(status_code=404, detail=f"No log for iteration {iteration} of run {run_id}")
+    return FileResponse(log_path, media_type="text/plain; charset=utf-8", filename=log_path.name)
+
+
+@app.get("/runs/{run_id}/events")
+def run_events(
+    run_id: str,
+    since: int = 0,
+    last_event_id: str | None = Header(default=None),
+) -> StreamingResponse:
+    stream = coordinator.events.get(run_id)
+    if stream is None:
+        raise HTTPException(status_code=404, detail=f"Unknown run id: {run_id}")
+
+    # EventSource reconnects send Last-Event-ID; resume after it.
+    if last_event_id and last_event_id.isdigit():
+        since = max(since, int(last_event_id))
+
+    return StreamingResponse(
+        stream_sse(stream, since=since),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import base64
+import json
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+try:
+    from .config import RESULTS_PATH, RUNS_DB_PATH
+    from .utils.logger import ensure_parent_dir, get_logger
+except ImportError:
+    from config import RESULTS_PATH, RUNS_DB_PATH  # type: ignore
+    from utils.logger import ensure_parent_dir, get_logger  # type: ignore
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    team_name TEXT NOT NULL,
+    leader_name TEXT NOT NULL,
+    repo_url TEXT NOT NULL,
+    branch_name TEXT NOT NULL,
+    final_status TEXT NOT NULL,
+    stop_reason TEXT NOT NULL,
+    time_taken_seconds REAL NOT NULL,
+    final_score INTEGER NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_created ON runs (created_at, run_id);
+CREATE INDEX IF NOT EXISTS idx_runs_team ON runs (team_name, created_at, run_id);
+CREATE INDEX IF NOT EXISTS idx_runs_repo ON runs (repo_url, created_at, run_id);
+CREATE INDEX IF NOT EXISTS idx_runs_status ON runs (final_status, created_at, run_id);
+"""
+
+SUMMARY_COLUMNS = (
+    "run_id",
+    "created_at",
+    "team_name",
+    "leader_name",
+    "repo_url",
+    "branch_name",
+    "final_status",
+    "stop_reason",
+    "time_taken_seconds",
+    "final_score",
+)
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(created_at: str, run_id: str) -> str:
+    raw = json.dumps([created_at, run_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    try:
+        created_at, run_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursorError(f"Invalid cursor: {cursor}") from exc
+    return str(created_at), str(run_id)
+
+
+class RunStore:
+    """SQLite history of every coordinator run. The latest run is also kept
+    in memory so GET /results never touches disk."""
+
+    def __init__(self, db_path: Path = RUNS_DB_PATH, legacy_results_path: Path = RESULTS_PATH) -> None:
+        self.logger = get_logger("RunStore")
+        self.db_path = db_path
+        self._local = threading.local()
+        self._latest_lock = threading.Lock()
+
+        ensure_parent_dir(db_path)
+        conn = self._connection()
+        conn.executescript(SCHEMA)
+        self._import_legacy_results(legacy_results_path)
+        self._latest = self._load_latest()
+
+    def save(self, result: dict[str, Any]) -> None:
+        score = result.get("score") or {}
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO runs (
+                    run_id, created_at, team_name, leader_name, repo_url, branch_name,
+                    final_status, stop_reason, time_taken_seconds, final_score, payload
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    result["run_id"],
+                    result.get("end_time") or result.get("start_time") or "",
+                    result.get("team_name", ""),
+                    result.get("leader_name", ""),
+                    result.get("repo_url", ""),
+                    result.get("branch_name", ""),
+                    result.get("final_status", "FAILED"),
+                    result.get("stop_reason", ""),
+                    float(result.get("time_taken_seconds") or 0),
+                    int(score.get("final_score") or 0),
+                    json.dumps(result),
+                ),
+            )
+        with self._latest_lock:
+            self._latest = result
+
+    def update(self, run_id: str, **fields: Any) -> dict[str, Any] | None:
+        """Merge ``fields`` into a stored run's payload, e.g. once its
+        background push finishes. Returns the updated run, None if unknown."""
+        conn = self._connection()
+        with conn:
+            # Take the write lock before reading, so concurrent updates
+            # (e.g. the push thread and a spans write) merge, not overwrite.
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT payload FROM runs WHERE run_id = ?", (run_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            result = {**json.loads(row[0]), **fields}
+            conn.execute(
+                "UPDATE runs SET payload = ? WHERE run_id = ?",
+                (json.dumps(result), run_id),
+            )
+            with self._latest_lock:
+                if self._latest is not None and self._latest.get("run_id") == run_id:
+                    self._latest = {**self._latest, **fields}
+        return result
+
+    def latest(self) -> dict[str, Any] | None:
+        with self._latest_lock:
+            return self._latest
+
+    def get(self, run_id: str) -> dict[str, Any] | None:
+        row = self._connection().execute(
+            "SELECT payload FROM runs WHERE run_id = ?", (run_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def query(
+        self,
+        *,
+        team_name: str | None = None,
+        repo_url: str | None = None,
+        status: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        limit: int = 50,
+        cursor: str | None = None,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """Return run summaries newest first, plus the cursor of the next page."""
+        clauses: list[str] = []
+        params: list[Any] = []
+        for column, value in (
+            ("team_name", team_name),
+            ("repo_url", repo_url),
+            ("final_status", status),
+        ):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("created_at < ?")
+            params.append(until)
+        if cursor is not None:
+            clauses.append("(created_at, run_id) < (?, ?)")
+            params.extend(decode_cursor(cursor))
+
+        limit = max(1, min(limit, 500))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._connection().execute(
+            f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM runs {where} "
+            "ORDER BY created_at DESC, run_id DESC LIMIT ?",
+            (*params, limit + 1),
+        ).fetchall()
+
+        runs = [dict(zip(SUMMARY_COLUMNS, row)) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = runs[-1]
+            next_cursor = encode_cursor(last["created_at"], last["run_id"])
+        return runs, next_cursor
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _load_latest(self) -> dict[str, Any] | None:
+        row = self._connection().execute(
+            "SELECT payload FROM runs ORDER BY created_at DESC, run_id DESC LIMIT 1"
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _import_legacy_results(self, results_path: Path) -> None:
+        # One-time import of the single-run results.json the backend used to write.
+        if not results_path.exists():
+            return
+        if self._connection().execute("SELECT 1 FROM runs LIMIT 1").fetchone():
+            return
+        try:
+            result = json.loads(results_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            self.logger.warning("Skipping legacy results import: %s", exc)
+            return
+        if not isinstance(result, dict):
+            return
+        modified = datetime.fromtimestamp(results_path.stat().st_mtime, timezone.utc)
+        result.setdefault("run_id", "legacy")
+        result.setdefault("end_time", modified.isoformat())
+        self.save(result)
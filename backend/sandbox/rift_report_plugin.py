@@ -0,0 +1,105 @@
+"""pytest plugin loaded inside the sandbox container.
+
+With ``--rift-report PATH`` every test outcome and collection error is
+written to PATH as one JSON object per line, so the backend reads exact
+results instead of scraping the terminal output. Only the standard library
+and pytest are available in the container.
+"""
+from __future__ import annotations
+
+import json
+import os
+import traceback
+
+import pytest
+
+MAX_MESSAGE_LENGTH = 2000
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--rift-report",
+        default=None,
+        help="Write JSON-lines test results to this path.",
+    )
+
+
+def pytest_configure(config):
+    path = config.getoption("--rift-report")
+    if path:
+        rootdir = getattr(config, "rootpath", None) or config.rootdir
+        config.pluginmanager.register(_Reporter(path, str(rootdir)), "rift-reporter")
+
+
+class _Reporter:
+    def __init__(self, path: str, rootdir: str) -> None:
+        self.rootdir = os.path.realpath(rootdir)
+        self.handle = open(path, "w", encoding="utf-8")
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        if report.when == "call" or not report.passed:
+            excinfo = call.excinfo if report.failed else None
+            self._write(report, excinfo)
+
+    def pytest_exception_interact(self, node, call, report):
+        # Collection errors (syntax errors, failing imports) never reach
+        # pytest_runtest_makereport.
+        if report.when == "collect":
+            self._write(report, call.excinfo)
+
+    def pytest_unconfigure(self, config):
+        self.handle.close()
+
+    def _write(self, report, excinfo) -> None:
+        record = {
+            "nodeid": report.nodeid,
+            "outcome": "error" if report.failed and report.when != "call" else report.outcome,
+            "when": report.when,
+            "duration": round(getattr(report, "duration", 0.0) or 0.0, 6),
+            "file": "",
+            "line": 0,
+            "exception_type": "",
+            "message": "",
+        }
+        location = getattr(report, "location", None)
+        if location:
+            record["file"] = location[0]
+            record["line"] = (location[1] or 0) + 1
+        if excinfo is not None:
+            record.update(self._exception_details(excinfo.value))
+        self.handle.write(json.dumps(record) + "\n")
+        self.handle.flush()
+
+    def _exception_details(self, exc: BaseException) -> dict:
+        # pytest wraps collection failures in its own exception; report the
+        # underlying error instead.
+        while exc.__cause__ is not None and type(exc).__module__.startswith(("_pytest", "pytest")):
+            exc = exc.__cause__
+
+        details = {"exception_type": type(exc).__name__}
+        if isinstance(exc, SyntaxError):
+            details["message"] = exc.msg or str(exc)
+        else:
+            details["message"] = str(exc)
+        details["message"] = details["message"][:MAX_MESSAGE_LENGTH]
+
+        frame = None
+        if isinstance(exc, SyntaxError) and exc.filename:
+            frame = self._in_repo(exc.filename, exc.lineno or 0)
+        if frame is None:
+            for entry in reversed(traceback.extract_tb(exc.__traceback__)):
+                frame = self._in_repo(entry.filename, entry.lineno or 0)
+                if frame is not None:
+                    break
+        if frame is not None:
+            details["file"], details["line"] = frame
+        return details
+
+    def _in_repo(self, filename: str, line: int):
+        path = os.path.realpath(filename)
+        if "site-packages" in path or not path.startswith(self.rootdir + os.sep):
+            return None
+        return os.path.relpath(path, self.rootdir), line
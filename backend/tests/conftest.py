@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+from typing import Callable, Iterator
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from agents import coordinator_agent  # noqa: E402
+from run_store import RunStore  # noqa: E402
+
+
+@pytest.fixture
+def coordinator(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[coordinator_agent.CoordinatorAgent]:
+    """A coordinator with its own run store and no DevOps bridge."""
+    monkeypatch.setattr(coordinator_agent, "DEVOPS_DATA_DIR", tmp_path / "no-devops")
+    agent = coordinator_agent.CoordinatorAgent(
+        run_store=RunStore(tmp_path / "runs.sqlite3", legacy_results_path=tmp_path / "missing.json")
+    )
+    yield agent
+    agent._push_executor.shutdown(wait=True)
+
+
+def _git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-C", str(repo), *args], check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+@pytest.fixture
+def git_repo(tmp_path: Path) -> Callable[..., Path]:
+    """Factory for a git repository with ``files`` in one initial commit."""
+
+    def make(files: dict[str, str], name: str = "origin") -> Path:
+        repo = tmp_path / name
+        repo.mkdir()
+        _git(repo, "init", "--quiet", "--initial-branch=main")
+        _git(repo, "config", "user.name", "Test")
+        _git(repo, "config", "user.email", "test@example.com")
+        for path, text in files.items():
+            (repo / path).parent.mkdir(parents=True, exist_ok=True)
+            (repo / path).write_text(text)
+        _git(repo, "add", "-A")
+        _git(repo, "commit", "--quiet", "-m", "Initial commit")
+        return repo
+
+    return make
+
+
+@pytest.fixture
+def git() -> Callable[..., str]:
+    """Runs git in a repository and returns its stripped stdout."""
+    return _git
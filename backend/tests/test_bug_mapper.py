@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from utils.bug_mapper import ErrorRule, RuleMatcher, build_matcher, load_rule_pack
+
+
+def _random_rules(rng: random.Random, count: int) -> list[ErrorRule]:
+    # A small alphabet makes overlapping and nested patterns common.
+    return [
+        ErrorRule(
+            pattern="".join(rng.choice("abC") for _ in range(rng.randint(1, 5))),
+            bug_type="LOGIC",
+            priority=rng.randint(0, 3),
+        )
+        for _ in range(count)
+    ]
+
+
+def test_automaton_agrees_with_the_linear_scan() -> None:
+    rng = random.Random(16)
+    for _ in range(20):
+        matcher = RuleMatcher(_random_rules(rng, RuleMatcher.AUTOMATON_MIN_RULES + 16))
+        assert matcher._delta
+        for _ in range(50):
+            message = "".join(rng.choice("aBcd") for _ in range(rng.randint(0, 30)))
+            assert matcher._match_automaton(message.lower()) == matcher._match_scan(message.lower())
+
+
+@pytest.mark.parametrize("padding", [0, RuleMatcher.AUTOMATON_MIN_RULES])
+def test_lowest_priority_wins_and_ties_go_to_the_earlier_rule(padding: int) -> None:
+    rules = [
+        ErrorRule("error", "LOGIC", priority=100),
+        ErrorRule("type", "TYPE_ERROR", priority=100),
+        ErrorRule("TypeError", "LINTING", priority=100),
+        ErrorRule("rror", "SYNTAX", priority=50),
+    ] + [ErrorRule(f"zz{index}", "LOGIC") for index in range(padding)]
+    matcher = RuleMatcher(rules)
+
+    assert matcher.match("TypeError: bad").bug_type == "SYNTAX"
+    assert RuleMatcher(rules[:3] + rules[4:]).match("TypeError: bad").bug_type == "LOGIC"
+    assert matcher.match("nothing here") is None
+
+
+def test_hits_are_counted_per_rule() -> None:
+    matcher = build_matcher()
+    for message in ("TypeError: x", "TypeError: y", "ModuleNotFoundError: z", "fine"):
+        matcher.match(message)
+
+    hits = {entry["pattern"]: entry["hits"] for entry in matcher.hit_counts()}
+
+    assert hits["TypeError"] == 2
+    assert hits["ModuleNotFoundError"] == 1
+    assert sum(hits.values()) == 3
+
+
+def test_rule_pack_overrides_built_in_rules(tmp_path: Path) -> None:
+    pack = tmp_path / "pack.json"
+    pack.write_text(json.dumps([{"pattern": "TypeError: NoneType", "bug_type": "LOGIC", "priority": 10}]))
+
+    matcher = build_matcher([pack])
+
+    assert matcher.match("TypeError: NoneType has no len").bug_type == "LOGIC"
+    assert matcher.match("TypeError: int and str").bug_type == "TYPE_ERROR"
+
+
+def test_toml_rule_pack(tmp_path: Path) -> None:
+    pack = tmp_path / "pack.toml"
+    pack.write_text('[[rules]]\npattern = "E501"\nbug_type = "LINTING"\n')
+
+    assert load_rule_pack(pack) == [ErrorRule("E501", "LINTING")]
+
+
+@pytest.mark.parametrize(
+    "entry, error",
+    [
+        ({"bug_type": "LOGIC"}, "Invalid rule"),
+        ({"pattern": "x", "bug_type": "LOGIC", "priority": "high"}, "Invalid rule"),
+        ({"pattern": "", "bug_type": "LOGIC"}, "Empty pattern"),
+        ({"pattern": "x", "bug_type": "PERFORMANCE"}, "Unknown bug type"),
+    ],
+)
+def test_invalid_rule_pack_entries_are_rejected(tmp_path: Path, entry: dict, error: str) -> None:
+    pack = tmp_path / "pack.json"
+    pack.write_text(json.dumps({"rules": [entry]}))
+
+    with pytest.raises(ValueError, match=error):
+        load_rule_pack(pack)
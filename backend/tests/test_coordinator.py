@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from agents import coordinator_agent
+from agents import test_runner_agent as runner
+from agents.git_agent import GitAgent
+from agents.repo_analyzer_agent import RepoAnalysis
+from agents.run_context import RunContext
+
+
+class FakeRunner:
+    """Replays canned test runs in place of the sandbox."""
+
+    def __init__(self, runs: list[runner.TestRunResult]) -> None:
+        self.runs = runs
+        self.calls = 0
+
+    def run(self, repo_path: Path, tests: list[str], session=None) -> runner.TestRunResult:
+        result = self.runs[min(self.calls, len(self.runs) - 1)]
+        self.calls += 1
+        return result
+
+    def affected_tests(self, repo_path: Path, tests: list[str], edited_files) -> list[str]:
+        return []
+
+
+def _case(file: str, line: int, exception_type: str, message: str) -> runner.TestCaseResult:
+    return runner.TestCaseResult(
+        nodeid=f"tests/test_mod.py::test_{Path(file).stem}_{line}",
+        outcome="failed",
+        when="call",
+        duration=0.1,
+        file=file,
+        line=line,
+        exception_type=exception_type,
+        message=message,
+    )
+
+
+def _failing(*failures: tuple[str, int, str, str]) -> runner.TestRunResult:
+    cases = [_case(*failure) for failure in failures]
+    return runner.TestRunResult(
+        passed=False,
+        output="",
+        return_code=1,
+        failed_tests=[case.nodeid for case in cases],
+        results=cases,
+    )
+
+
+PASSED = runner.TestRunResult(passed=True, output="", return_code=0)
+
+
+def _iterate(coordinator, repo: Path, runs: list[runner.TestRunResult]) -> RunContext:
+    coordinator.test_runner = FakeRunner(runs)
+    ctx = RunContext(
+        repo_url="", team_name="t", leader_name="l", branch_name="b", workspace_name="w", max_retry=5
+    )
+    analysis = RepoAnalysis(repo_path=repo, discovered_tests=["tests/test_mod.py"])
+    coordinator._iterate(ctx, analysis, GitAgent(repo), sandbox=None)
+    return ctx
+
+
+@pytest.fixture(autouse=True)
+def _no_test_verification(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(coordinator_agent, "FIX_VERIFY_TESTS", False)
+
+
+def test_same_failures_after_a_fix_stop_with_no_progress(coordinator, git_repo) -> None:
+    repo = git_repo({"mod.py": "def f()\n    return 1\n", "tests/test_mod.py": "def test_f(): pass\n"})
+
+    ctx = _iterate(coordinator, repo, [_failing(("mod.py", 1, "SyntaxError", "expected ':'"))])
+
+    # The first iteration added the colon; the second failed identically.
+    assert coordinator.test_runner.calls == 2
+    assert ctx.stop_reason == "no_progress"
+    assert ctx.commit_count == 1
+
+
+def test_fixable_failure_whose_fix_fails_stops_with_no_progress(coordinator, git_repo) -> None:
+    repo = git_repo({"tests/test_mod.py": "def test_f(): pass\n"})
+
+    # SYNTAX has a fixer, but the file it points at does not exist.
+    ctx = _iterate(coordinator, repo, [_failing(("gone.py", 1, "SyntaxError", "expected ':'"))])
+
+    assert coordinator.test_runner.calls == 1
+    assert ctx.stop_reason == "no_progress"
+    assert [fix["status"] for fix in ctx.fixes] == ["Failed"]
+
+
+def test_only_unfixable_failures_stop_with_no_fixable_failures(coordinator, git_repo) -> None:
+    repo = git_repo({"mod.py": "def f():\n    return 1\n", "tests/test_mod.py": "def test_f(): pass\n"})
+
+    ctx = _iterate(coordinator, repo, [_failing(("mod.py", 2, "AssertionError", "assert 1 == 2"))])
+
+    assert coordinator.test_runner.calls == 1
+    assert ctx.stop_reason == "no_fixable_failures"
+    assert ctx.commit_count == 0
+
+
+def test_iteration_mode_commits_each_iteration_once(coordinator, git_repo, git, monkeypatch) -> None:
+    monkeypatch.setattr(coordinator_agent, "GIT_COMMIT_MODE", "iteration")
+    repo = git_repo(
+        {
+            "a.py": "def f()\n    return 1\n",
+            "b.py": "import os\nx = 1\n",
+            "tests/test_mod.py": "def test_f(): pass\n",
+        }
+    )
+    runs = [
+        _failing(("a.py", 1, "SyntaxError", "expected ':'"), ("b.py", 1, "", "unused import os")),
+        PASSED,
+    ]
+
+    ctx = _iterate(coordinator, repo, runs)
+
+    assert ctx.final_status == "PASSED"
+    assert ctx.commit_count == 1
+    assert git(repo, "rev-list", "--count", "HEAD") == "2"
+    assert git(repo, "show", "--name-only", "--format=%s", "HEAD").splitlines() == [
+        "[AI-AGENT] Fix 2 issues in 2 files",
+        "",
+        "a.py",
+        "b.py",
+    ]
+    # Three forks for the iteration instead of three per file.
+    assert (ctx.git_forks, ctx.git_forks_saved) == (3, 3)
+
+
+class FlakyGitAgent(GitAgent):
+    """Fails the first ``failures`` pushes, as a flaky network would."""
+
+    def __init__(self, repo_path: Path, failures: int) -> None:
+        super().__init__(repo_path)
+        self.failures = failures
+        self.push_attempts = 0
+
+    def push_branch(self, branch_name: str, remote: str = "origin") -> None:
+        self.push_attempts += 1
+        if self.push_attempts <= self.failures:
+            raise RuntimeError("Could not resolve host")
+        super().push_branch(branch_name, remote)
+
+
+@pytest.fixture
+def push_ctx(coordinator, git_repo, git, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """A run whose fix branch has one commit and is waiting to be pushed
+    to a local bare remote; returns the context, the clone and the list of
+    backoff delays."""
+    monkeypatch.setattr(coordinator_agent, "PUSH_REMOTE", "local")
+    monkeypatch.setattr(coordinator_agent, "PUSH_LOCAL_REMOTES_DIR", tmp_path / "remotes")
+    monkeypatch.setattr(coordinator_agent, "PUSH_MAX_ATTEMPTS", 3)
+    monkeypatch.setattr(coordinator_agent, "PUSH_RETRY_BACKOFF_SECONDS", 0.5)
+    delays: list[float] = []
+    # Only the coordinator's retry backoff is recorded instead of slept.
+    monkeypatch.setattr(
+        coordinator_agent,
+        "time",
+        SimpleNamespace(sleep=delays.append, monotonic=time.monotonic, time=time.time),
+    )
+
+    repo = git_repo({"mod.py": "x = 1\n"})
+    git(repo, "checkout", "--quiet", "-b", "fix-branch")
+    (repo / "mod.py").write_text("x = 2\n")
+    GitAgent(repo).commit_fix("mod.py", "Fix mod.py")
+
+    ctx = RunContext(
+        repo_url="",
+        team_name="t",
+        leader_name="l",
+        branch_name="fix-branch",
+        workspace_name="w",
+        max_retry=1,
+        events=coordinator.events.open("run-1"),
+        run_id="run-1",
+        push_status="pending",
+    )
+    coordinator.run_store.save({"run_id": ctx.run_id, "push_status": "pending"})
+    return ctx, repo, delays
+
+
+def test_push_retries_until_the_branch_reaches_the_remote(coordinator, push_ctx, git, tmp_path: Path) -> None:
+    ctx, repo, delays = push_ctx
+    agent = FlakyGitAgent(repo, failures=2)
+
+    coordinator._push(ctx, agent)
+
+    assert agent.push_attempts == 3
+    assert delays == [0.5, 1.0]
+    assert git(tmp_path / "remotes" / "w.git", "rev-parse", "fix-branch") == git(repo, "rev-parse", "HEAD")
+    stored = coordinator.run_store.get(ctx.run_id)
+    assert (stored["push_status"], stored["push_error"]) == ("pushed", "")
+    assert [span["args"]["attempt"] for span in stored["spans"] if span["name"] == "push"] == [1, 2, 3]
+
+    events, closed = ctx.events.events_since(0)
+    assert [event.data["push_status"] for event in events if event.type == "push_completed"] == ["pushed"]
+    assert closed
+
+
+def test_push_failing_every_attempt_is_stored_as_failed(coordinator, push_ctx) -> None:
+    ctx, repo, _delays = push_ctx
+    agent = FlakyGitAgent(repo, failures=5)
+
+    coordinator._push(ctx, agent)
+
+    assert agent.push_attempts == 3
+    stored = coordinator.run_store.get(ctx.run_id)
+    assert (stored["push_status"], stored["push_error"]) == ("failed", "Could not resolve host")
+    assert coordinator.run_store.latest()["push_status"] == "failed"
+    assert ctx.events.closed
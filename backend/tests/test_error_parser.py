@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from agents import test_runner_agent as runner
+from agents.error_parser_agent import (
+    ErrorParserAgent,
+    ParsedFailure,
+    _lines_from_chunks,
+    failure_fingerprint,
+)
+
+
+def _case(nodeid: str, outcome: str, file: str = "", line: int = 0, exception_type: str = "", message: str = ""):
+    return runner.TestCaseResult(
+        nodeid=nodeid,
+        outcome=outcome,
+        when="call",
+        duration=0.1,
+        file=file,
+        line=line,
+        exception_type=exception_type,
+        message=message,
+    )
+
+
+def test_parse_report_keeps_failures_inside_the_repo(tmp_path: Path) -> None:
+    (tmp_path / "app").mkdir()
+    (tmp_path / "app" / "calc.py").write_text("def add(a, b):\n    return a + b\n")
+    (tmp_path / ".github").mkdir()
+    (tmp_path / ".github" / "check.py").write_text("x = 1\n")
+    results = [
+        _case("tests/test_a.py::test_ok", "passed", "app/calc.py", 2),
+        _case("tests/test_a.py::test_add", "failed", "app/calc.py", 2, "TypeError", "unsupported operand\nmore"),
+        _case("tests/test_a.py::test_ci", "error", ".github/check.py", 1, "ModuleNotFoundError", "No module named 'yaml'"),
+        _case("tests/test_a.py::test_lib", "failed", "/usr/lib/python3.11/json/__init__.py", 1, "ValueError"),
+        _case("tests/test_a.py::test_nowhere", "failed"),
+    ]
+
+    failures = ErrorParserAgent().parse_report(results, tmp_path)
+
+    assert [(f.file, f.line_number, f.bug_type, f.message) for f in failures] == [
+        ("app/calc.py", 2, "TYPE_ERROR", "TypeError: unsupported operand"),
+        (".github/check.py", 1, "IMPORT", "ModuleNotFoundError: No module named 'yaml'"),
+    ]
+
+
+def test_torn_report_still_yields_its_complete_failures(tmp_path: Path) -> None:
+    (tmp_path / "mod.py").write_text("import missing\n")
+    report = tmp_path / "report.jsonl"
+    report.write_text(
+        '{"nodeid": "t.py::a", "outcome": "failed", "file": "mod.py", "line": 1, '
+        '"exception_type": "ModuleNotFoundError", "message": "No module named \'missing\'"}\n'
+        '{"nodeid": "t.py::b", "outcome": "fai'
+    )
+
+    failures = ErrorParserAgent().parse_report(runner._read_report(report), tmp_path)
+
+    assert [(f.file, f.bug_type) for f in failures] == [("mod.py", "IMPORT")]
+
+
+PYTEST_LOG = (
+    "============================= test session starts ==============================\r\n"
+    "tests/test_calc.py FF\r\n"
+    "=================================== FAILURES ===================================\r\n"
+    "app/calc.py:2: in add\r\n"
+    "E   TypeError: unsupported operand type(s) for +: 'int' and 'str'\r\n"
+    "app/calc.py:2: in add\r\n"
+    "E   TypeError: unsupported operand type(s) for +: 'int' and 'str'\r\n"
+    "FAILED tests/test_calc.py::test_a - TypeError\r\n"
+)
+
+
+def test_lines_from_chunks_joins_crlf_split_across_chunks() -> None:
+    chunks = ["first\r", "\nsec", "ond\r\n", "", "\r\nlast\r"]
+
+    assert list(_lines_from_chunks(chunks)) == ["first", "second", "", "last"]
+
+
+def test_parse_chunks_matches_parse_whatever_the_chunking(tmp_path: Path) -> None:
+    (tmp_path / "app").mkdir()
+    (tmp_path / "app" / "calc.py").write_text("def add(a, b):\n    return a + b\n")
+    agent = ErrorParserAgent()
+    expected = agent.parse(PYTEST_LOG, tmp_path)
+
+    for size in (1, 2, 7, 64):
+        chunks = [PYTEST_LOG[start:start + size] for start in range(0, len(PYTEST_LOG), size)]
+        assert agent.parse_chunks(chunks, tmp_path) == expected
+
+    # The repeated failure is reported once, counting both occurrences.
+    assert [(f.file, f.line_number, f.bug_type, f.occurrences) for f in expected] == [
+        ("app/calc.py", 2, "TYPE_ERROR", 2)
+    ]
+
+
+def _failure(file: str, line: int, message: str, bug_type: str = "LOGIC", occurrences: int = 1) -> ParsedFailure:
+    return ParsedFailure(
+        file=file, line_number=line, message=message, bug_type=bug_type, occurrences=occurrences
+    )
+
+
+def test_import_errors_share_a_fingerprint_across_importers() -> None:
+    message = "ModuleNotFoundError: No module named 'requests'"
+
+    assert failure_fingerprint(_failure("a.py", 1, message, "IMPORT")) == failure_fingerprint(
+        _failure("pkg/b.py", 12, message, "IMPORT")
+    )
+    assert failure_fingerprint(_failure("a.py", 1, message, "IMPORT")) != failure_fingerprint(
+        _failure("a.py", 1, "ModuleNotFoundError: No module named 'yaml'", "IMPORT")
+    )
+
+
+def test_fingerprint_masks_numbers_and_addresses() -> None:
+    first = _failure("mod.py", 3, "AssertionError: assert 41 == 42 at 0x7f3a2c")
+    second = _failure("mod.py", 3, "AssertionError:   assert 7 == 8 at 0xDEADBEEF")
+
+    assert failure_fingerprint(first) == failure_fingerprint(second)
+
+
+def test_fingerprint_keeps_the_frame_for_other_errors() -> None:
+    message = "TypeError: unsupported operand type(s) for +: 'int' and 'str'"
+
+    assert failure_fingerprint(_failure("mod.py", 3, message)) != failure_fingerprint(
+        _failure("mod.py", 9, message)
+    )
+
+
+def test_group_keeps_first_seen_order_and_sums_occurrences() -> None:
+    missing = "ModuleNotFoundError: No module named 'requests'"
+    failures = [
+        _failure("a.py", 1, missing, "IMPORT", occurrences=2),
+        _failure("mod.py", 3, "ValueError: bad value 1"),
+        _failure("b.py", 4, missing, "IMPORT"),
+        _failure("mod.py", 3, "ValueError: bad value 2", occurrences=3),
+    ]
+
+    groups = ErrorParserAgent().group(failures)
+
+    assert [(group.representative.file, group.size) for group in groups] == [("a.py", 3), ("mod.py", 4)]
+    assert groups[0].representative is failures[0]
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+
+from events import EventBroker, RunEventStream, stream_sse
+
+
+def _collect(stream: RunEventStream, since: int = 0, heartbeat_seconds: float = 5) -> list[str]:
+    async def collect() -> list[str]:
+        return [chunk async for chunk in stream_sse(stream, since=since, heartbeat_seconds=heartbeat_seconds)]
+
+    return asyncio.run(collect())
+
+
+def _event_ids(chunks: list[str]) -> list[int]:
+    return [int(chunk.split("\n", 1)[0].removeprefix("id: ")) for chunk in chunks if chunk.startswith("id: ")]
+
+
+def test_sse_replays_everything_for_a_new_subscriber() -> None:
+    stream = RunEventStream("run")
+    stream.publish("run_started", repo_url="u")
+    stream.publish("iteration", iteration=1)
+    stream.close()
+
+    chunks = _collect(stream)
+
+    assert _event_ids(chunks) == [1, 2]
+    assert chunks[0].startswith("id: 1\nevent: run_started\ndata: ")
+    assert json.loads(chunks[0].split("data: ", 1)[1])["repo_url"] == "u"
+
+
+def test_sse_resumes_after_last_event_id() -> None:
+    stream = RunEventStream("run")
+    for iteration in range(1, 5):
+        stream.publish("iteration", iteration=iteration)
+    stream.close()
+
+    assert _event_ids(_collect(stream, since=2)) == [3, 4]
+
+
+def test_sse_follows_events_published_from_another_thread() -> None:
+    stream = RunEventStream("run")
+    stream.publish("run_started")
+
+    def publish_later() -> None:
+        for iteration in range(1, 3):
+            stream.publish("iteration", iteration=iteration)
+        stream.close()
+
+    timer = threading.Timer(0.05, publish_later)
+    timer.start()
+    chunks = _collect(stream, heartbeat_seconds=0.01)
+    timer.join()
+
+    assert _event_ids(chunks) == [1, 2, 3]
+    assert ": keep-alive\n\n" in chunks
+
+
+def test_closed_stream_ignores_new_events() -> None:
+    stream = RunEventStream("run")
+    stream.close()
+    stream.publish("late")
+
+    assert stream.events_since(0) == ([], True)
+
+
+def test_broker_evicts_only_closed_streams() -> None:
+    broker = EventBroker(history_limit=2)
+    broker.open("a").close()
+    broker.open("b")
+    broker.open("c")
+
+    # Over the limit: the oldest closed stream goes, open ones stay.
+    assert broker.get("a") is None
+    assert broker.get("b") is not None and broker.get("c") is not None
+
+    broker.open("d")
+    assert [run_id for run_id in "bcd" if broker.get(run_id)] == ["b", "c", "d"]
+    assert broker.open("b") is broker.get("b")
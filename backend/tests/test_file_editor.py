@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from utils.file_editor import EditBatch, EditSession
+
+
+def _write(path: Path, *lines: str) -> Path:
+    path.write_text("".join(f"{line}\n" for line in lines), encoding="utf-8")
+    return path
+
+
+def test_resolve_follows_inserts_and_removals(tmp_path: Path) -> None:
+    session = EditSession(_write(tmp_path / "a.py", "one", "two", "three", "four"))
+
+    session.insert_line(1, "import os")
+    session.remove_line(session.resolve(2))
+
+    assert session.resolve(1) == 2
+    assert session.resolve(2) is None
+    assert session.resolve(4) == 4
+    assert session.origin(1) is None
+    assert session.origin(3) == 3
+    assert session.touched == {2}
+
+
+def test_update_only_touches_changed_lines(tmp_path: Path) -> None:
+    session = EditSession(_write(tmp_path / "a.py", "def f()", "    pass"))
+
+    session.update_line(2, lambda line: line)
+    assert session.touched == set()
+    assert not session.dirty
+
+    session.update_line(1, lambda line: line.replace(")", "):"))
+    assert session.touched == {1}
+    assert session.dirty
+
+
+def test_commit_writes_once_and_revert_restores(tmp_path: Path) -> None:
+    path = _write(tmp_path / "a.py", "x = 1", "y = 2")
+    session = EditSession(path)
+    session.remove_line(1)
+
+    assert session.commit()
+    assert path.read_text() == "y = 2\n"
+    assert not session.commit()
+
+    session.revert()
+    assert path.read_text() == "x = 1\ny = 2\n"
+    assert session.resolve(1) == 1
+    assert session.touched == set()
+
+
+def test_batch_reads_each_file_once(tmp_path: Path) -> None:
+    path = _write(tmp_path / "a.py", "x = 1")
+    batch = EditBatch()
+
+    assert batch.session(path) is batch.session(path)
+    assert batch.commit() == []
+    batch.session(path).insert_line(1, "import os")
+    assert batch.commit() == [path]
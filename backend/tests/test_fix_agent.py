@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from agents.error_parser_agent import ParsedFailure
+from agents.fix_agent import FixAgent
+from utils.file_editor import EditBatch
+
+
+def _failure(line_number: int, bug_type: str, message: str = "", file: str = "mod.py") -> ParsedFailure:
+    return ParsedFailure(file=file, line_number=line_number, message=message, bug_type=bug_type)
+
+
+def _apply(repo: Path, failures: list[ParsedFailure]) -> list[str]:
+    batch = EditBatch()
+    results = FixAgent().apply_fixes(repo, failures, batch)
+    batch.commit()
+    return [result.status for result in results]
+
+
+def test_fixes_apply_bottom_up_on_original_lines(tmp_path: Path) -> None:
+    (tmp_path / "mod.py").write_text("import os\nimport sys\nx = 1\nimport re\ny = 2\n")
+
+    # Listed top-down: removing line 2 first must not shift line 4.
+    statuses = _apply(tmp_path, [_failure(2, "LINTING"), _failure(4, "LINTING")])
+
+    assert statuses == ["Fixed", "Fixed"]
+    assert (tmp_path / "mod.py").read_text() == "import os\nx = 1\ny = 2\n"
+
+
+def test_conflicting_fixes_on_same_line(tmp_path: Path) -> None:
+    (tmp_path / "mod.py").write_text("def f()\n    return 1\n")
+
+    # Same line: input order decides; the second fix finds the line edited.
+    statuses = _apply(tmp_path, [_failure(1, "SYNTAX"), _failure(1, "LINTING")])
+
+    assert statuses == ["Fixed", "Failed"]
+    assert (tmp_path / "mod.py").read_text() == "def f():\n    return 1\n"
+
+
+def test_removed_line_conflicts_with_later_fix(tmp_path: Path) -> None:
+    (tmp_path / "mod.py").write_text("import os\nimport sys\n\ndef f():\n    return os.sep\n")
+
+    # The unused import is removed; the second fix's anchor is gone, so it
+    # is skipped instead of editing whatever line now sits there.
+    statuses = _apply(tmp_path, [_failure(2, "LINTING"), _failure(2, "SYNTAX")])
+
+    assert statuses == ["Fixed", "Failed"]
+    source = (tmp_path / "mod.py").read_text()
+    assert source == "import os\n\ndef f():\n    return os.sep\n"
+    compile(source, "mod.py", "exec")
+
+
+def test_inserted_import_shifts_later_fixes(tmp_path: Path) -> None:
+    (tmp_path / "mod.py").write_text("x = 1\ndef f()\n    pass\n\ny = requests\n")
+
+    # Bottom-up, the import (reported on line 5) is inserted at the top
+    # first; the SYNTAX fix on original line 2 then edits current line 3.
+    statuses = _apply(
+        tmp_path,
+        [
+            _failure(2, "SYNTAX"),
+            _failure(5, "IMPORT", "ModuleNotFoundError: No module named 'requests'"),
+        ],
+    )
+
+    assert statuses == ["Fixed", "Fixed"]
+    assert (tmp_path / "mod.py").read_text() == (
+        "import requests\nx = 1\ndef f():\n    pass\n\ny = requests\n"
+    )
+
+
+def test_results_follow_input_order(tmp_path: Path) -> None:
+    (tmp_path / "mod.py").write_text("import os\nimport sys\n")
+    (tmp_path / "other.py").write_text("import re\n")
+    failures = [
+        _failure(1, "LINTING", file="other.py"),
+        _failure(1, "LINTING"),
+        _failure(7, "LINTING"),
+        _failure(2, "LOGIC"),
+    ]
+
+    results = FixAgent().apply_fixes(tmp_path, failures, EditBatch())
+
+    assert [(result.file, result.line_number) for result in results] == [
+        (failure.file, failure.line_number) for failure in failures
+    ]
+    assert [result.status for result in results] == ["Fixed", "Fixed", "Failed", "Failed"]
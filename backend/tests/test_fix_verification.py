@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from utils.file_editor import EditSession
+
+
+def _session(tmp_path: Path, source: str) -> EditSession:
+    path = tmp_path / "mod.py"
+    path.write_text(source)
+    return EditSession(path)
+
+
+def test_edit_that_compiles_is_kept(coordinator, tmp_path: Path) -> None:
+    session = _session(tmp_path, "def f()\n    return 1\n")
+    session.update_line(1, lambda line: "def f():\n")
+
+    assert coordinator._verify_compiles("mod.py", session) is None
+
+
+def test_edit_that_breaks_the_file_is_rejected(coordinator, tmp_path: Path) -> None:
+    session = _session(tmp_path, "def f():\n    return 1\n")
+    session.remove_line(1)
+
+    assert coordinator._verify_compiles("mod.py", session).startswith("IndentationError at line 1")
+
+
+def test_fixing_the_first_of_two_syntax_errors_is_kept(coordinator, tmp_path: Path) -> None:
+    session = _session(tmp_path, "def f()\n    return 1\n\ndef g()\n    return 2\n")
+    session.update_line(1, lambda line: "def f():\n")
+
+    assert coordinator._verify_compiles("mod.py", session) is None
+
+
+def test_fix_beside_an_unrelated_syntax_error_is_kept(coordinator, tmp_path: Path) -> None:
+    # The LINTING fix removes line 1; the syntax error on line 4 is untouched.
+    session = _session(tmp_path, "import os\nx = 1\n\ndef g()\n    return x\n")
+    session.remove_line(1)
+
+    assert coordinator._verify_compiles("mod.py", session) is None
+
+
+def test_edit_adding_an_earlier_error_is_rejected(coordinator, tmp_path: Path) -> None:
+    session = _session(tmp_path, "x = 1\ny = 2\n\ndef g()\n    return x\n")
+    session.update_line(2, lambda line: "y = (2\n")
+
+    assert coordinator._verify_compiles("mod.py", session) is not None
+
+
+def test_edit_that_leaves_its_own_error_is_rejected(coordinator, tmp_path: Path) -> None:
+    session = _session(tmp_path, "def f()\n    return 1\n")
+    session.update_line(1, lambda line: "def f() \n")
+
+    assert coordinator._verify_compiles("mod.py", session) is not None
+
+
+def test_non_python_files_are_not_compiled(coordinator, tmp_path: Path) -> None:
+    path = tmp_path / "notes.txt"
+    path.write_text("def f()\n")
+    session = EditSession(path)
+    session.insert_line(1, "(")
+
+    assert coordinator._verify_compiles("notes.txt", session) is None
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import pytest
+
+from agents.git_agent import GitAgent, GitCommitWriter
+
+
+def _fail() -> None:
+    raise RuntimeError("commit failed")
+
+
+@pytest.mark.parametrize("background", [True, False])
+def test_writer_runs_jobs_in_order(background: bool) -> None:
+    done: list[int] = []
+    with GitCommitWriter(background=background) as writer:
+        for number in range(5):
+            writer.submit(lambda number=number: done.append(number))
+        writer.drain()
+
+        assert done == [0, 1, 2, 3, 4]
+
+
+def test_drain_raises_job_error() -> None:
+    writer = GitCommitWriter()
+    writer.submit(_fail)
+
+    with pytest.raises(RuntimeError, match="commit failed"):
+        writer.drain()
+    # The failed job was consumed; later drains are clean.
+    writer.close()
+
+
+def test_exit_raises_job_error() -> None:
+    with pytest.raises(RuntimeError, match="commit failed"):
+        with GitCommitWriter() as writer:
+            writer.submit(_fail)
+
+
+def test_exit_keeps_the_propagating_error() -> None:
+    with pytest.raises(KeyError):
+        with GitCommitWriter() as writer:
+            writer.submit(_fail)
+            raise KeyError("original")
+
+
+def test_commit_files_makes_one_commit_for_all_files(git_repo, git) -> None:
+    repo = git_repo({"a.py": "a = 1\n", "b.py": "b = 1\n", "c.py": "c = 1\n"})
+    (repo / "a.py").write_text("a = 2\n")
+    (repo / "b.py").unlink()
+    agent = GitAgent(repo)
+
+    assert agent.commit_files(["a.py", "b.py"], "Fix 2 issues")
+
+    assert agent.forks == 3
+    assert git(repo, "rev-list", "--count", "HEAD") == "2"
+    assert git(repo, "log", "-1", "--format=%s") == "[AI-AGENT] Fix 2 issues"
+    assert git(repo, "show", "--name-status", "--format=", "HEAD").splitlines() == ["M\ta.py", "D\tb.py"]
+
+
+def test_commit_files_without_changes_commits_nothing(git_repo, git) -> None:
+    repo = git_repo({"a.py": "a = 1\n"})
+    agent = GitAgent(repo)
+
+    assert not agent.commit_files(["a.py"], "Fix nothing")
+    assert not agent.commit_files([], "Fix nothing")
+
+    assert agent.forks == 2
+    assert git(repo, "rev-list", "--count", "HEAD") == "1"
+
+
+def test_commit_fix_commits_only_its_file(git_repo, git) -> None:
+    repo = git_repo({"a.py": "a = 1\n", "b.py": "b = 1\n"})
+    (repo / "a.py").write_text("a = 2\n")
+    (repo / "b.py").write_text("b = 2\n")
+
+    assert GitAgent(repo).commit_fix("a.py", "[AI-AGENT] Fix a")
+
+    assert git(repo, "log", "-1", "--format=%s") == "[AI-AGENT] Fix a"
+    assert git(repo, "status", "--porcelain") == "M b.py"
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from events import EventBroker
+from jobs import (
+    JOB_COMPLETED,
+    JOB_FAILED,
+    JobManager,
+    JobManagerClosedError,
+    JobQueueFullError,
+)
+from run_store import RunStore
+
+
+class FakeCoordinator:
+    """Stands in for AgentCoordinator; ``execute`` blocks until released."""
+
+    def __init__(self, tmp_path: Path) -> None:
+        self.events = EventBroker()
+        self.run_store = RunStore(tmp_path / "runs.sqlite3", legacy_results_path=tmp_path / "missing.json")
+        self.release = threading.Event()
+        self.fail = False
+
+    def execute(self, **kwargs: Any) -> dict[str, Any]:
+        self.release.wait(timeout=5)
+        if self.fail:
+            raise RuntimeError("boom")
+        result = {"run_id": kwargs["run_id"], "end_time": "2026-01-01", "push_status": "pending"}
+        self.run_store.save(result)
+        return result
+
+
+@pytest.fixture
+def coordinator(tmp_path: Path) -> FakeCoordinator:
+    return FakeCoordinator(tmp_path)
+
+
+def _wait_finished(manager: JobManager, job_id: str) -> dict[str, Any]:
+    manager._executor.shutdown(wait=True)
+    job = manager.get(job_id)
+    assert job is not None
+    return job
+
+
+def test_job_completes_with_result(coordinator: FakeCoordinator) -> None:
+    manager = JobManager(coordinator, max_workers=1)
+    coordinator.release.set()
+
+    job = manager.submit("https://example.com/repo.git", "team", "leader")
+    finished = _wait_finished(manager, job["job_id"])
+
+    assert finished["status"] == JOB_COMPLETED
+    assert finished["result"]["run_id"] == job["job_id"]
+
+
+def test_failed_job_reports_error(coordinator: FakeCoordinator) -> None:
+    manager = JobManager(coordinator, max_workers=1)
+    coordinator.fail = True
+    coordinator.release.set()
+
+    job = manager.submit("https://example.com/repo.git", "team", "leader")
+    finished = _wait_finished(manager, job["job_id"])
+
+    assert finished["status"] == JOB_FAILED
+    assert finished["error_message"] == "boom"
+
+
+def test_queue_limit(coordinator: FakeCoordinator) -> None:
+    manager = JobManager(coordinator, max_workers=1, queue_limit=2)
+    manager.submit("u", "t", "l")
+    manager.submit("u", "t", "l")
+
+    with pytest.raises(JobQueueFullError):
+        manager.submit("u", "t", "l")
+
+    coordinator.release.set()
+    manager.shutdown(wait=True)
+
+
+def test_submit_after_shutdown_leaves_no_pending_job(coordinator: FakeCoordinator) -> None:
+    manager = JobManager(coordinator, max_workers=1, queue_limit=1)
+    manager.shutdown()
+
+    with pytest.raises(JobManagerClosedError):
+        manager.submit("u", "t", "l")
+
+    assert manager.list_jobs() == []
+    assert manager._pending == 0
+
+
+def test_pending_push_is_read_from_run_store(coordinator: FakeCoordinator) -> None:
+    manager = JobManager(coordinator, max_workers=1)
+    coordinator.release.set()
+    job = manager.submit("u", "t", "l")
+    _wait_finished(manager, job["job_id"])
+
+    coordinator.run_store.update(job["job_id"], push_status="pushed")
+
+    assert manager.get(job["job_id"])["result"]["push_status"] == "pushed"
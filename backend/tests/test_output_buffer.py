@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import io
+from pathlib import Path
+
+from utils.output_buffer import OutputBuffer, append_output, iter_output_lines
+
+
+def test_tail_is_bounded_and_marks_truncation(tmp_path: Path) -> None:
+    spill = tmp_path / "logs" / "run.log"
+    buffer = OutputBuffer(spill, max_chars=3 * len("line 0\n"))
+    for number in range(10):
+        buffer.write(f"line {number}\n")
+    buffer.close()
+
+    text = buffer.text()
+
+    assert text.endswith("line 7\nline 8\nline 9\n")
+    assert text.startswith(f"[... {buffer.dropped_chars} earlier characters truncated (full log: {spill})]\n")
+    assert buffer.dropped_chars == 7 * len("line 0\n")
+
+
+def test_spill_keeps_the_full_output(tmp_path: Path) -> None:
+    spill = tmp_path / "run.log"
+    buffer = OutputBuffer(spill, max_chars=10)
+    buffer.consume(io.StringIO("".join(f"line {number}\r\n" for number in range(100))))
+    buffer.close()
+
+    lines = list(iter_output_lines(buffer.text(), spill))
+
+    assert lines == [f"line {number}" for number in range(100)]
+
+
+def test_without_spill_lines_come_from_the_tail() -> None:
+    buffer = OutputBuffer(max_chars=1000)
+    buffer.write("a\nb\n")
+
+    assert buffer.text() == "a\nb\n"
+    assert list(iter_output_lines(buffer.text(), None)) == ["a", "b"]
+
+
+def test_huge_line_is_read_in_chunks(tmp_path: Path) -> None:
+    buffer = OutputBuffer(tmp_path / "run.log", max_chars=100_000)
+    buffer.consume(io.StringIO("x" * 200_000 + "\nend\n"))
+    buffer.close()
+
+    # The tail keeps whole chunks; the spill file has everything.
+    assert buffer.text().endswith("x\nend\n")
+    assert buffer.dropped_chars > 0
+    assert (tmp_path / "run.log").read_text() == "x" * 200_000 + "\nend\n"
+
+
+def test_append_output_extends_the_spill_file(tmp_path: Path) -> None:
+    spill = tmp_path / "run.log"
+    spill.write_text("first")
+
+    append_output(spill, "timed out")
+    append_output(None, "ignored")
+
+    assert list(iter_output_lines("", spill)) == ["first", "timed out"]
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import pytest
+
+from agents.error_parser_agent import ErrorParserAgent
+from utils.bug_mapper import map_error_to_bug_type
+from utils.output_parsers import (
+    PARSERS,
+    OutputParser,
+    RawFailure,
+    detect_format,
+    get_parser,
+    register_parser,
+)
+
+PYTEST_OUTPUT = [
+    "============================= test session starts ==============================",
+    "collected 1 item",
+    "",
+    "tests/test_mod.py F",
+    "=================================== FAILURES ===================================",
+    "mod.py:3: in add",
+    "E   TypeError: unsupported operand type(s) for +: 'int' and 'str'",
+]
+
+TRACEBACK_OUTPUT = [
+    "Traceback (most recent call last):",
+    '  File "/usr/lib/python3.11/runpy.py", line 198, in _run_module_as_main',
+    '  File "mod.py", line 7, in <module>',
+    "NameError: name 'x' is not defined",
+]
+
+
+def _names(lines: list[str]) -> str:
+    parser, _ = detect_format(lines)
+    return parser.name
+
+
+def test_detects_each_builtin_format() -> None:
+    assert _names(PYTEST_OUTPUT) == "pytest"
+    assert _names(TRACEBACK_OUTPUT) == "traceback"
+    assert _names(["mod.py:1:1: F401 'os' imported but unused"]) == "lint"
+    assert _names(["mod.py:4: error: Incompatible types  [assignment]"]) == "mypy"
+    assert _names(["nothing to see here"]) == "pytest"
+
+
+def test_pytest_signature_beats_an_earlier_traceback() -> None:
+    # A warning's traceback printed before the session header must not
+    # switch the whole run to the traceback parser.
+    lines = TRACEBACK_OUTPUT + PYTEST_OUTPUT
+
+    assert _names(lines) == "pytest"
+
+
+def test_detect_replays_inspected_lines() -> None:
+    def stream() -> Iterator[str]:
+        yield from TRACEBACK_OUTPUT + PYTEST_OUTPUT
+
+    _, lines = detect_format(stream(), window=3)
+
+    assert list(lines) == TRACEBACK_OUTPUT + PYTEST_OUTPUT
+
+
+def test_unknown_format_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        get_parser("no-such-format")
+
+
+def test_registered_parser_is_detected_and_used(tmp_path: Path) -> None:
+    @register_parser
+    class TodoParser(OutputParser):
+        name = "todo"
+        priority = 5
+
+        @classmethod
+        def detect(cls, line: str) -> bool:
+            return line.startswith("TODO ")
+
+        def feed(self, line: str) -> Iterable[RawFailure]:
+            file, _, rest = line[5:].partition(":")
+            number, _, message = rest.partition(" ")
+            return (RawFailure(file=file, line_number=int(number), message=message),)
+
+    try:
+        (tmp_path / "mod.py").write_text("x = 1\n")
+        failures = ErrorParserAgent().parse(["TODO mod.py:1 SyntaxError: expected ':'"], tmp_path)
+    finally:
+        del PARSERS["todo"]
+
+    assert [(failure.file, failure.line_number) for failure in failures] == [("mod.py", 1)]
+
+
+def test_parse_keeps_pytest_locations(tmp_path: Path) -> None:
+    (tmp_path / "mod.py").write_text("x = 1\n")
+
+    failures = ErrorParserAgent().parse(TRACEBACK_OUTPUT[:1] + PYTEST_OUTPUT, tmp_path)
+
+    assert [(failure.file, failure.line_number) for failure in failures] == [("mod.py", 3)]
+
+
+@pytest.mark.parametrize(
+    ("lines", "bug_type", "pattern"),
+    [
+        (["mod.py:1:1: F401 'os' imported but unused"], "LINTING", "imported but unused"),
+        (
+            ['  File "mod.py", line 1', "TabError: inconsistent use of tabs and spaces in indentation"],
+            "INDENTATION",
+            "TabError",
+        ),
+        (
+            ['mod.py:1: error: Incompatible types in assignment (expression has type "str", '
+             'variable has type "int")  [assignment]'],
+            "TYPE_ERROR",
+            "incompatible type",
+        ),
+        (
+            ['mod.py:1: error: Unsupported operand types for + ("int" and "str")  [operator]'],
+            "TYPE_ERROR",
+            "Unsupported operand",
+        ),
+    ],
+)
+def test_new_formats_map_through_their_bug_rules(
+    tmp_path: Path, lines: list[str], bug_type: str, pattern: str
+) -> None:
+    # Each of these built-in rules was added for one of the new formats.
+    (tmp_path / "mod.py").write_text("x = 1\n")
+
+    (failure,) = ErrorParserAgent().parse(lines, tmp_path)
+
+    assert failure.bug_type == bug_type
+    assert map_error_to_bug_type(failure.message).matched_pattern == pattern
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from agents.preflight_agent import PreflightAgent, compile_source
+from utils.bug_mapper import map_error_to_bug_type
+
+MATCH_STATEMENT = "match x:\n    case 1:\n        pass\n"
+
+
+def _repo(tmp_path: Path) -> Path:
+    (tmp_path / "ok.py").write_text("def f():\n    return 1\n")
+    (tmp_path / "syntax.py").write_text("def f()\n    return 1\n")
+    (tmp_path / "indent.py").write_text("def f():\nreturn 1\n")
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "mod.py").write_text("x = 1\n")
+    (tmp_path / ".venv").mkdir()
+    (tmp_path / ".venv" / "broken.py").write_text("def (\n")
+    return tmp_path
+
+
+def _summary(failures) -> list[tuple[str, int, str]]:
+    return [(failure.file, failure.line_number, failure.bug_type) for failure in failures]
+
+
+def test_python_files_skip_third_party_dirs(tmp_path: Path) -> None:
+    assert PreflightAgent().python_files(_repo(tmp_path)) == [
+        "indent.py",
+        "ok.py",
+        "pkg/mod.py",
+        "syntax.py",
+    ]
+
+
+@pytest.mark.parametrize("parallel_min_files", [1, 1000])
+def test_check_reports_syntax_and_indentation(tmp_path: Path, parallel_min_files: int) -> None:
+    failures = PreflightAgent(parallel_min_files=parallel_min_files).check(_repo(tmp_path))
+
+    assert _summary(failures) == [("indent.py", 2, "INDENTATION"), ("syntax.py", 1, "SYNTAX")]
+    assert failures[1].message == "SyntaxError: expected ':'"
+
+
+def test_check_only_given_files(tmp_path: Path) -> None:
+    failures = PreflightAgent().check(_repo(tmp_path), ["ok.py", "syntax.py"])
+
+    assert _summary(failures) == [("syntax.py", 1, "SYNTAX")]
+
+
+def test_compile_source_parses_for_the_sandbox_version() -> None:
+    assert compile_source(MATCH_STATEMENT, "mod.py", target=(3, 10)) is None
+    assert compile_source(MATCH_STATEMENT, "mod.py", target=(3, 9)) == (
+        "SyntaxError",
+        3,
+        "Pattern matching is only supported in Python 3.10 and greater",
+    )
+
+
+def test_host_older_than_sandbox_only_reports_indentation() -> None:
+    assert compile_source("def f()\n    return 1\n", "mod.py", target=(3, 99)) is None
+    assert compile_source("def f():\nreturn 1\n", "mod.py", target=(3, 99))[0] == "IndentationError"
+
+
+def test_compiler_colon_message_maps_to_syntax() -> None:
+    # Python 3.10+ says "expected ':'" where older versions said "invalid
+    # syntax"; the built-in rule added for the preflight covers it.
+    mapped = map_error_to_bug_type("SyntaxError: expected ':'")
+
+    assert (mapped.bug_type, mapped.matched_pattern) == ("SYNTAX", "expected ':'")
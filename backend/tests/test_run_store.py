@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import base64
+import threading
+from pathlib import Path
+
+import pytest
+
+from run_store import InvalidCursorError, RunStore, encode_cursor
+
+
+def _store(tmp_path: Path) -> RunStore:
+    return RunStore(tmp_path / "runs.sqlite3", legacy_results_path=tmp_path / "missing.json")
+
+
+def _run(run_id: str, end_time: str, **fields: object) -> dict:
+    return {"run_id": run_id, "end_time": end_time, "team_name": "t", "final_status": "PASSED", **fields}
+
+
+def test_pages_cover_every_run_once(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    # Two runs share a timestamp; the run id breaks the tie.
+    for run_id, end_time in [("a", "2026-01-01"), ("b", "2026-01-02"), ("c", "2026-01-02"), ("d", "2026-01-03")]:
+        store.save(_run(run_id, end_time))
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        runs, cursor = store.query(limit=2, cursor=cursor)
+        seen.extend(run["run_id"] for run in runs)
+        if cursor is None:
+            break
+
+    assert seen == ["d", "c", "b", "a"]
+
+
+def test_last_full_page_has_no_cursor(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    store.save(_run("a", "2026-01-01"))
+    store.save(_run("b", "2026-01-02"))
+
+    runs, cursor = store.query(limit=2)
+
+    assert [run["run_id"] for run in runs] == ["b", "a"]
+    assert cursor is None
+
+
+def test_cursor_combines_with_filters(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    store.save(_run("a", "2026-01-01", final_status="FAILED"))
+    store.save(_run("b", "2026-01-02"))
+    store.save(_run("c", "2026-01-03", final_status="FAILED"))
+
+    runs, cursor = store.query(status="FAILED", cursor=encode_cursor("2026-01-03", "c"))
+
+    assert [run["run_id"] for run in runs] == ["a"]
+    assert cursor is None
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not base64!",
+        base64.urlsafe_b64encode(b"not json").decode(),
+        base64.urlsafe_b64encode(b"[1, 2, 3]").decode(),
+        base64.urlsafe_b64encode(b"7").decode(),
+        "café",
+    ],
+)
+def test_invalid_cursor_is_rejected(tmp_path: Path, cursor: str) -> None:
+    with pytest.raises(InvalidCursorError):
+        _store(tmp_path).query(cursor=cursor)
+
+
+def test_update_merges_into_stored_payload(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    result = _run("a", "2026-01-01", push_status="pending")
+    store.save(result)
+
+    store.update("a", push_status="pushed")
+
+    assert store.get("a")["push_status"] == "pushed"
+    assert store.latest()["push_status"] == "pushed"
+    assert result["push_status"] == "pending"
+    assert store.update("missing", push_status="pushed") is None
+
+
+def test_concurrent_updates_keep_every_field(tmp_path: Path) -> None:
+    store = _store(tmp_path)
+    store.save(_run("a", "2026-01-01"))
+
+    def update(writer: int) -> None:
+        for number in range(100):
+            store.update("a", **{f"field_{writer}_{number}": number})
+
+    threads = [threading.Thread(target=update, args=(writer,)) for writer in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stored = store.get("a")
+    assert all(f"field_{writer}_{number}" in stored for writer in range(8) for number in range(100))
+    assert store.latest() == stored
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import json
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from utils.sandbox_images import SandboxImageCache
+
+STEPS = ["python -m pip install -q --upgrade pip pytest", "python -m pip install -q -r requirements.txt"]
+
+
+class FakeDocker:
+    """Stands in for ``SandboxImageCache._docker``: a local image store."""
+
+    def __init__(self) -> None:
+        self.images: dict[str, int] = {}
+        self.in_use: set[str] = set()
+        self.next_size = 0
+
+    def __call__(self, args: list[str], timeout: int = 60) -> subprocess.CompletedProcess:
+        if args[:2] == ["image", "inspect"]:
+            tag = args[-1]
+            if tag not in self.images:
+                return subprocess.CompletedProcess(args, 1, "", "No such image")
+            return subprocess.CompletedProcess(args, 0, f"{self.images[tag]}\n", "")
+        if args[0] == "commit":
+            self.images[args[2]] = self.next_size
+            return subprocess.CompletedProcess(args, 0, "", "")
+        if args[:2] == ["image", "rm"]:
+            if args[2] in self.in_use:
+                return subprocess.CompletedProcess(args, 1, "", "image is being used")
+            self.images.pop(args[2], None)
+            return subprocess.CompletedProcess(args, 0, "", "")
+        raise AssertionError(f"unexpected docker call: {args}")
+
+
+@pytest.fixture
+def docker(monkeypatch: pytest.MonkeyPatch) -> FakeDocker:
+    # A strictly increasing clock, so "least recently used" is unambiguous.
+    clock = iter(range(1, 10**6))
+    monkeypatch.setattr("utils.sandbox_images.time.time", lambda: next(clock))
+    return FakeDocker()
+
+
+def _cache(tmp_path: Path, docker: FakeDocker, **kwargs: int) -> SandboxImageCache:
+    cache = SandboxImageCache(index_path=tmp_path / "images.json", repository="sandbox", **kwargs)
+    cache._docker = docker  # type: ignore[method-assign]
+    return cache
+
+
+def _save(cache: SandboxImageCache, docker: FakeDocker, tag: str, size: int) -> None:
+    docker.next_size = size
+    assert cache.save("container", tag)
+
+
+def test_tag_is_a_deterministic_dependency_hash(tmp_path: Path, docker: FakeDocker) -> None:
+    cache = _cache(tmp_path, docker)
+    (tmp_path / "requirements.txt").write_text("requests==2.31.0\n")
+
+    tag = cache.tag_for(tmp_path, "python:3.11-slim", STEPS, ["requirements.txt", "missing.txt"])
+
+    assert tag.startswith("sandbox:") and len(tag.split(":")[1]) == 16
+    assert tag == cache.tag_for(tmp_path, "python:3.11-slim", STEPS, ["requirements.txt", "missing.txt"])
+    # Unrelated repo files don't change the tag; dependencies do.
+    (tmp_path / "mod.py").write_text("x = 1\n")
+    assert tag == cache.tag_for(tmp_path, "python:3.11-slim", STEPS, ["requirements.txt", "missing.txt"])
+    assert tag != cache.tag_for(tmp_path, "python:3.12-slim", STEPS, ["requirements.txt", "missing.txt"])
+    assert tag != cache.tag_for(tmp_path, "python:3.11-slim", STEPS[:1], ["requirements.txt", "missing.txt"])
+    (tmp_path / "requirements.txt").write_text("requests==2.32.0\n")
+    assert tag != cache.tag_for(tmp_path, "python:3.11-slim", STEPS, ["requirements.txt", "missing.txt"])
+
+
+def test_lookup_tracks_existing_images(tmp_path: Path, docker: FakeDocker) -> None:
+    cache = _cache(tmp_path, docker)
+    docker.images["sandbox:known"] = 5
+
+    assert cache.lookup("sandbox:known")
+    assert not cache.lookup("sandbox:missing")
+
+    index = json.loads((tmp_path / "images.json").read_text())
+    assert list(index) == ["sandbox:known"]
+    assert index["sandbox:known"]["size_bytes"] == 5
+
+
+def test_lookup_forgets_images_removed_outside_the_cache(tmp_path: Path, docker: FakeDocker) -> None:
+    cache = _cache(tmp_path, docker)
+    _save(cache, docker, "sandbox:a", 1)
+    del docker.images["sandbox:a"]
+
+    assert not cache.lookup("sandbox:a")
+    assert json.loads((tmp_path / "images.json").read_text()) == {}
+
+
+def test_eviction_respects_the_byte_budget_lru_first(tmp_path: Path, docker: FakeDocker) -> None:
+    cache = _cache(tmp_path, docker, budget_bytes=100, max_images=10)
+    _save(cache, docker, "sandbox:a", 40)
+    _save(cache, docker, "sandbox:b", 40)
+    assert cache.lookup("sandbox:a")  # a is now more recent than b
+
+    _save(cache, docker, "sandbox:c", 40)
+
+    assert sorted(docker.images) == ["sandbox:a", "sandbox:c"]
+    index = json.loads((tmp_path / "images.json").read_text())
+    assert sum(entry["size_bytes"] for entry in index.values()) <= 100
+
+
+def test_eviction_keeps_the_new_image_and_images_in_use(tmp_path: Path, docker: FakeDocker) -> None:
+    cache = _cache(tmp_path, docker, budget_bytes=100, max_images=10)
+    _save(cache, docker, "sandbox:busy", 60)
+    docker.in_use.add("sandbox:busy")
+
+    _save(cache, docker, "sandbox:huge", 150)
+
+    # Over budget, but the running sandbox's image can't go and the new
+    # one is always kept.
+    assert sorted(docker.images) == ["sandbox:busy", "sandbox:huge"]
+    assert sorted(json.loads((tmp_path / "images.json").read_text())) == ["sandbox:busy", "sandbox:huge"]
+
+
+def test_eviction_respects_the_image_count(tmp_path: Path, docker: FakeDocker) -> None:
+    cache = _cache(tmp_path, docker, budget_bytes=10**9, max_images=2)
+    for name in "abc":
+        _save(cache, docker, f"sandbox:{name}", 1)
+
+    assert sorted(docker.images) == ["sandbox:b", "sandbox:c"]
@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+
+from agents import test_runner_agent as runner
+
+
+def _log_dir(logs_dir: Path, name: str, age: float) -> Path:
+    path = logs_dir / name
+    path.mkdir(parents=True)
+    (path / "001_sandboxed_pytest.log").write_text("output\n")
+    stamp = time.time() - age
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+def test_prune_keeps_newest_closed_dirs(tmp_path: Path) -> None:
+    for age, name in enumerate(["newest", "newer", "old", "oldest"]):
+        _log_dir(tmp_path, name, age * 60)
+
+    runner._prune_log_dirs(tmp_path, keep=2)
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["newer", "newest"]
+
+
+def test_prune_skips_live_sessions(tmp_path: Path) -> None:
+    _log_dir(tmp_path, "closed", 0)
+    live = _log_dir(tmp_path, "live", 3600)
+    (live / runner.LIVE_MARKER).touch()
+    os.utime(live, (time.time() - 3600,) * 2)
+
+    runner._prune_log_dirs(tmp_path, keep=0)
+
+    assert [path.name for path in tmp_path.iterdir()] == ["live"]
+
+
+def test_prune_ignores_stale_live_markers(tmp_path: Path) -> None:
+    crashed = _log_dir(tmp_path, "crashed", 0)
+    marker = crashed / runner.LIVE_MARKER
+    marker.touch()
+    stale = time.time() - runner.LIVE_MARKER_STALE_SECONDS - 1
+    os.utime(marker, (stale, stale))
+
+    runner._prune_log_dirs(tmp_path, keep=0)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_session_is_live_until_closed(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(runner, "SANDBOX_LOGS_DIR", tmp_path / "logs")
+    monkeypatch.setattr(runner, "SANDBOX_REPORTS_DIR", tmp_path / "reports")
+    monkeypatch.setattr(runner, "SANDBOX_LOG_RETENTION", 0)
+    first = runner.SandboxSession(tmp_path, "first")
+    second = runner.SandboxSession(tmp_path, "second")
+    first._next_log_path("Sandboxed pytest").write_text("first\n")
+    second._next_log_path("Sandboxed pytest").write_text("second\n")
+
+    first.close()
+
+    # With no retention the closed session's logs go; the open one's stay.
+    assert [path.name for path in (tmp_path / "logs").iterdir()] == ["second"]
+    second.close()
+    assert list((tmp_path / "logs").iterdir()) == []
+
+
+def _fake_docker(tmp_path: Path, monkeypatch, script: str) -> Path:
+    """Put a ``docker`` running ``script`` first on PATH; returns the file
+    its invocations are appended to, one per line."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    calls = tmp_path / "docker_calls"
+    docker = bin_dir / "docker"
+    docker.write_text(f'#!/bin/sh\necho "$*" >> {calls}\n{script}\n')
+    docker.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setattr(runner, "SANDBOX_LOGS_DIR", tmp_path / "logs")
+    monkeypatch.setattr(runner, "SANDBOX_REPORTS_DIR", tmp_path / "reports")
+    monkeypatch.setattr(runner, "SANDBOX_IMAGE_CACHE_ENABLED", False)
+    return calls
+
+
+def _commands(calls: Path) -> list[str]:
+    """Each docker invocation as "<subcommand> <container or image>"."""
+    commands = []
+    for line in calls.read_text().splitlines():
+        args = line.split()
+        if args[0] == "run":
+            commands.append(f"run {args[args.index('--name') + 1]}")
+        elif args[0] == "exec":
+            commands.append(f"exec {args[3]}")
+        else:
+            commands.append(" ".join(args[:3]))
+    return commands
+
+
+def test_one_shot_run_parses_output_beyond_the_memory_tail(tmp_path: Path, monkeypatch) -> None:
+    # The failure is printed first, then far more than the in-memory tail.
+    _fake_docker(
+        tmp_path,
+        monkeypatch,
+        "echo 'FAILED tests/test_a.py::test_early - AssertionError'\n"
+        f"yes 'noise line' | head -c {2 * runner.OutputBuffer().max_chars}\n"
+        "exit 1",
+    )
+
+    result = runner.TestRunnerAgent().run(tmp_path, ["tests/test_a.py"])
+
+    assert not result.passed
+    assert "FAILED tests/test_a.py::test_early" not in result.output
+    assert result.failed_tests == ["tests/test_a.py::test_early"]
+    assert result.log_path is not None and result.log_path.exists()
+    assert not (result.log_path.parent / runner.LIVE_MARKER).exists()
+
+
+FAKE_PYTEST = """case "$*" in
+  *"-m pytest"*) echo 'FAILED tests/test_a.py::test_a - AssertionError'; exit 1;;
+esac"""
+
+
+def test_session_reuses_one_container(tmp_path: Path, monkeypatch) -> None:
+    calls = _fake_docker(tmp_path, monkeypatch, FAKE_PYTEST)
+    agent = runner.TestRunnerAgent()
+
+    with agent.session(tmp_path, "run1") as session:
+        first = agent.run(tmp_path, ["tests/test_a.py"], session=session)
+        second = agent.run(tmp_path, ["tests/test_a.py"], session=session)
+        name = session.name
+
+    assert first.failed_tests == second.failed_tests == ["tests/test_a.py::test_a"]
+    # One container: started once, one exec to install, one per test pass.
+    assert _commands(calls) == [
+        f"run {name}",
+        f"exec {name}",
+        f"exec {name}",
+        f"exec {name}",
+        f"rm -f {name}",
+    ]
+    assert "pip install" in calls.read_text().splitlines()[1]
+
+
+def test_session_reports_setup_failure_and_skips_tests(tmp_path: Path, monkeypatch) -> None:
+    calls = _fake_docker(
+        tmp_path, monkeypatch, 'case "$*" in\n  *pip*) echo "No matching distribution"; exit 1;;\nesac'
+    )
+    agent = runner.TestRunnerAgent()
+
+    with agent.session(tmp_path, "run1") as session:
+        result = agent.run(tmp_path, ["tests/test_a.py"], session=session)
+        again = agent.run(tmp_path, ["tests/test_a.py"], session=session)
+
+    assert not result.passed and "No matching distribution" in result.output
+    assert again is result
+    assert not any("-m pytest" in line for line in calls.read_text().splitlines())
+
+
+def test_session_removes_nothing_if_never_started(tmp_path: Path, monkeypatch) -> None:
+    calls = _fake_docker(tmp_path, monkeypatch, "exit 0")
+
+    runner.SandboxSession(tmp_path, "never").close()
+
+    assert not calls.exists()
+
+
+class CachedImage:
+    """An image cache that always has the repo's dependencies."""
+
+    def tag_for(self, repo_path: Path, base_image: str, install_steps: list[str], files: list[str]) -> str:
+        return "rift2026-sandbox:cached"
+
+    def lookup(self, tag: str) -> bool:
+        return True
+
+
+def test_session_from_cached_image_skips_installation(tmp_path: Path, monkeypatch) -> None:
+    calls = _fake_docker(tmp_path, monkeypatch, FAKE_PYTEST)
+    agent = runner.TestRunnerAgent(image_cache=CachedImage())
+
+    with agent.session(tmp_path, "run1") as session:
+        agent.run(tmp_path, ["tests/test_a.py"], session=session)
+        name = session.name
+
+    lines = calls.read_text().splitlines()
+    assert _commands(calls) == [f"run {name}", f"exec {name}", f"rm -f {name}"]
+    assert lines[0].split()[-3:] == ["rift2026-sandbox:cached", "sleep", "infinity"]
+    assert "pip install" not in calls.read_text()
+
+
+def _write_repo(repo: Path, files: dict[str, str]) -> list[str]:
+    for name, text in files.items():
+        (repo / name).parent.mkdir(parents=True, exist_ok=True)
+        (repo / name).write_text(text)
+    return sorted(name for name in files if Path(name).name.startswith("test_"))
+
+
+def test_affected_tests_follow_imports_of_edited_modules(tmp_path: Path) -> None:
+    tests = _write_repo(
+        tmp_path,
+        {
+            "app/calc.py": "def add(a, b):\n    return a + b\n",
+            "app/__init__.py": "",
+            "tests/test_calc.py": "from app.calc import add\n",
+            "tests/test_calc_module.py": "import app.calc as calc\n",
+            "tests/test_short.py": "from calc import add\n",
+            "tests/test_other.py": "import os\n# calc is mentioned, not imported\n",
+            "tests/test_edited.py": "def test_x():\n    pass\n",
+        },
+    )
+
+    affected = runner.TestRunnerAgent().affected_tests(
+        tmp_path, tests, {"app/calc.py", "tests/test_edited.py"}
+    )
+
+    assert affected == [
+        "tests/test_calc.py",
+        "tests/test_calc_module.py",
+        "tests/test_edited.py",
+        "tests/test_short.py",
+    ]
+
+
+def test_affected_tests_for_a_package_and_non_python_edits(tmp_path: Path) -> None:
+    tests = _write_repo(
+        tmp_path,
+        {
+            "app/__init__.py": "VERSION = 1\n",
+            "tests/test_app.py": "from app import VERSION\n",
+            "tests/test_unrelated.py": "import json\n",
+        },
+    )
+    agent = runner.TestRunnerAgent()
+
+    assert agent.affected_tests(tmp_path, tests, {"app/__init__.py"}) == ["tests/test_app.py"]
+    assert agent.affected_tests(tmp_path, tests, {"README.md", "setup.cfg"}) == []
+    assert agent.affected_tests(tmp_path, tests, set()) == []
+
+
+def _report_line(nodeid: str, outcome: str, **fields: object) -> str:
+    return json.dumps({"nodeid": nodeid, "outcome": outcome, "when": "call", **fields})
+
+
+def test_read_report_skips_a_torn_final_line(tmp_path: Path) -> None:
+    report = tmp_path / "report.jsonl"
+    report.write_text(
+        _report_line("tests/test_a.py::test_ok", "passed")
+        + "\n"
+        + _report_line(
+            "tests/test_a.py::test_bad",
+            "failed",
+            file="app/calc.py",
+            line=3,
+            exception_type="TypeError",
+            message="unsupported operand",
+        )
+        + "\n"
+        # The run was killed while writing this line.
+        + '{"nodeid": "tests/test_a.py::test_cut", "outc'
+    )
+
+    results = runner._read_report(report)
+
+    assert [(case.nodeid, case.outcome) for case in results] == [
+        ("tests/test_a.py::test_ok", "passed"),
+        ("tests/test_a.py::test_bad", "failed"),
+    ]
+    assert (results[1].file, results[1].line, results[1].exception_type) == ("app/calc.py", 3, "TypeError")
+    assert runner._read_report(tmp_path / "missing.jsonl") == []
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from tracing import SpanRecorder, to_chrome_trace, trace_span
+
+
+def test_spans_past_the_cap_are_counted_as_dropped() -> None:
+    tracer = SpanRecorder(max_spans=3)
+    for index in range(5):
+        with tracer.span(f"step {index}", "test"):
+            pass
+
+    assert [span["name"] for span in tracer.spans()] == ["step 0", "step 1", "step 2"]
+    assert tracer.dropped == 2
+
+
+def test_span_records_late_args_and_errors() -> None:
+    tracer = SpanRecorder()
+    with tracer.span("parse", "parse", iteration=1) as span:
+        span["failures"] = 4
+    with pytest.raises(ValueError):
+        with tracer.span("push", "git"):
+            raise ValueError("rejected")
+
+    parsed, pushed = tracer.spans()
+    assert parsed["args"] == {"iteration": 1, "failures": 4}
+    assert pushed["args"] == {"status": "error"}
+    assert parsed["start_ms"] <= pushed["start_ms"]
+
+
+def test_trace_span_without_a_tracer_records_nothing() -> None:
+    with trace_span(None, "clone", "clone", repo="r") as span:
+        span["files"] = 1
+
+    assert span == {"repo": "r", "files": 1}
+
+
+def test_chrome_trace_has_one_track_per_thread() -> None:
+    tracer = SpanRecorder()
+    with tracer.span("test", "test", iteration=1):
+        pass
+
+    def commit() -> None:
+        with tracer.span("commit", "git"):
+            pass
+
+    worker = threading.Thread(target=commit, name="writer")
+    worker.start()
+    worker.join()
+    spans = tracer.spans() + [
+        {"name": "push", "cat": "git", "start_ms": 1.5, "duration_ms": 2.25, "thread": "MainThread", "args": {}}
+    ]
+
+    trace = to_chrome_trace("run-1", spans)
+
+    events = trace["traceEvents"]
+    assert trace["displayTimeUnit"] == "ms"
+    assert events[0] == {"ph": "M", "name": "process_name", "pid": 1, "args": {"name": "run run-1"}}
+    threads = {event["args"]["name"]: event["tid"] for event in events if event["name"] == "thread_name"}
+    assert threads == {"MainThread": 1, "writer": 2}
+    complete = [event for event in events if event["ph"] == "X"]
+    assert [(event["name"], event["tid"]) for event in complete] == [
+        ("test", 1),
+        ("commit", 2),
+        ("push", 1),
+    ]
+    assert complete[0]["args"] == {"iteration": 1}
+    assert (complete[2]["ts"], complete[2]["dur"]) == (1500, 2250)
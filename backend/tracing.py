@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager, Iterator
+
+try:
+    from .config import TRACE_MAX_SPANS
+except ImportError:
+    from config import TRACE_MAX_SPANS  # type: ignore
+
+
+class SpanRecorder:
+    """Timing spans of one run, from any thread.
+
+    A span is a plain dict (``name``, ``cat``, ``start_ms`` from the start of
+    the run, ``duration_ms``, ``thread``, ``args``) so spans are stored with
+    the run result as they are. Spans past ``max_spans`` are counted in
+    ``dropped`` instead of kept.
+    """
+
+    def __init__(self, max_spans: int = TRACE_MAX_SPANS) -> None:
+        self.origin = time.perf_counter()
+        self.max_spans = max_spans
+        self.dropped = 0
+        self._spans: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, category: str, **args: Any) -> Iterator[dict[str, Any]]:
+        """Time the block; the yielded dict collects extra ``args`` known
+        only once the work is done (e.g. a result count)."""
+        started = time.perf_counter()
+        status = "error"
+        try:
+            yield args
+            status = "ok"
+        finally:
+            if status != "ok":
+                args["status"] = status
+            self._record(name, category, started, time.perf_counter(), args)
+
+    def _record(
+        self, name: str, category: str, started: float, finished: float, args: dict[str, Any]
+    ) -> None:
+        span = {
+            "name": name,
+            "cat": category,
+            "start_ms": round((started - self.origin) * 1000, 3),
+            "duration_ms": round((finished - started) * 1000, 3),
+            "thread": threading.current_thread().name,
+            "args": args,
+        }
+        with self._lock:
+            if len(self._spans) >= self.max_spans:
+                self.dropped += 1
+                return
+            self._spans.append(span)
+
+    def spans(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return sorted(self._spans, key=lambda span: span["start_ms"])
+
+
+def trace_span(
+    tracer: SpanRecorder | None, name: str, category: str, **args: Any
+) -> ContextManager[dict[str, Any]]:
+    """``tracer.span(...)``, or a no-op when the caller was given no tracer."""
+    if tracer is None:
+        return nullcontext(args)
+    return tracer.span(name, category, **args)
+
+
+def to_chrome_trace(run_id: str, spans: list[dict[str, Any]]) -> dict[str, Any]:
+    """Spans as Chrome trace-event JSON, loadable in chrome://tracing and
+    ui.perfetto.dev: one complete ("X") event per span, one track per
+    thread."""
+    thread_ids: dict[str, int] = {}
+    events: list[dict[str, Any]] = [
+        {"ph": "M", "name": "process_name", "pid": 1, "args": {"name": f"run {run_id}"}}
+    ]
+    for span in spans:
+        thread = span.get("thread") or "main"
+        tid = thread_ids.get(thread)
+        if tid is None:
+            tid = thread_ids[thread] = len(thread_ids) + 1
+            events.append(
+                {"ph": "M", "name": "thread_name", "pid": 1, "tid": tid, "args": {"name": thread}}
+            )
+        events.append(
+            {
+                "ph": "X",
+                "name": span["name"],
+                "cat": span.get("cat", ""),
+                "ts": round(span["start_ms"] * 1000),
+                "dur": round(span["duration_ms"] * 1000),
+                "pid": 1,
+                "tid": tid,
+                "args": span.get("args", {}),
+            }
+        )
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
@@ -1,20 +1,44 @@
 # backend>utils>bug_mapper.py
 from __future__ import annotations
 
+import json
+import threading
 from dataclasses import dataclass
-from typing import Iterable
+from pathlib import Path
+from typing import Any, Iterable
 
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None  # type: ignore
 
+try:
+    from ..config import BUG_RULE_PACKS
+except ImportError:
+    from config import BUG_RULE_PACKS  # type: ignore
+
+
+# Built-in rules, earliest first among equal priorities.
 ERROR_RULES = [
     {"pattern": "unused import", "bug_type": "LINTING"},
+    {"pattern": "imported but unused", "bug_type": "LINTING"},
     {"pattern": "Missing colon", "bug_type": "SYNTAX"},
+    {"pattern": "expected ':'", "bug_type": "SYNTAX"},
     {"pattern": "IndentationError", "bug_type": "INDENTATION"},
+    {"pattern": "TabError", "bug_type": "INDENTATION"},
     {"pattern": "ModuleNotFoundError", "bug_type": "IMPORT"},
     {"pattern": "TypeError", "bug_type": "TYPE_ERROR"},
+    {"pattern": "incompatible type", "bug_type": "TYPE_ERROR"},
+    {"pattern": "Unsupported operand", "bug_type": "TYPE_ERROR"},
+    # Only decides when nothing more specific matched.
+    {"pattern": "assert", "bug_type": "LOGIC", "priority": 1000},
 ]
 
 ALLOWED_BUG_TYPES = {"LINTING", "SYNTAX", "LOGIC", "TYPE_ERROR", "IMPORT", "INDENTATION"}
 
+# Lower wins. Rule packs can go below this to override the built-ins.
+DEFAULT_RULE_PRIORITY = 100
+
 
 @dataclass
 class MappedBug:
@@ -22,16 +46,171 @@ class MappedBug:
     matched_pattern: str | None
 
 
-def map_error_to_bug_type(message: str) -> MappedBug:
-    lowered = message.lower()
-    for rule in ERROR_RULES:
-        if rule["pattern"].lower() in lowered:
-            return MappedBug(bug_type=rule["bug_type"], matched_pattern=rule["pattern"])
+@dataclass(frozen=True)
+class ErrorRule:
+    pattern: str
+    bug_type: str
+    priority: int = DEFAULT_RULE_PRIORITY
+
+
+class RuleMatcher:
+    """Case-insensitive substring matcher over many rules at once.
+
+    Of all rules found in a message the one with the lowest ``priority``
+    wins, ties going to the earlier rule. Small rule sets are scanned in
+    priority order with ``in``; larger ones are compiled once into an
+    Aho-Corasick automaton, so a message is read a single time whatever the
+    rule count. Hits are counted per rule.
+    """
+
+    # Below this many rules the C-level substring scan is faster.
+    AUTOMATON_MIN_RULES = 64
+
+    def __init__(self, rules: Iterable[ErrorRule]) -> None:
+        ordered = sorted(enumerate(rules), key=lambda item: (item[1].priority, item[0]))
+        self.rules: list[ErrorRule] = [rule for _, rule in ordered]
+        self._patterns = [rule.pattern.lower() for rule in self.rules]
+        self._hits = [0] * len(self.rules)
+        self._hits_lock = threading.Lock()
+        self._delta: list[dict[str, int]] = []
+        self._best: list[int] = []
+        if len(self.rules) >= self.AUTOMATON_MIN_RULES:
+            self._build_automaton()
+
+    def _build_automaton(self) -> None:
+        # State 0 is the root. ``best[state]`` is the rank of the best rule
+        # ending at that state or any of its suffix states.
+        unmatched = len(self.rules)
+        goto: list[dict[str, int]] = [{}]
+        best = [unmatched]
+        for rank, pattern in enumerate(self._patterns):
+            state = 0
+            for char in pattern:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    best.append(unmatched)
+                state = next_state
+            best[state] = min(best[state], rank)
+
+        # Breadth-first, folding each state's fail transitions into its own
+        # so matching never follows fail links: a missing key means root.
+        fail = [0] * len(goto)
+        delta: list[dict[str, int]] = [dict() for _ in goto]
+        delta[0] = dict(goto[0])
+        queue = list(goto[0].values())
+        for state in queue:
+            delta[state] = {**delta[fail[state]], **goto[state]}
+            for char, next_state in goto[state].items():
+                fail[next_state] = delta[fail[state]].get(char, 0)
+                best[next_state] = min(best[next_state], best[fail[next_state]])
+                queue.append(next_state)
+        self._delta = delta
+        self._best = best
+
+    def match(self, message: str) -> ErrorRule | None:
+        lowered = message.lower()
+        rank = self._match_automaton(lowered) if self._delta else self._match_scan(lowered)
+        if rank is None:
+            return None
+        with self._hits_lock:
+            self._hits[rank] += 1
+        return self.rules[rank]
+
+    def _match_scan(self, lowered: str) -> int | None:
+        for rank, pattern in enumerate(self._patterns):
+            if pattern in lowered:
+                return rank
+        return None
 
-    if "assert" in lowered:
-        return MappedBug(bug_type="LOGIC", matched_pattern="assert")
+    def _match_automaton(self, lowered: str) -> int | None:
+        delta = self._delta
+        best_of = self._best
+        best = unmatched = len(self.rules)
+        state = 0
+        for char in lowered:
+            state = delta[state].get(char, 0)
+            if best_of[state] < best:
+                best = best_of[state]
+                if best == 0:
+                    break
+        return None if best == unmatched else best
 
-    return MappedBug(bug_type="LOGIC", matched_pattern=None)
+    def hit_counts(self) -> list[dict[str, Any]]:
+        with self._hits_lock:
+            hits = list(self._hits)
+        return [
+            {
+                "pattern": rule.pattern,
+                "bug_type": rule.bug_type,
+                "priority": rule.priority,
+                "hits": count,
+            }
+            for rule, count in zip(self.rules, hits)
+        ]
+
+
+def parse_rules(entries: Iterable[dict[str, Any]], source: str = "rules") -> list[ErrorRule]:
+    rules: list[ErrorRule] = []
+    for entry in entries:
+        try:
+            rule = ErrorRule(
+                pattern=str(entry["pattern"]),
+                bug_type=str(entry["bug_type"]),
+                priority=int(entry.get("priority", DEFAULT_RULE_PRIORITY)),
+            )
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ValueError(f"Invalid rule in {source}: {entry!r}") from exc
+        if not rule.pattern:
+            raise ValueError(f"Empty pattern in {source}: {entry!r}")
+        if not is_allowed_bug_type(rule.bug_type):
+            raise ValueError(f"Unknown bug type in {source}: {rule.bug_type}")
+        rules.append(rule)
+    return rules
+
+
+def load_rule_pack(path: Path) -> list[ErrorRule]:
+    """Rules from a JSON or TOML file: either a top-level list (JSON only)
+    or a ``rules`` list of ``{pattern, bug_type, priority?}`` tables."""
+    if path.suffix == ".toml":
+        if tomllib is None:
+            raise ValueError(f"TOML rule packs need Python 3.11+: {path}")
+        data: Any = tomllib.loads(path.read_text(encoding="utf-8"))
+    else:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    entries = data.get("rules", []) if isinstance(data, dict) else data
+    return parse_rules(entries, source=str(path))
+
+
+def build_matcher(rule_packs: Iterable[Path] = ()) -> RuleMatcher:
+    rules = parse_rules(ERROR_RULES, source="ERROR_RULES")
+    for path in rule_packs:
+        rules.extend(load_rule_pack(path))
+    return RuleMatcher(rules)
+
+
+_matcher: RuleMatcher | None = None
+_matcher_lock = threading.Lock()
+
+
+def get_matcher() -> RuleMatcher:
+    """Matcher over the built-in rules and the RIFT_BUG_RULE_PACKS files,
+    built on first use."""
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                _matcher = build_matcher(BUG_RULE_PACKS)
+    return _matcher
+
+
+def map_error_to_bug_type(message: str) -> MappedBug:
+    rule = get_matcher().match(message)
+    if rule is None:
+        return MappedBug(bug_type="LOGIC", matched_pattern=None)
+    return MappedBug(bug_type=rule.bug_type, matched_pattern=rule.pattern)
 
 
 def is_allowed_bug_type(bug_type: str) -> bool:
@@ -40,4 +219,3 @@ def is_allowed_bug_type(bug_type: str) -> bool:
 
 def normalize_bug_types(items: Iterable[str]) -> list[str]:
     return [bug for bug in items if is_allowed_bug_type(bug)]
-
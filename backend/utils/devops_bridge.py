@@ -1,30 +1,54 @@
 from __future__ import annotations
 
-import json
-from datetime import datetime
+import sys
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
+
+try:
+    from ..config import DEVOPS_AUTOMATION_DIR
+except ImportError:
+    from config import DEVOPS_AUTOMATION_DIR  # type: ignore
+
+# DevOps_Git_Automation is not a package: its modules are imported from
+# their directories, as its own scripts do. Appended so they never shadow
+# backend modules.
+for _module_dir in (DEVOPS_AUTOMATION_DIR / "scripts", DEVOPS_AUTOMATION_DIR / "ci_cd" / "tracker"):
+    if str(_module_dir) not in sys.path:
+        sys.path.append(str(_module_dir))
+
+from history_log import HistoryLog  # noqa: E402
+from timeline_store import TimelineStore  # noqa: E402
 
 
 class DevOpsAutomationBridge:
-    def __init__(self, branch_history_path: Path, ci_timeline_path: Path) -> None:
+    def __init__(
+        self,
+        branch_history_path: Path,
+        pipeline_db_path: Path,
+        legacy_branch_history_path: Path | None = None,
+        legacy_ci_timeline_path: Path | None = None,
+    ) -> None:
         self.branch_history_path = branch_history_path
-        self.ci_timeline_path = ci_timeline_path
+        self.branch_history = HistoryLog(branch_history_path, legacy_path=legacy_branch_history_path)
+        self.pipeline_timeline = TimelineStore(
+            pipeline_db_path, legacy_timeline_path=legacy_ci_timeline_path
+        )
 
     def sync_run_data(
         self,
         *,
+        run_id: str,
         branch_name: str,
         team_name: str,
         leader_name: str,
         ci_timeline: list[dict[str, Any]],
     ) -> None:
         self._append_branch_history(branch_name=branch_name, team_name=team_name, leader_name=leader_name)
-        self._update_ci_timeline(ci_timeline=ci_timeline)
+        self._update_ci_timeline(run_id=run_id, ci_timeline=ci_timeline)
 
     def _append_branch_history(self, *, branch_name: str, team_name: str, leader_name: str) -> None:
-        history = self._read_json_array(self.branch_history_path)
-        history.append(
+        self.branch_history.append(
             {
                 "branch_name": branch_name,
                 "type": "fix",
@@ -35,49 +59,39 @@ class DevOpsAutomationBridge:
                 "status": "created",
             }
         )
-        self._write_json(self.branch_history_path, history)
 
-    def _update_ci_timeline(self, *, ci_timeline: list[dict[str, Any]]) -> None:
-        now = datetime.now().isoformat()
-        payload = {
-            "project": "RIFT'26 - DevOps Lead",
-            "start_time": ci_timeline[0]["timestamp"] if ci_timeline else now,
-            "end_time": ci_timeline[-1]["timestamp"] if ci_timeline else now,
-            "total_iterations": len(ci_timeline),
-            "pipeline_history": [
+    def iter_branch_history(self) -> Iterator[dict[str, Any]]:
+        return iter(self.branch_history)
+
+    def _update_ci_timeline(self, *, run_id: str, ci_timeline: list[dict[str, Any]]) -> None:
+        now = datetime.now(timezone.utc).isoformat()
+        iterations = []
+        for idx, item in enumerate(ci_timeline):
+            # CIMonitorAgent stamps an iteration when it ends.
+            end_time = item.get("timestamp", now)
+            duration = float(item.get("duration_seconds") or 0)
+            iterations.append(
                 {
                     "iteration": item.get("iteration", idx + 1),
-                    "start_time": item.get("timestamp", now),
+                    "start_time": self._start_time(end_time, duration),
                     "mode": "backend",
                     "stages": {
                         "test": {
                             "passed": item.get("status", "FAILED") == "PASSED",
-                            "timestamp": item.get("timestamp", now),
+                            "timestamp": end_time,
                             "simulated": False,
                         }
                     },
-                    "duration": 0,
+                    "duration": duration,
                     "status": str(item.get("status", "FAILED")).lower(),
-                    "end_time": item.get("timestamp", now),
+                    "end_time": end_time,
                 }
-                for idx, item in enumerate(ci_timeline)
-            ],
-        }
-        self._write_json(self.ci_timeline_path, payload)
-
-    def _read_json_array(self, path: Path) -> list[dict[str, Any]]:
-        if not path.exists():
-            return []
-
-        raw = path.read_text(encoding="utf-8").strip()
-        if not raw:
-            return []
-
-        parsed = json.loads(raw)
-        if isinstance(parsed, list):
-            return parsed
-        return []
+            )
+        self.pipeline_timeline.record_many(run_id, iterations, source="backend")
 
-    def _write_json(self, path: Path, payload: Any) -> None:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    @staticmethod
+    def _start_time(end_time: str, duration: float) -> str:
+        try:
+            return (datetime.fromisoformat(end_time) - timedelta(seconds=duration)).isoformat()
+        except ValueError:
+            return end_time
@@ -1,6 +1,9 @@
 # backend>utils>file_editor.py
 from __future__ import annotations
 
+import os
+import shutil
+import tempfile
 from pathlib import Path
 from typing import Callable
 
@@ -10,46 +13,168 @@ def safe_read_lines(file_path: Path) -> list[str]:
 
 
 def safe_write_lines(file_path: Path, lines: list[str]) -> None:
-    file_path.write_text("".join(lines), encoding="utf-8")
+    """Replace ``file_path`` atomically: readers see the old or the new
+    content, never a partial write."""
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{file_path.name}.", dir=file_path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write("".join(lines))
+        shutil.copymode(file_path, tmp_name)
+        os.replace(tmp_name, file_path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+class EditSession:
+    """Line edits to one file, buffered in memory: the file is read when
+    the session opens and written once by ``commit``.
+
+    Edit methods take current line numbers. Every buffered line remembers
+    its line number in the file as read, so callers holding original line
+    numbers (e.g. from a test run) map them with ``resolve`` after earlier
+    edits have shifted lines. ``touched`` holds the original lines already
+    edited or removed.
+    """
+
+    def __init__(self, file_path: Path) -> None:
+        self.file_path = file_path
+        self.lines = safe_read_lines(file_path)
+        self.original = list(self.lines)
+        self.dirty = False
+        self.written = False
+        # Original line number per buffered line; None for inserted lines.
+        self._origin: list[int | None] = list(range(1, len(self.lines) + 1))
+        self._current: dict[int, int] | None = None
+        self.touched: set[int] = set()
+
+    def resolve(self, original_line: int) -> int | None:
+        """Current line number of ``original_line``; None once removed."""
+        if self._current is None:
+            self._current = {
+                origin: index + 1
+                for index, origin in enumerate(self._origin)
+                if origin is not None
+            }
+        return self._current.get(original_line)
+
+    def origin(self, line_number: int) -> int | None:
+        """Original line number of current line ``line_number``."""
+        index = line_number - 1
+        if index < 0 or index >= len(self._origin):
+            return None
+        return self._origin[index]
+
+    def _touch(self, index: int) -> None:
+        origin = self._origin[index]
+        if origin is not None:
+            self.touched.add(origin)
+        self.dirty = True
+
+    def remove_line(self, line_number: int) -> bool:
+        index = line_number - 1
+        if index < 0 or index >= len(self.lines):
+            return False
+        self._touch(index)
+        del self.lines[index]
+        del self._origin[index]
+        self._current = None
+        return True
+
+    def update_line(self, line_number: int, updater: Callable[[str], str]) -> bool:
+        index = line_number - 1
+        if index < 0 or index >= len(self.lines):
+            return False
+        updated = updater(self.lines[index])
+        if updated != self.lines[index]:
+            self.lines[index] = updated
+            self._touch(index)
+        return True
+
+    def insert_line(self, line_number: int, content: str) -> bool:
+        index = max(0, min(line_number - 1, len(self.lines)))
+        insert_value = content if content.endswith("\n") else f"{content}\n"
+        self.lines.insert(index, insert_value)
+        self._origin.insert(index, None)
+        self._current = None
+        self.dirty = True
+        return True
+
+    def normalize_indentation(self) -> bool:
+        for index, line in enumerate(self.lines):
+            stripped = line.lstrip(" \t")
+            prefix = line[: len(line) - len(stripped)]
+            if "\t" in prefix:
+                self.lines[index] = prefix.replace("\t", "    ") + stripped
+                self.dirty = True
+        return True
+
+    def source(self) -> str:
+        return "".join(self.lines)
+
+    def commit(self) -> bool:
+        """Write the buffered lines back; False when nothing changed."""
+        if not self.dirty:
+            return False
+        safe_write_lines(self.file_path, self.lines)
+        self.dirty = False
+        self.written = True
+        return True
+
+    def revert(self) -> None:
+        """Drop every edit, restoring the file on disk if already written."""
+        if self.written:
+            safe_write_lines(self.file_path, self.original)
+            self.written = False
+        self.lines = list(self.original)
+        self._origin = list(range(1, len(self.lines) + 1))
+        self._current = None
+        self.touched.clear()
+        self.dirty = False
+
+
+class EditBatch:
+    """Edit sessions for many files, e.g. every fix of one iteration: each
+    file is read at most once and written at most once."""
+
+    def __init__(self) -> None:
+        self.sessions: dict[Path, EditSession] = {}
+
+    def session(self, file_path: Path) -> EditSession:
+        session = self.sessions.get(file_path)
+        if session is None:
+            session = EditSession(file_path)
+            self.sessions[file_path] = session
+        return session
+
+    def commit(self) -> list[Path]:
+        """Write every changed file; returns the files written."""
+        return [path for path, session in self.sessions.items() if session.commit()]
 
 
 def remove_line(file_path: Path, line_number: int) -> bool:
-    lines = safe_read_lines(file_path)
-    index = line_number - 1
-    if index < 0 or index >= len(lines):
-        return False
-    del lines[index]
-    safe_write_lines(file_path, lines)
-    return True
+    session = EditSession(file_path)
+    success = session.remove_line(line_number)
+    session.commit()
+    return success
 
 
 def update_line(file_path: Path, line_number: int, updater: Callable[[str], str]) -> bool:
-    lines = safe_read_lines(file_path)
-    index = line_number - 1
-    if index < 0 or index >= len(lines):
-        return False
-    lines[index] = updater(lines[index])
-    safe_write_lines(file_path, lines)
-    return True
+    session = EditSession(file_path)
+    success = session.update_line(line_number, updater)
+    session.commit()
+    return success
 
 
 def insert_line(file_path: Path, line_number: int, content: str) -> bool:
-    lines = safe_read_lines(file_path)
-    index = max(0, min(line_number - 1, len(lines)))
-    insert_value = content if content.endswith("\n") else f"{content}\n"
-    lines.insert(index, insert_value)
-    safe_write_lines(file_path, lines)
-    return True
+    session = EditSession(file_path)
+    success = session.insert_line(line_number, content)
+    session.commit()
+    return success
 
 
 def normalize_indentation(file_path: Path) -> bool:
-    lines = safe_read_lines(file_path)
-    normalized = []
-    for line in lines:
-        stripped = line.lstrip(" \t")
-        prefix = line[: len(line) - len(stripped)]
-        spaces = prefix.replace("\t", "    ")
-        normalized.append(spaces + stripped)
-    safe_write_lines(file_path, normalized)
-    return True
-
+    session = EditSession(file_path)
+    success = session.normalize_indentation()
+    session.commit()
+    return success
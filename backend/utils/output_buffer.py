@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from pathlib import Path
+from typing import IO, Iterator
+
+try:
+    from ..config import OUTPUT_BUFFER_MAX_CHARS
+    from .logger import ensure_parent_dir
+except ImportError:
+    from config import OUTPUT_BUFFER_MAX_CHARS  # type: ignore
+    from utils.logger import ensure_parent_dir  # type: ignore
+
+
+READ_CHUNK_CHARS = 64 * 1024
+
+
+class OutputBuffer:
+    """Bounded capture of a subprocess' output.
+
+    Every line is appended to ``spill_path`` (when given) while only the
+    most recent ``max_chars`` are kept in memory, so a run's memory use does
+    not grow with the size of its output. ``lines`` replays the full output
+    from disk.
+    """
+
+    def __init__(self, spill_path: Path | None = None, max_chars: int = OUTPUT_BUFFER_MAX_CHARS) -> None:
+        self.spill_path = spill_path
+        self.max_chars = max(1, max_chars)
+        self._tail: deque[str] = deque()
+        self._tail_chars = 0
+        self.dropped_chars = 0
+        self._lock = threading.Lock()
+        self._spill: IO[str] | None = None
+        if spill_path is not None:
+            ensure_parent_dir(spill_path)
+            self._spill = open(spill_path, "w", encoding="utf-8", errors="replace")
+
+    def write(self, text: str) -> None:
+        if not text:
+            return
+        with self._lock:
+            if self._spill is not None:
+                self._spill.write(text)
+            self._tail.append(text)
+            self._tail_chars += len(text)
+            while self._tail_chars > self.max_chars and len(self._tail) > 1:
+                dropped = self._tail.popleft()
+                self._tail_chars -= len(dropped)
+                self.dropped_chars += len(dropped)
+
+    def consume(self, stream: IO[str]) -> None:
+        """Copy ``stream`` into the buffer until EOF; reads in bounded chunks
+        so a single huge line can't be held in memory in one piece."""
+        while True:
+            chunk = stream.readline(READ_CHUNK_CHARS)
+            if not chunk:
+                break
+            self.write(chunk)
+
+    def start_reader(self, stream: IO[str]) -> threading.Thread:
+        reader = threading.Thread(target=self.consume, args=(stream,), daemon=True)
+        reader.start()
+        return reader
+
+    def close(self) -> None:
+        with self._lock:
+            if self._spill is not None:
+                self._spill.close()
+                self._spill = None
+
+    def text(self) -> str:
+        """The in-memory tail, prefixed with a marker when output was dropped."""
+        with self._lock:
+            tail = "".join(self._tail)
+            dropped = self.dropped_chars
+        if not dropped:
+            return tail
+        where = f" (full log: {self.spill_path})" if self.spill_path is not None else ""
+        return f"[... {dropped} earlier characters truncated{where}]\n{tail}"
+
+
+def iter_output_lines(text: str, spill_path: Path | None) -> Iterator[str]:
+    """Lines of a command's output, streamed from its spill file if present."""
+    if spill_path is not None and spill_path.exists():
+        with open(spill_path, encoding="utf-8", errors="replace") as handle:
+            for line in handle:
+                yield line.rstrip("\r\n")
+        return
+    yield from text.splitlines()
+
+
+def append_output(spill_path: Path | None, text: str) -> None:
+    if spill_path is not None and spill_path.exists():
+        with open(spill_path, "a", encoding="utf-8") as handle:
+            handle.write(f"\n{text}")
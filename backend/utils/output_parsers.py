@@ -0,0 +1,307 @@
+# backend>utils>output_parsers.py
+"""Format-specific parsers for tool output.
+
+Each parser turns the lines of one tool's output into ``RawFailure``
+records; ``ErrorParserAgent`` owns path normalization, filtering and
+de-duplication. A new tool is supported by subclassing ``OutputParser`` and
+decorating it with ``register_parser``.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from itertools import chain
+from typing import Callable, Iterable, Iterator
+
+
+# Lines inspected for a format signature before falling back to the default.
+DETECT_WINDOW_LINES = 200
+DEFAULT_FORMAT = "pytest"
+
+
+@dataclass
+class RawFailure:
+    file: str
+    line_number: int
+    message: str
+
+
+NO_FAILURES: tuple[RawFailure, ...] = ()
+
+
+class OutputParser:
+    """Parses one output. A fresh instance is created per output, so
+    parsers may keep state between lines.
+
+    ``in_repo`` tells whether a raw file string belongs to the repo, for
+    formats that must choose between several locations (e.g. tracebacks).
+    """
+
+    name = ""
+    # Lower runs first during detection.
+    priority = 100
+    # The signature also shows up inside other formats (e.g. a traceback
+    # in captured pytest output): only chosen when no other format's
+    # signature appears in the detection window.
+    weak_signature = False
+
+    def __init__(self, in_repo: Callable[[str], bool] | None = None) -> None:
+        self.in_repo = in_repo or (lambda _file: True)
+
+    @classmethod
+    def detect(cls, line: str) -> bool:
+        """True when ``line`` identifies this format."""
+        return False
+
+    def feed(self, line: str) -> Iterable[RawFailure]:
+        raise NotImplementedError
+
+    def close(self) -> Iterable[RawFailure]:
+        return NO_FAILURES
+
+
+PARSERS: dict[str, type[OutputParser]] = {}
+
+
+def register_parser(parser_cls: type[OutputParser]) -> type[OutputParser]:
+    PARSERS[parser_cls.name] = parser_cls
+    return parser_cls
+
+
+def get_parser(name: str) -> type[OutputParser]:
+    try:
+        return PARSERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown output format: {name}") from None
+
+
+def detect_format(
+    lines: Iterable[str], window: int = DETECT_WINDOW_LINES
+) -> tuple[type[OutputParser], Iterator[str]]:
+    """Pick the parser for ``lines`` from the first ``window`` lines.
+
+    The first line matching a parser decides, unless that parser has a
+    ``weak_signature``: then the rest of the window is still searched for
+    another format.
+
+    Returns the parser class and an iterator that replays the inspected
+    lines followed by the rest, so a streamed output is read only once.
+    """
+    iterator = iter(lines)
+    candidates = sorted(PARSERS.values(), key=lambda parser: parser.priority)
+    inspected: list[str] = []
+    detected: type[OutputParser] | None = None
+    weak: type[OutputParser] | None = None
+
+    for line in iterator:
+        inspected.append(line)
+        matched = next((parser for parser in candidates if parser.detect(line)), None)
+        if matched is not None and matched.weak_signature:
+            weak = weak or matched
+            candidates = [parser for parser in candidates if not parser.weak_signature]
+        elif matched is not None:
+            detected = matched
+        if detected is not None or len(inspected) >= window:
+            break
+
+    return detected or weak or get_parser(DEFAULT_FORMAT), chain(inspected, iterator)
+
+
+# ---------- Built-in formats ----------
+
+# Traceback frame or SyntaxError location: File "x.py", line N[, in func]
+FRAME_RE = re.compile(r'^\s*File "(?P<file>[^"]+\.py)", line (?P<line>\d+)')
+# Final line of a traceback: "ValueError: message", "SyntaxError: ..."
+EXCEPTION_RE = re.compile(
+    r"^(?P<type>[A-Za-z_][\w.]*(?:Error|Exception|Exit|Interrupt))(?::\s*(?P<message>.*))?$"
+)
+
+
+@register_parser
+class TracebackParser(OutputParser):
+    """Plain Python tracebacks, including ``SyntaxError`` /
+    ``IndentationError`` blocks (location, source line, caret, message).
+    A failure is reported at the deepest frame inside the repo."""
+
+    name = "traceback"
+    priority = 30
+    weak_signature = True
+    # Frames kept per traceback; deep recursion only needs the innermost.
+    MAX_FRAMES = 64
+
+    def __init__(self, in_repo: Callable[[str], bool] | None = None) -> None:
+        super().__init__(in_repo)
+        self._frames: list[tuple[str, int]] = []
+
+    @classmethod
+    def detect(cls, line: str) -> bool:
+        return line.startswith("Traceback (most recent call last):") or bool(
+            FRAME_RE.match(line)
+        )
+
+    @property
+    def in_traceback(self) -> bool:
+        return bool(self._frames)
+
+    def feed(self, line: str) -> Iterable[RawFailure]:
+        if 'File "' in line:
+            frame = FRAME_RE.match(line)
+            if frame:
+                self._frames.append((frame.group("file"), int(frame.group("line"))))
+                if len(self._frames) > self.MAX_FRAMES:
+                    del self._frames[0]
+                return NO_FAILURES
+
+        if not self._frames:
+            return NO_FAILURES
+        if line.startswith("Traceback"):
+            self._frames.clear()
+            return NO_FAILURES
+
+        exception = EXCEPTION_RE.match(line.strip())
+        if not exception:
+            return NO_FAILURES
+
+        frames, self._frames = self._frames, []
+        location = next(
+            (frame for frame in reversed(frames) if self.in_repo(frame[0])), None
+        )
+        if location is None:
+            return NO_FAILURES
+        message = exception.group("type")
+        if exception.group("message"):
+            message = f"{message}: {exception.group('message')}"
+        return (RawFailure(file=location[0], line_number=location[1], message=message),)
+
+
+@register_parser
+class PytestParser(OutputParser):
+    """pytest terminal output: ``path.py:line: message`` location lines,
+    optionally followed by an ``E   ...`` payload line. Tracebacks shown in
+    ``E`` lines (e.g. a SyntaxError while collecting) are parsed too."""
+
+    name = "pytest"
+    priority = 20
+
+    # Matches pytest-style source location lines: path.py:line: message
+    LOCATION_RE = re.compile(
+        r"^(?P<file>[^\s:][^:]*\.py):(?P<line>\d+):\s*(?P<message>.+)$"
+    )
+
+    # Captures traceback error payload lines prefixed with "E   ..."
+    TRACEBACK_LINE_RE = re.compile(r"^E\s+(.+)$")
+
+    SIGNATURE_RE = re.compile(
+        r"^=+ (?:test session starts|FAILURES|ERRORS|short test summary info) =+$"
+        r"|^collected \d+ items?"
+    )
+
+    def __init__(self, in_repo: Callable[[str], bool] | None = None) -> None:
+        super().__init__(in_repo)
+        # A location line waits for the next line, which may carry its
+        # "E   ..." traceback payload.
+        self._pending: tuple[str, int, str] | None = None
+        self._embedded = TracebackParser(self.in_repo)
+        self._match_location = self.LOCATION_RE.match
+
+    @classmethod
+    def detect(cls, line: str) -> bool:
+        return bool(cls.SIGNATURE_RE.match(line))
+
+    def feed(self, line: str) -> Iterable[RawFailure]:
+        found = NO_FAILURES
+
+        if self._pending is not None:
+            raw_file, line_number, message = self._pending
+            self._pending = None
+            trace_match = self.TRACEBACK_LINE_RE.match(line.strip())
+            if trace_match:
+                message = f"{message} | {trace_match.group(1)}"
+            found = (RawFailure(file=raw_file, line_number=line_number, message=message),)
+
+        # Cheap substring tests first: almost no lines are locations.
+        if ".py:" in line:
+            match = self._match_location(line.strip())
+            if match:
+                self._pending = (
+                    match.group("file"),
+                    int(match.group("line")),
+                    match.group("message"),
+                )
+        elif line.startswith("E ") and ("File " in line or self._embedded.in_traceback):
+            embedded = self._embedded.feed(line[2:].strip())
+            if embedded:
+                found = (*found, *embedded)
+
+        return found
+
+    def close(self) -> Iterable[RawFailure]:
+        if self._pending is None:
+            return NO_FAILURES
+        raw_file, line_number, message = self._pending
+        self._pending = None
+        return (RawFailure(file=raw_file, line_number=line_number, message=message),)
+
+
+@register_parser
+class LinterParser(OutputParser):
+    """flake8 and pylint: ``path.py:line:col: CODE message`` (pylint puts
+    a colon after the code)."""
+
+    name = "lint"
+    priority = 10
+
+    LINE_RE = re.compile(
+        r"^(?P<file>[^\s:][^:]*\.py):(?P<line>\d+):(?P<col>\d+):\s*"
+        r"(?P<code>[A-Z]+\d+):?\s*(?P<message>.+)$"
+    )
+
+    @classmethod
+    def detect(cls, line: str) -> bool:
+        return line.startswith("************* Module ") or bool(cls.LINE_RE.match(line))
+
+    def feed(self, line: str) -> Iterable[RawFailure]:
+        if ".py:" not in line:
+            return NO_FAILURES
+        match = self.LINE_RE.match(line.strip())
+        if not match:
+            return NO_FAILURES
+        return (
+            RawFailure(
+                file=match.group("file"),
+                line_number=int(match.group("line")),
+                message=f"{match.group('code')} {match.group('message')}",
+            ),
+        )
+
+
+@register_parser
+class MypyParser(OutputParser):
+    """mypy: ``path.py:line[:col]: error: message  [code]``. Notes are
+    context for the preceding error and are skipped."""
+
+    name = "mypy"
+    priority = 10
+
+    LINE_RE = re.compile(
+        r"^(?P<file>[^\s:][^:]*\.py):(?P<line>\d+):(?:\d+:)?\s*error:\s*(?P<message>.+)$"
+    )
+    SUMMARY_RE = re.compile(r"^(?:Found \d+ errors? in \d+ files?|Success: no issues found)")
+
+    @classmethod
+    def detect(cls, line: str) -> bool:
+        return bool(cls.LINE_RE.match(line) or cls.SUMMARY_RE.match(line))
+
+    def feed(self, line: str) -> Iterable[RawFailure]:
+        if ": error:" not in line:
+            return NO_FAILURES
+        match = self.LINE_RE.match(line.strip())
+        if not match:
+            return NO_FAILURES
+        return (
+            RawFailure(
+                file=match.group("file"),
+                line_number=int(match.group("line")),
+                message=match.group("message").strip(),
+            ),
+        )
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: in-process locking only
+    fcntl = None  # type: ignore[assignment]
+
+try:
+    from ..config import (
+        SANDBOX_IMAGE_CACHE_BUDGET_BYTES,
+        SANDBOX_IMAGE_CACHE_MAX_IMAGES,
+        SANDBOX_IMAGE_INDEX_PATH,
+        SANDBOX_IMAGE_REPOSITORY,
+    )
+    from .logger import ensure_parent_dir, get_logger
+except ImportError:
+    from config import (  # type: ignore
+        SANDBOX_IMAGE_CACHE_BUDGET_BYTES,
+        SANDBOX_IMAGE_CACHE_MAX_IMAGES,
+        SANDBOX_IMAGE_INDEX_PATH,
+        SANDBOX_IMAGE_REPOSITORY,
+    )
+    from utils.logger import ensure_parent_dir, get_logger  # type: ignore
+
+
+class SandboxImageCache:
+    """Local docker images with a repo's dependencies pre-installed.
+
+    Images are tagged with a fingerprint of the base image, the install
+    commands and the contents of the requirements files, so a tag can be
+    reused by any run whose dependencies are unchanged. The index of known
+    tags is evicted least-recently-used first once it exceeds the image
+    count or disk budget.
+    """
+
+    def __init__(
+        self,
+        index_path: Path = SANDBOX_IMAGE_INDEX_PATH,
+        repository: str = SANDBOX_IMAGE_REPOSITORY,
+        budget_bytes: int = SANDBOX_IMAGE_CACHE_BUDGET_BYTES,
+        max_images: int = SANDBOX_IMAGE_CACHE_MAX_IMAGES,
+    ) -> None:
+        self.logger = get_logger("SandboxImageCache")
+        self.index_path = index_path
+        self.repository = repository
+        self.budget_bytes = budget_bytes
+        self.max_images = max(1, max_images)
+        self._lock = threading.Lock()
+
+    def tag_for(
+        self,
+        repo_path: Path,
+        base_image: str,
+        install_steps: list[str],
+        requirements_files: list[str],
+    ) -> str:
+        digest = hashlib.sha256()
+        digest.update(base_image.encode("utf-8"))
+        for step in install_steps:
+            digest.update(b"\0step\0" + step.encode("utf-8"))
+        for name in requirements_files:
+            path = repo_path / name
+            if path.is_file():
+                digest.update(b"\0file\0" + name.encode("utf-8") + b"\0" + path.read_bytes())
+        return f"{self.repository}:{digest.hexdigest()[:16]}"
+
+    def lookup(self, tag: str) -> bool:
+        """True if ``tag`` exists locally; marks it as recently used."""
+        if self._docker(["image", "inspect", tag]).returncode != 0:
+            with self._locked_index() as index:
+                index.pop(tag, None)
+            return False
+        with self._locked_index() as index:
+            known = tag in index
+        size_bytes = 0 if known else self._image_size(tag)
+        with self._locked_index() as index:
+            entry = index.setdefault(tag, {"size_bytes": size_bytes})
+            entry["last_used"] = time.time()
+        return True
+
+    def save(self, container: str, tag: str) -> bool:
+        """Commit ``container`` as ``tag`` and evict old images if needed."""
+        if self._docker(["commit", container, tag], timeout=300).returncode != 0:
+            self.logger.warning("Failed to commit sandbox image %s", tag)
+            return False
+        size_bytes = self._image_size(tag)
+        with self._locked_index() as index:
+            index[tag] = {"size_bytes": size_bytes, "last_used": time.time()}
+            self._evict(index, keep=tag)
+        return True
+
+    def _evict(self, index: dict[str, dict[str, Any]], keep: str) -> None:
+        by_age = sorted(
+            (tag for tag in index if tag != keep),
+            key=lambda tag: index[tag].get("last_used", 0),
+        )
+        total = sum(int(entry.get("size_bytes", 0)) for entry in index.values())
+        for tag in by_age:
+            if len(index) <= self.max_images and total <= self.budget_bytes:
+                break
+            # Images still used by a running sandbox refuse removal; keep
+            # them indexed and try again on the next save.
+            if self._docker(["image", "rm", tag], timeout=120).returncode != 0:
+                continue
+            total -= int(index.pop(tag).get("size_bytes", 0))
+            self.logger.info("Evicted sandbox image %s", tag)
+
+    def _image_size(self, tag: str) -> int:
+        proc = self._docker(["image", "inspect", "-f", "{{.Size}}", tag])
+        try:
+            return int(proc.stdout.strip())
+        except ValueError:
+            return 0
+
+    def _docker(self, args: list[str], timeout: int = 60) -> subprocess.CompletedProcess:
+        try:
+            return subprocess.run(
+                ["docker", *args], capture_output=True, text=True, timeout=timeout
+            )
+        except (OSError, subprocess.TimeoutExpired) as exc:
+            return subprocess.CompletedProcess(args, 1, "", str(exc))
+
+    @contextmanager
+    def _locked_index(self) -> Iterator[dict[str, dict[str, Any]]]:
+        ensure_parent_dir(self.index_path)
+        with self._lock, open(self.index_path.with_name(f"{self.index_path.name}.lock"), "w") as handle:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                index: dict[str, dict[str, Any]] = {}
+                if self.index_path.exists():
+                    try:
+                        index = json.loads(self.index_path.read_text(encoding="utf-8"))
+                    except ValueError:
+                        index = {}
+                yield index
+                tmp_path = self.index_path.with_name(f"{self.index_path.name}.tmp")
+                tmp_path.write_text(json.dumps(index, indent=2), encoding="utf-8")
+                os.replace(tmp_path, self.index_path)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
@@ -0,0 +1,47 @@
+import { NextRequest, NextResponse } from 'next/server';
+
+export const dynamic = 'force-dynamic';
+
+export async function GET(
+  request: NextRequest,
+  { params }: { params: Promise<{ id: string }> }
+) {
+  try {
+    const backendUrl = process.env.AGENT_BACKEND_URL;
+    if (!backendUrl) {
+      return NextResponse.json(
+        { message: 'AGENT_BACKEND_URL is not configured' },
+        { status: 500 }
+      );
+    }
+
+    const { id } = await params;
+    const headers: Record<string, string> = { Accept: 'text/event-stream' };
+    const lastEventId = request.headers.get('last-event-id');
+    if (lastEventId) headers['Last-Event-ID'] = lastEventId;
+
+    const response = await fetch(
+      `${backendUrl.replace(/\/$/, '')}/runs/${encodeURIComponent(id)}/events`,
+      { headers, cache: 'no-store', signal: request.signal }
+    );
+
+    if (!response.ok || !response.body) {
+      const data = (await response.json().catch(() => ({}))) as { detail?: string };
+      return NextResponse.json(
+        { message: data.detail ?? 'Backend request failed' },
+        { status: response.ok ? 502 : response.status }
+      );
+    }
+
+    // Pass the event stream straight through; it is not buffered here.
+    return new Response(response.body, {
+      headers: {
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache, no-transform',
+        Connection: 'keep-alive',
+      },
+    });
+  } catch {
+    return NextResponse.json({ message: 'Unable to connect to backend' }, { status: 500 });
+  }
+}
@@ -7,7 +7,7 @@ import CICDTimeline from './CICDTimeline';
 import FixesTable from './FixesTable';
 
 export default function Dashboard() {
-  const { status, results, reset } = useAgentStore();
+  const { status, results, reset, liveRuns, liveFixes } = useAgentStore();
 
   if (status === 'idle') return null;
 
@@ -47,5 +47,15 @@ export default function Dashboard() {
     );
   }
 
+  // Partial results streamed while the run is still in progress.
+  if (status === 'running' && (liveRuns.length > 0 || liveFixes.length > 0)) {
+    return (
+      <div className="flex flex-col gap-6 mt-8">
+        <CICDTimeline runs={liveRuns} />
+        <FixesTable fixes={liveFixes} />
+      </div>
+    );
+  }
+
   return null;
 }
@@ -98,6 +98,24 @@ export default function RunSummaryCard({ results }: RunSummaryCardProps) {
             <div className="font-mono text-[#06B6D4] text-sm bg-[#0A0E1A] border border-[#06B6D4]/30 rounded px-2 py-1 inline-block mt-1">
               {results.branch}
             </div>
+            {results.push_status !== 'skipped' && (
+              <p
+                className={`text-xs mt-1 ${
+                  results.push_status === 'failed'
+                    ? 'text-[#EF4444]'
+                    : results.push_status === 'pushed'
+                      ? 'text-[#10B981]'
+                      : 'text-amber-400'
+                }`}
+                title={results.push_error}
+              >
+                {results.push_status === 'pending'
+                  ? 'Pushing…'
+                  : results.push_status === 'pushed'
+                    ? 'Pushed'
+                    : 'Push failed'}
+              </p>
+            )}
           </div>
 
           <div>
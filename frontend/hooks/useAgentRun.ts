@@ -2,6 +2,18 @@
 import { useEffect, useRef } from 'react';
 import axios from 'axios';
 import { useAgentStore } from '@/store/agentStore';
+import type { AgentJob, AgentResults } from '@/types';
+import {
+  normalizeFix,
+  normalizePushStatus,
+  normalizeResults,
+  normalizeRun,
+  type BackendFix,
+  type BackendRunResult,
+  type BackendTimeline,
+} from '@/utils/normalizeResults';
+
+type StageEvent = { stage?: string; iteration?: number; status?: string; duration_seconds?: number };
 
 function getLogTime() {
   const now = new Date();
@@ -15,6 +27,80 @@ export function useAgentRun() {
   const timerRef = useRef<ReturnType<typeof setInterval> | null>(null);
   const startRef = useRef<number>(0);
 
+  // Streams live progress for a run and resolves with its final results.
+  const followRunEvents = (runId: string) =>
+    new Promise<AgentResults>((resolve, reject) => {
+      const source = new EventSource(`/api/runs/${encodeURIComponent(runId)}/events`);
+      const parse = <T,>(event: Event) => JSON.parse((event as MessageEvent).data) as T;
+      let runIndex = 0;
+
+      source.addEventListener('stage_started', (event) => {
+        const { stage, iteration } = parse<StageEvent>(event);
+        const suffix = iteration ? ` (iteration ${iteration})` : '';
+        store.appendLog({ time: getLogTime(), message: `▶️ ${stage}${suffix} started` });
+      });
+      source.addEventListener('stage_finished', (event) => {
+        const { stage, status, duration_seconds } = parse<StageEvent>(event);
+        store.appendLog({
+          time: getLogTime(),
+          message: `${status === 'ok' ? '✔️' : '⚠️'} ${stage} finished in ${duration_seconds ?? 0}s`,
+        });
+      });
+      source.addEventListener('failures_parsed', (event) => {
+        const { failures = [] } = parse<{ failures?: unknown[] }>(event);
+        store.appendLog({ time: getLogTime(), message: `🔍 ${failures.length} failure(s) parsed` });
+      });
+      source.addEventListener('iteration', (event) => {
+        store.appendLiveRun(normalizeRun(parse<BackendTimeline>(event), runIndex++));
+      });
+      source.addEventListener('fix', (event) => {
+        store.appendLiveFix(normalizeFix(parse<BackendFix>(event)));
+      });
+      // Fixes are committed in the background after their 'fix' event; a
+      // failed commit turns the listed rows (indexes in event order) FAILED.
+      source.addEventListener('commit_failed', (event) => {
+        const { file, fixes = [] } = parse<{ file?: string; fixes?: number[] }>(event);
+        store.failLiveFixes(fixes);
+        store.appendLog({ time: getLogTime(), message: `⚠️ Commit failed for ${file}` });
+      });
+      // Sent before the file's 'fix' events, which already arrive as failed.
+      source.addEventListener('fix_reverted', (event) => {
+        const { file, reason } = parse<{ file?: string; reason?: string }>(event);
+        store.appendLog({ time: getLogTime(), message: `↩️ Reverted fixes in ${file}: ${reason}` });
+      });
+      // The stream stays open after run_completed while the branch push is
+      // pending; push_completed then updates the results already shown.
+      source.addEventListener('run_completed', (event) => {
+        const results = normalizeResults(parse<{ result: BackendRunResult }>(event).result);
+        if (results.push_status === 'pending') {
+          store.appendLog({ time: getLogTime(), message: `⏫ Pushing ${results.branch}...` });
+        } else {
+          source.close();
+        }
+        resolve(results);
+      });
+      source.addEventListener('push_completed', (event) => {
+        source.close();
+        const { push_status, push_error } = parse<{ push_status?: string; push_error?: string }>(event);
+        const pushStatus = normalizePushStatus(push_status);
+        store.setPushStatus(pushStatus, push_error || undefined);
+        store.appendLog({
+          time: getLogTime(),
+          message: pushStatus === 'pushed' ? '✅ Branch pushed' : `❌ Push failed: ${push_error || 'unknown error'}`,
+        });
+      });
+      source.addEventListener('job_failed', (event) => {
+        source.close();
+        reject(new Error(parse<{ error_message?: string }>(event).error_message || 'Agent job failed'));
+      });
+      source.onerror = () => {
+        // EventSource reconnects on its own unless the stream was rejected.
+        if (source.readyState === EventSource.CLOSED) {
+          reject(new Error('Lost connection to the run event stream'));
+        }
+      };
+    });
+
   const runAgent = async () => {
     if (!store.repoUrl || !store.teamName || !store.leaderName) return;
 
@@ -29,12 +115,16 @@ export function useAgentRun() {
       store.appendLog({ time: getLogTime(), message: '🚀 Starting agent run...' });
       store.appendLog({ time: getLogTime(), message: '🔗 Connecting to backend...' });
 
-      const { data: results } = await axios.post('/api/run', {
+      const { data: submitted } = await axios.post<AgentJob>('/api/run', {
         repoUrl: store.repoUrl,
         teamName: store.teamName,
         leaderName: store.leaderName,
       });
 
+      store.appendLog({ time: getLogTime(), message: `📥 Job ${submitted.job_id} queued` });
+
+      const results = await followRunEvents(submitted.job_id);
+
       store.appendLog({
         time: getLogTime(),
         message: `✅ Agent run finished with status: ${results.final_status}`,
@@ -45,7 +135,9 @@ export function useAgentRun() {
     } catch (error) {
       const message = axios.isAxiosError(error)
         ? (error.response?.data?.message as string | undefined) ?? error.message
-        : 'Backend request failed';
+        : error instanceof Error
+          ? error.message
+          : 'Backend request failed';
 
       store.appendLog({ time: getLogTime(), message: `❌ ${message}` });
       if (timerRef.current) clearInterval(timerRef.current);
@@ -1,6 +1,6 @@
 'use client';
 import { create } from 'zustand';
-import type { AgentResults, LogLine, RunStatus } from '@/types';
+import type { AgentResults, CICDRun, Fix, LogLine, PushStatus, RunStatus } from '@/types';
 
 interface AgentStore {
   repoUrl: string;
@@ -11,11 +11,17 @@ interface AgentStore {
   elapsed: number;
   results: AgentResults | null;
   status: RunStatus;
+  liveRuns: CICDRun[];
+  liveFixes: Fix[];
 
   setField: (field: 'repoUrl' | 'teamName' | 'leaderName', value: string) => void;
   startRun: () => void;
   appendLog: (log: LogLine) => void;
+  appendLiveRun: (run: CICDRun) => void;
+  appendLiveFix: (fix: Fix) => void;
+  failLiveFixes: (indexes: number[]) => void;
   setResults: (results: AgentResults) => void;
+  setPushStatus: (pushStatus: PushStatus, pushError?: string) => void;
   setElapsed: (s: number) => void;
   setStatus: (s: RunStatus) => void;
   reset: () => void;
@@ -30,13 +36,35 @@ export const useAgentStore = create<AgentStore>((set) => ({
   elapsed: 0,
   results: null,
   status: 'idle',
+  liveRuns: [],
+  liveFixes: [],
 
   setField: (field, value) => set((s) => ({ ...s, [field]: value })),
   startRun: () =>
-    set({ isRunning: true, status: 'running', logs: [], results: null, elapsed: 0 }),
+    set({
+      isRunning: true,
+      status: 'running',
+      logs: [],
+      results: null,
+      elapsed: 0,
+      liveRuns: [],
+      liveFixes: [],
+    }),
   appendLog: (log) => set((s) => ({ logs: [...s.logs, log] })),
+  appendLiveRun: (run) => set((s) => ({ liveRuns: [...s.liveRuns, run] })),
+  appendLiveFix: (fix) => set((s) => ({ liveFixes: [...s.liveFixes, fix] })),
+  failLiveFixes: (indexes) =>
+    set((s) => ({
+      liveFixes: s.liveFixes.map((fix, index) =>
+        indexes.includes(index) ? { ...fix, status: 'FAILED' as const } : fix,
+      ),
+    })),
   setResults: (results) =>
     set({ results, isRunning: false, status: 'complete' }),
+  setPushStatus: (pushStatus, pushError) =>
+    set((s) => ({
+      results: s.results ? { ...s.results, push_status: pushStatus, push_error: pushError } : s.results,
+    })),
   setElapsed: (elapsed) => set({ elapsed }),
   setStatus: (status) =>
     set({
@@ -44,5 +72,13 @@ export const useAgentStore = create<AgentStore>((set) => ({
       isRunning: status === 'running',
     }),
   reset: () =>
-    set({ results: null, status: 'idle', logs: [], elapsed: 0, isRunning: false }),
+    set({
+      results: null,
+      status: 'idle',
+      logs: [],
+      elapsed: 0,
+      isRunning: false,
+      liveRuns: [],
+      liveFixes: [],
+    }),
 }));
@@ -9,6 +9,7 @@ export type BugType =
 export type FixStatus = 'FIXED' | 'FAILED';
 export type CICDStatus = 'PASSED' | 'FAILED' | 'RUNNING';
 export type RunStatus = 'idle' | 'running' | 'complete' | 'error';
+export type PushStatus = 'skipped' | 'pending' | 'pushed' | 'failed';
 
 export interface Fix {
   file: string;
@@ -47,6 +48,8 @@ export interface AgentResults {
   final_status: 'PASSED' | 'FAILED';
   stop_reason?: string;
   error_message?: string;
+  push_status: PushStatus;
+  push_error?: string;
   score: ScoreBreakdown;
   fixes: Fix[];
   cicd_runs: CICDRun[];
@@ -56,3 +59,11 @@ export interface LogLine {
   time: string;
   message: string;
 }
+
+export type JobStatus = 'queued' | 'running' | 'completed' | 'failed';
+
+export interface AgentJob {
+  job_id: string;
+  status: JobStatus;
+  error_message?: string;
+}
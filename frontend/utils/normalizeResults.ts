@@ -0,0 +1,147 @@
+import type { AgentResults, Fix, CICDRun, CICDStatus, BugType, PushStatus } from '@/types';
+
+type BackendScore = {
+  base?: number;
+  speed_bonus?: number;
+  penalty?: number;
+  total?: number;
+  final_score?: number;
+};
+
+export type BackendFix = {
+  file?: string;
+  bug_type?: string;
+  line_number?: number;
+  commit_message?: string;
+  status?: string;
+};
+
+export type BackendTimeline = {
+  iteration?: number;
+  status?: string;
+  timestamp?: string;
+  failures_remaining?: number;
+};
+
+export type BackendRunResult = {
+  run_id?: string;
+  repo_url?: string;
+  team_name?: string;
+  leader_name?: string;
+  branch?: string;
+  branch_name?: string;
+  start_time?: string;
+  end_time?: string;
+  duration_seconds?: number;
+  time_taken_seconds?: number;
+  total_failures?: number;
+  total_fixes?: number;
+  fixes_applied?: number;
+  total_commits?: number;
+  commit_count?: number;
+  final_status?: string;
+  stop_reason?: string;
+  error_message?: string;
+  push_status?: string;
+  push_error?: string;
+  score?: BackendScore;
+  fixes?: BackendFix[];
+  cicd_runs?: BackendTimeline[];
+  ci_cd_timeline?: BackendTimeline[];
+};
+
+const allowedBugTypes: BugType[] = [
+  'LINTING',
+  'SYNTAX',
+  'LOGIC',
+  'TYPE_ERROR',
+  'IMPORT',
+  'INDENTATION',
+];
+
+function toBugType(value: string | undefined): BugType {
+  if (!value) return 'LOGIC';
+  const upper = value.toUpperCase();
+  return allowedBugTypes.includes(upper as BugType) ? (upper as BugType) : 'LOGIC';
+}
+
+function toFixStatus(value: string | undefined): 'FIXED' | 'FAILED' {
+  return value?.toUpperCase() === 'FIXED' ? 'FIXED' : 'FAILED';
+}
+
+function toCICDStatus(value: string | undefined): CICDStatus {
+  const upper = value?.toUpperCase();
+  if (upper === 'PASSED' || upper === 'FAILED' || upper === 'RUNNING') return upper;
+  return 'FAILED';
+}
+
+export function normalizeFix(fix: BackendFix): Fix {
+  return {
+    file: fix.file ?? 'unknown',
+    bug_type: toBugType(fix.bug_type),
+    line_number: typeof fix.line_number === 'number' ? fix.line_number : 0,
+    commit_message: fix.commit_message ?? '',
+    status: toFixStatus(fix.status),
+  };
+}
+
+export function normalizeRun(run: BackendTimeline, index: number): CICDRun {
+  return {
+    run_number: typeof run.iteration === 'number' ? run.iteration : index + 1,
+    timestamp: run.timestamp ?? new Date().toISOString(),
+    status: toCICDStatus(run.status),
+    failures_remaining:
+      typeof run.failures_remaining === 'number' ? run.failures_remaining : 0,
+  };
+}
+
+const pushStatuses: PushStatus[] = ['skipped', 'pending', 'pushed', 'failed'];
+
+export function normalizePushStatus(value: string | undefined): PushStatus {
+  return pushStatuses.includes(value as PushStatus) ? (value as PushStatus) : 'skipped';
+}
+
+export function normalizeResults(raw: BackendRunResult): AgentResults {
+  const nowIso = new Date().toISOString();
+  const score = raw.score ?? {};
+  const timeline = raw.cicd_runs ?? raw.ci_cd_timeline ?? [];
+  const fixes = raw.fixes ?? [];
+  const totalFixes = raw.total_fixes ?? raw.fixes_applied ?? fixes.length;
+  const durationSeconds =
+    raw.duration_seconds ??
+    (typeof raw.time_taken_seconds === 'number'
+      ? Math.round(raw.time_taken_seconds)
+      : 0);
+
+  const normalizedFixes: Fix[] = fixes.map(normalizeFix);
+  const normalizedRuns: CICDRun[] = timeline.map(normalizeRun);
+
+  const finalStatus = raw.final_status?.toUpperCase() === 'PASSED' ? 'PASSED' : 'FAILED';
+
+  return {
+    run_id: raw.run_id ?? `run-${Date.now()}`,
+    repo_url: raw.repo_url ?? '',
+    team_name: raw.team_name ?? '',
+    leader_name: raw.leader_name ?? '',
+    branch: raw.branch ?? raw.branch_name ?? '',
+    start_time: raw.start_time ?? nowIso,
+    end_time: raw.end_time ?? nowIso,
+    duration_seconds: durationSeconds,
+    total_failures: raw.total_failures ?? 0,
+    total_fixes: totalFixes,
+    total_commits: raw.commit_count ?? raw.total_commits ?? totalFixes,
+    final_status: finalStatus,
+    stop_reason: raw.stop_reason,
+    error_message: raw.error_message,
+    push_status: normalizePushStatus(raw.push_status),
+    push_error: raw.push_error || undefined,
+    score: {
+      base: score.base ?? 100,
+      speed_bonus: score.speed_bonus ?? 0,
+      penalty: score.penalty ?? 0,
+      total: score.total ?? score.final_score ?? 0,
+    },
+    fixes: normalizedFixes,
+    cicd_runs: normalizedRuns,
+  };
+}